@@ -1,5 +1,6 @@
 from infrastructure.ssh_client import Session_handler
 from core.initializer import Initializer
+from core.fleet_runner import Fleet_runner
 import time
 
 def print_getdata_output(ip:str, username:str, password:str):
@@ -24,12 +25,20 @@ def print_physical_interfaces(ip: str, username: str, password: str):
 
     for iface_name, iface_obj in initializer.physical_interfaces_settings_objects.items():
         print(f"\n--- Interface: {iface_name} ---")
-        for key, value in vars(iface_obj).items():
+        for key, value in iface_obj.as_dict().items():
             print(f"{key}: {value}")
     
 
     session.disconnect()
 
+def print_fleet_initialization(inventory: list[dict]):
+    fleet_result = Fleet_runner(inventory, max_concurrency=32, device_deadline=120).run()
+    print(fleet_result)
+    for ip, result in fleet_result.devices.items():
+        print(f"{ip}: {result.connect_status} timings={result.timings}")
+        for line in result.initialization_log:print(f"    {line}")
+    print(f"Sequential estimate: {fleet_result.sequential_time:.2f}s, wall clock: {fleet_result.wall_time:.2f}s")
+
 if __name__ == '__main__':
     print_physical_interfaces("172.20.30.198", "TestAdmin", "Pa$$w0rd")
     #print_getdata_output("172.20.30.198", "TestAdmin", "Pa$$w0rd")
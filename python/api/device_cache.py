@@ -0,0 +1,188 @@
+import asyncio
+import hashlib
+import json
+import threading
+import time
+
+from core.config_diff import diff_configs
+from core.initializer import Initializer
+from infrastructure.session_pool import Session_pool
+
+
+class Device_view:
+    def __init__(self, ip: str, initializer: Initializer):
+        """
+        Read-only, JSON-ready copy of one Initializer result, built once per refresh.
+        Each resource carries an ETag derived from its content, so an unchanged refresh
+        keeps the same ETag and clients keep getting 304 Not Modified.
+        """
+        self.ip = ip
+        self.fetched_at = time.time()
+        self.settings = [settings_obj.as_dict()
+                         for settings_obj in initializer.physical_interfaces_settings_objects.values()]
+        self.status = [status_obj.as_dict() for status_obj in initializer.interfaces_current_status_objects.values()]
+        self.summary = {
+            "ip": ip,
+            "model_name": initializer.model_name,
+            "interfaces": len(self.status),
+            "unsaved_changes": diff_configs(initializer.running_config, initializer.startup_config).has_changes,
+        }
+        self.etags = {
+            "summary": self._etag(self.summary),
+            "settings": self._etag(self.settings),
+            "status": self._etag(self.status),
+        }
+        self._encoded = {}      # resource -> encoded summary, or list of encoded items
+
+    def body(self, resource: str, offset: int = 0, limit: int = None) -> bytes:
+        """
+        Serialized JSON of a resource ('summary', 'settings' or 'status'; the lists paginated).
+        Each resource is encoded once per view; a page only joins its slice of the encoded
+        items, so memory does not grow with the offset/limit combinations clients ask for.
+        """
+        encoded = self._encoded.get(resource)
+        if encoded is None:
+            if resource == "summary":
+                encoded = json.dumps(self.summary, default=str).encode()
+            else:
+                encoded = [json.dumps(item, default=str).encode() for item in getattr(self, resource)]
+            self._encoded[resource] = encoded
+        if resource == "summary":
+            return encoded
+        page = encoded[offset:] if limit is None else encoded[offset:offset + limit]
+        header = json.dumps({"total": len(encoded), "offset": offset, "limit": limit})[:-1].encode()
+        return header + b', "items": [' + b", ".join(page) + b"]}"
+
+    @staticmethod
+    def _etag(payload) -> str:
+        body = json.dumps(payload, sort_keys=True, default=str).encode()
+        return '"' + hashlib.blake2b(body, digest_size=12).hexdigest() + '"'
+
+    def __repr__(self):
+        return f"<Device_view {self.ip} interfaces={len(self.status)}>"
+
+
+class _Flight:
+    def __init__(self):
+        self.done = threading.Event()
+        self.view = None
+        self.error = None
+
+
+class Device_cache:
+    def __init__(self, loader, ttl: float = 30.0, wait_timeout: float = 60.0):
+        """
+        In-memory cache of Device_views in front of the SSH layer.
+
+        Reads within ttl seconds never touch a switch. When an entry is missing or expired,
+        the first request starts the fetch and every concurrent request for the same switch
+        waits for that one fetch (single flight) instead of opening its own SSH session.
+        On the event loop, refresh_async() lets the waiting requests await a future, so
+        only the fetch itself occupies a worker thread.
+
+        Args:
+            loader: Callable ip -> Initializer, e.g. initializer_loader(session_pool, inventory)
+            ttl (float): Seconds a fetched view is served before it is refreshed
+            wait_timeout (float): Longest a blocking refresh() waits for another caller's fetch
+        """
+        self.loader = loader
+        self.ttl = ttl
+        self.wait_timeout = wait_timeout
+        self.fetches = 0
+        self._views = {}        # ip -> Device_view
+        self._flights = {}      # ip -> _Flight
+        self._tasks = {}        # (event loop, ip) -> asyncio.Task of refresh_async()
+        self._lock = threading.Lock()
+
+    def peek(self, ip: str) -> Device_view:
+        """
+        The cached view if it is still fresh, otherwise None. Never blocks.
+        """
+        view = self._views.get(ip)
+        if view is not None and time.time() - view.fetched_at < self.ttl:
+            return view
+        return None
+
+    def get(self, ip: str) -> Device_view:
+        return self.peek(ip) or self.refresh(ip)
+
+    def refresh(self, ip: str) -> Device_view:
+        """
+        Fetches ip now, or joins the fetch already in progress for it.
+
+        Raises:
+            KeyError: The loader does not know the device
+            RuntimeError: The fetch failed (propagated to every waiting caller), or another
+                caller's fetch did not finish within wait_timeout
+        """
+        with self._lock:
+            flight = self._flights.get(ip)
+            leader = flight is None
+            if leader:
+                flight = self._flights[ip] = _Flight()
+                self.fetches += 1
+
+        if leader:
+            try:
+                flight.view = Device_view(ip, self.loader(ip))
+                self._views[ip] = flight.view
+            except KeyError as e:
+                flight.error = e
+            except Exception as e:
+                flight.error = RuntimeError(f"Refreshing {ip} failed: {e}")
+            finally:
+                with self._lock:
+                    del self._flights[ip]
+                flight.done.set()
+        elif not flight.done.wait(self.wait_timeout):
+            raise RuntimeError(f"Refreshing {ip} did not finish within {self.wait_timeout}s")
+
+        if flight.error is not None:
+            raise flight.error
+        return flight.view
+
+    async def refresh_async(self, ip: str) -> Device_view:
+        """
+        refresh() for the event loop: the first request runs the fetch in a worker thread,
+        concurrent requests for the same switch await its task. The fetch is shielded, so a
+        client that disconnects does not cancel it for the others. Tasks are kept per event
+        loop (the test client runs one per request); across loops refresh() still shares the fetch.
+        """
+        key = (asyncio.get_running_loop(), ip)
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.ensure_future(asyncio.to_thread(self.refresh, ip))
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return await asyncio.shield(task)
+
+    def expires_in(self, view: Device_view) -> float:
+        return max(0.0, self.ttl - (time.time() - view.fetched_at))
+
+    def invalidate(self, ip: str):
+        self._views.pop(ip, None)
+
+    def __repr__(self):
+        return f"<Device_cache devices={len(self._views)} ttl={self.ttl}s fetches={self.fetches}>"
+
+
+def initializer_loader(session_pool: Session_pool, inventory: list[dict]):
+    """
+    Loader for Device_cache: runs Initializer.initialize() over a leased pool session.
+
+    Args:
+        inventory (list[dict]): Items with 'ip', 'username' and 'password' keys
+    """
+    credentials = {device["ip"]: device for device in inventory}
+
+    def load(ip: str) -> Initializer:
+        device = credentials.get(ip)
+        if device is None:
+            raise KeyError(f"Unknown device {ip}")
+        with session_pool.lease(ip, device["username"], device["password"]) as session:
+            initializer = Initializer(session)
+            initializer.initialize()
+        if not initializer.physical_interfaces_settings_objects:
+            raise RuntimeError("; ".join(initializer.initialization_log))
+        return initializer
+
+    return load
@@ -0,0 +1,70 @@
+from fastapi import FastAPI, HTTPException, Query, Request, Response
+
+from api.device_cache import Device_cache, Device_view
+
+
+def _conditional(request: Request, response: Response, view: Device_view, etag: str, cache: Device_cache):
+    """
+    Sets ETag / Cache-Control and returns a 304 response when the client already has this version.
+    """
+    headers = {"ETag": etag, "Cache-Control": f"max-age={int(cache.expires_in(view))}"}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and (if_none_match.strip() == "*" or etag in [tag.strip() for tag in if_none_match.split(",")]):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
+
+
+async def _view(cache: Device_cache, ip: str, force_refresh: bool = False) -> Device_view:
+    """
+    Fresh cache hits are answered on the event loop; misses block on SSH in a worker thread,
+    which concurrent requests for the same switch await instead of blocking threads of their own.
+    """
+    view = None if force_refresh else cache.peek(ip)
+    if view is not None:
+        return view
+    try:
+        return await cache.refresh_async(ip)
+    except KeyError:
+        raise HTTPException(status_code=404, detail=f"Unknown device {ip}")
+    except RuntimeError as e:
+        raise HTTPException(status_code=502, detail=str(e))
+
+
+def create_app(cache: Device_cache) -> FastAPI:
+    """
+    Read API over a Device_cache. Cache hits never leave the event loop and return
+    pre-encoded JSON; only misses and refreshes go to a worker thread for the SSH fetch.
+    """
+    app = FastAPI(title="CBS250 controller")
+
+    @app.get("/devices/{ip}")
+    async def device(ip: str, request: Request, response: Response):
+        view = await _view(cache, ip)
+        not_modified = _conditional(request, response, view, view.etags["summary"], cache)
+        return not_modified or Response(view.body("summary"), media_type="application/json", headers=response.headers)
+
+    @app.get("/devices/{ip}/interfaces/settings")
+    async def interface_settings(ip: str, request: Request, response: Response,
+                                 offset: int = Query(0, ge=0), limit: int = Query(50, ge=1, le=500)):
+        view = await _view(cache, ip)
+        etag = f'{view.etags["settings"][:-1]}-{offset}-{limit}"'
+        not_modified = _conditional(request, response, view, etag, cache)
+        return not_modified or Response(view.body("settings", offset, limit), media_type="application/json",
+                                        headers=response.headers)
+
+    @app.get("/devices/{ip}/interfaces/status")
+    async def interface_status(ip: str, request: Request, response: Response,
+                               offset: int = Query(0, ge=0), limit: int = Query(50, ge=1, le=500)):
+        view = await _view(cache, ip)
+        etag = f'{view.etags["status"][:-1]}-{offset}-{limit}"'
+        not_modified = _conditional(request, response, view, etag, cache)
+        return not_modified or Response(view.body("status", offset, limit), media_type="application/json",
+                                        headers=response.headers)
+
+    @app.post("/devices/{ip}/refresh")
+    async def refresh(ip: str):
+        view = await _view(cache, ip, force_refresh=True)
+        return {"ip": ip, "fetched_at": view.fetched_at, "etags": view.etags}
+
+    return app
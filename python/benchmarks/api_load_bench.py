@@ -0,0 +1,87 @@
+import argparse
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi.testclient import TestClient
+
+from api.device_cache import Device_cache
+from api.server import create_app
+from benchmarks.storage_bench import build_fleet
+
+
+def counting_loader(fleet: dict, ssh_delay: float):
+    """
+    Stand-in for initializer_loader(): returns prepared Initializers after ssh_delay seconds
+    and counts how often the 'SSH layer' was hit.
+    """
+    calls = {"count": 0}
+    lock = threading.Lock()
+
+    def load(ip: str):
+        with lock:
+            calls["count"] += 1
+        time.sleep(ssh_delay)
+        return fleet[ip]
+
+    return load, calls
+
+
+def _rate(label: str, requests: int, elapsed: float, extra: str = ""):
+    print(f"{label:<38} {requests / elapsed:9,.0f} req/s  {extra}")
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Read API throughput through the in-process test client.")
+    parser.add_argument("--devices", type=int, default=20)
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--threads", type=int, default=8)
+    parser.add_argument("--ssh-delay", type=float, default=1.5, help="simulated initialize() time on a miss")
+    args = parser.parse_args(argv)
+
+    fleet = build_fleet(args.devices, ports=52, vlans=100)
+    ips = list(fleet)
+    load, calls = counting_loader(fleet, args.ssh_delay)
+    cache = Device_cache(load, ttl=300)
+    client = TestClient(create_app(cache))
+
+    # Cold start: many concurrent requests for the same switches -> one fetch per switch
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=64) as executor:
+        statuses = list(executor.map(lambda index: client.get(f"/devices/{ips[index % len(ips)]}").status_code,
+                                     range(len(ips) * 10)))
+    print(f"cold start: {len(statuses)} concurrent requests for {len(ips)} switches -> {calls['count']} SSH fetches "
+          f"in {time.perf_counter() - started:.2f} s (statuses {sorted(set(statuses))})")
+
+    def run(path_for, headers_for=lambda index: {}) -> tuple:
+        counts = {}
+        lock = threading.Lock()
+
+        def one(index):
+            status = client.get(path_for(index), headers=headers_for(index)).status_code
+            with lock:
+                counts[status] = counts.get(status, 0) + 1
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=args.threads) as executor:
+            list(executor.map(one, range(args.requests)))
+        return time.perf_counter() - started, counts
+
+    fetches_before = calls["count"]
+    elapsed, counts = run(lambda index: f"/devices/{ips[index % len(ips)]}/interfaces/status?limit=50")
+    _rate("warm GET status page", args.requests, elapsed, f"{counts}")
+
+    etags = {ip: client.get(f"/devices/{ip}/interfaces/status?limit=50").headers["etag"] for ip in ips}
+    elapsed, counts = run(lambda index: f"/devices/{ips[index % len(ips)]}/interfaces/status?limit=50",
+                          lambda index: {"If-None-Match": etags[ips[index % len(ips)]]})
+    _rate("conditional GET (If-None-Match)", args.requests, elapsed, f"{counts}")
+
+    elapsed, counts = run(lambda index: f"/devices/{ips[index % len(ips)]}/interfaces/settings"
+                                        f"?offset={index % 2 * 26}&limit=26")
+    _rate("warm GET settings pages", args.requests, elapsed, f"{counts}")
+    print(f"SSH fetches during warm phases: {calls['count'] - fetches_before}")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
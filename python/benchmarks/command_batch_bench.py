@@ -0,0 +1,52 @@
+import time
+
+from benchmarks.latency_child import Latency_child
+from simulator.synthetic_config import build_interfaces_status, build_running_config, build_show_system
+from infrastructure.ssh_client import Session_handler
+
+INITIALIZATION_COMMANDS = ["show running-config", "show startup-config", "show system",
+                           "show interfaces status", "show vlan"]
+
+
+def _responses(ports: int) -> dict:
+    config = "\r\n".join(build_running_config(ports=ports))
+    return {
+        "show running-config": config,
+        "show startup-config": config,
+        "show system": build_show_system(ports),
+        "show interfaces status": build_interfaces_status(ports),
+        "show vlan": "\r\n".join(f" {vlan}   VLAN{vlan:04d}   gi1-48   Static" for vlan in range(1, 101)),
+    }
+
+
+def _session(responses: dict, rtt: float) -> Session_handler:
+    session = Session_handler("198.51.100.1", "bench", "bench")
+    session.child = Latency_child(responses, rtt=rtt)
+    session.connection_is_active = True
+    session.pagination_disabled = True     # Latency_child never pages, like after 'terminal datadump'
+    return session
+
+
+def run(rtts=(0.005, 0.02, 0.08), ports: int = 52):
+    responses = _responses(ports)
+    print(f"{len(INITIALIZATION_COMMANDS)} commands, {ports} ports")
+    print(f"{'rtt ms':>7} {'sequential ms':>14} {'batched ms':>11} {'saved ms':>9}")
+    for rtt in rtts:
+        session = _session(responses, rtt)
+        started = time.perf_counter()
+        sequential = [session.send_command_read_answer(command) for command in INITIALIZATION_COMMANDS]
+        sequential_time = time.perf_counter() - started
+
+        session = _session(responses, rtt)
+        started = time.perf_counter()
+        batched = session.send_commands_batch(INITIALIZATION_COMMANDS)
+        batched_time = time.perf_counter() - started
+
+        assert all(result.ok for result in batched)
+        assert [result.output for result in batched] == sequential
+        print(f"{rtt * 1000:>7.0f} {sequential_time * 1000:>14.1f} {batched_time * 1000:>11.1f} "
+              f"{(sequential_time - batched_time) * 1000:>9.1f}")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,77 @@
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+from infrastructure.config_archive import Config_archive
+from infrastructure.config_cleaner import clean_config_text
+from infrastructure.storage import Sqlite_backend
+from simulator.synthetic_config import build_running_config
+
+
+def _change(lines: list, randomizer: random.Random) -> list:
+    """
+    One operator edit: a new description on a random port.
+    """
+    lines = list(lines)
+    indexes = [index for index, line in enumerate(lines) if line.startswith("description ")]
+    lines[randomizer.choice(indexes)] = f"description changed-{randomizer.randrange(10 ** 6)}"
+    return lines
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Config_archive size and read speed vs full copies of every snapshot.")
+    parser.add_argument("--devices", type=int, default=200)
+    parser.add_argument("--ports", type=int, default=52)
+    parser.add_argument("--vlans", type=int, default=100)
+    parser.add_argument("--snapshots", type=int, default=30, help="fleet-wide retrievals (e.g. several a day)")
+    parser.add_argument("--changed", type=float, default=0.05, help="share of devices edited between snapshots")
+    args = parser.parse_args(argv)
+
+    randomizer = random.Random(1)
+    template = clean_config_text("\n".join(build_running_config(ports=args.ports, vlans=args.vlans, hostname="switch01")))
+    configs = {f"10.0.{index // 250}.{index % 250 + 1}": list(template) for index in range(args.devices)}
+    history = {}            # (ip, version) -> lines, to check the reads
+    full_copy_bytes = 0
+
+    with tempfile.TemporaryDirectory() as directory:
+        archive = Config_archive(Sqlite_backend(os.path.join(directory, "archive.sqlite")))
+        started = time.perf_counter()
+        for snapshot in range(args.snapshots):
+            if snapshot:
+                for ip in randomizer.sample(sorted(configs), int(args.devices * args.changed)):
+                    configs[ip] = _change(configs[ip], randomizer)
+            for ip, lines in configs.items():
+                version = archive.archive(ip, "running", lines, taken_at=1_700_000_000 + snapshot * 3600)
+                history[(ip, version)] = lines
+                full_copy_bytes += len("\n".join(lines))
+        write_time = time.perf_counter() - started
+
+        stats = archive.stats()
+        stored_bytes = stats["block_bytes"] + stats["delta_bytes"]
+        print(f"{args.devices} devices x {args.snapshots} snapshots, {args.changed:.0%} of devices edited between snapshots")
+        print(f"{'full copies':<26} {full_copy_bytes / 1e6:9.2f} MB   {stats['snapshots']:6d} configs")
+        print(f"{'Config_archive':<26} {stored_bytes / 1e6:9.2f} MB   {stats['versions']:6d} versions, "
+              f"{stats['blocks']} blocks   {full_copy_bytes / stored_bytes:6.1f}x smaller")
+        print(f"{'archive writes':<26} {write_time * 1000 / stats['snapshots']:9.3f} ms per config")
+
+        cold = Config_archive(archive.backend)     # nothing cached in memory
+        keys = randomizer.sample(sorted(history), min(200, len(history)))
+        started = time.perf_counter()
+        for ip, version in keys:
+            assert cold.get(ip, "running", version) == history[(ip, version)]
+        print(f"{'read any version (cold)':<26} {(time.perf_counter() - started) * 1000 / len(keys):9.3f} ms")
+
+        started = time.perf_counter()
+        exported = 0
+        for ip, which, version, first_seen, last_seen, lines in cold.export():
+            assert lines == history[(ip, version)]
+            exported += 1
+        print(f"{'bulk export':<26} {(time.perf_counter() - started) * 1000:9.1f} ms   {exported} versions")
+        archive.backend.close()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,76 @@
+import re
+import time
+
+from simulator.synthetic_config import build_running_config, paginate
+from infrastructure.config_cleaner import Config_stream_cleaner, clean_config_text
+
+
+def legacy_clean(full_output: str) -> list:
+    """
+    The original per-character cleaner from Session_handler.get_config(), kept as baseline.
+    """
+    outputlines = []
+    word_to_copy = ""
+
+    full_output = re.sub(r',?\s*Quit: q or CTRL\+Z, One line: <return> *\r?!?', '', full_output)
+    full_output = full_output.replace('\r\n', '\n').replace('\r', '\n')
+    full_output = re.sub(r'(privilege \d+)(username )', r'\1\n\2', full_output)
+    full_output = re.sub(r'(privilege \d+)\s*(ip ssh server)', r'\1\n\2', full_output)
+
+    i = 0
+    while i < len(full_output):
+        char = full_output[i]
+        if char == '\n' or (char == ' ' and i + 1 < len(full_output) and full_output[i + 1] == ' '):
+            cleaned = word_to_copy.strip()
+            if cleaned.lower() not in ["exit", "!"] and cleaned:
+                outputlines.append(cleaned)
+            word_to_copy = ""
+            while i + 1 < len(full_output) and full_output[i + 1] == ' ':
+                i += 1
+        else:
+            word_to_copy += char
+        i += 1
+
+    cleaned = word_to_copy.strip()
+    if cleaned.lower() not in ["exit", "!"] and cleaned:
+        outputlines.append(cleaned)
+    return outputlines
+
+
+def stream_clean(chunks: list) -> list:
+    cleaner = Config_stream_cleaner()
+    lines = []
+    for chunk in chunks:
+        lines.extend(cleaner.feed(chunk))
+    lines.extend(cleaner.close())
+    return lines
+
+
+def _best_of(function, argument, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(argument)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(sizes=(52, 520, 5200), repeat: int = 5):
+    print(f"{'ports':>6} {'bytes':>10} {'legacy ms':>10} {'linear ms':>10} {'stream ms':>10} {'speedup':>8}")
+    for ports in sizes:
+        chunks = paginate(build_running_config(ports=ports))
+        full_output = "".join(chunks)
+
+        expected = legacy_clean(full_output)
+        assert clean_config_text(full_output) == expected
+        assert stream_clean(chunks) == expected
+
+        legacy = _best_of(legacy_clean, full_output, repeat)
+        linear = _best_of(clean_config_text, full_output, repeat)
+        stream = _best_of(stream_clean, chunks, repeat)
+        print(f"{ports:>6} {len(full_output):>10} {legacy * 1000:>10.2f} {linear * 1000:>10.2f} "
+              f"{stream * 1000:>10.2f} {legacy / linear:>7.1f}x")
+
+
+if __name__ == '__main__':
+    run()
@@ -0,0 +1,167 @@
+import time
+
+from benchmarks.interface_memory_bench import Legacy_interface_settings
+from simulator.synthetic_config import build_running_config
+from core.config_parser import Running_config_parser
+from core.interface_config import apply_interface_config
+from domain.physical_interface import Physical_interface_settings
+from infrastructure.config_cleaner import clean_config_text
+
+STATUS_VALUES = ["1G-Copper", "Full", "1000", "Enabled", "Off", "Up", "Disabled", "Off"]
+
+
+def legacy_build(running_config: list, ports: list) -> dict:
+    """
+    The original grouping loop and if/elif chain from Initializer, kept as baseline.
+    """
+    current_iface = None
+    iface_blocks = {}
+    for line in running_config:
+        if line.startswith("interface GigabitEthernet"):
+            current_iface = "gi" + line.split("GigabitEthernet")[1].strip()
+            iface_blocks[current_iface] = []
+        elif current_iface:
+            iface_blocks[current_iface].append(line.strip())
+
+    objects = {}
+    for iface_name in ports:
+        settings_obj = Legacy_interface_settings(name=iface_name, values=STATUS_VALUES)
+        for line in iface_blocks.get(iface_name, []):
+            if line.startswith("description"):
+                settings_obj.description = line.replace("description", "").strip()
+            elif line == "no negotiation":
+                settings_obj.negotiation = "Disabled"
+                settings_obj.ethernet_negotiation = False
+            elif line.startswith("speed"):
+                settings_obj.speed = line.split()[-1]
+            elif line.startswith("duplex"):
+                settings_obj.duplex = line.split()[-1].capitalize()
+            elif line.startswith("mdix"):
+                settings_obj.mdix_mode = line.split()[-1].capitalize()
+            elif line.startswith("flowcontrol"):
+                settings_obj.flow_ctrl = "On" if "on" in line else "Off"
+            elif line.startswith("back-pressure"):
+                settings_obj.back_pressure = "Enabled"
+            elif line == "shutdown":
+                settings_obj.link_admin_state = "shutdown"
+            elif line.startswith("ip address dhcp"):
+                settings_obj.physical_interface_ips = {"DHCP": True}
+            elif line.startswith("ip address"):
+                if settings_obj.physical_interface_ips.get("DHCP") != True:
+                    parts = line.split()
+                    if len(parts) == 4:
+                        settings_obj.physical_interface_ips[parts[2]] = parts[3]
+            elif line == "no switchport":
+                settings_obj.active_mode = "no switchport"
+            elif "switchport mode trunk" in line:
+                settings_obj.active_mode = "trunk"
+            elif "switchport mode general" in line:
+                settings_obj.active_mode = "general"
+            elif "switchport mode customer" in line:
+                settings_obj.active_mode = "customer"
+            elif line.startswith("switchport access vlan"):
+                vlan = line.split()[-1]
+                if vlan.isdigit():
+                    settings_obj.access_vlan = int(vlan)
+            elif line.startswith("switchport trunk allowed vlan"):
+                vlans = line.split()[-1].split(",")
+                settings_obj.allowed_vlans = [int(v) for v in vlans if v.isdigit()]
+            elif line.startswith("switchport trunk native vlan"):
+                vlan = line.split()[-1]
+                if vlan.isdigit():
+                    settings_obj.native_vlan = int(vlan)
+            elif line.startswith("switchport general allowed vlan add"):
+                parts = line.split()
+                vlan = parts[5]
+                tag_type = parts[6]
+                if vlan.isdigit():
+                    if tag_type == "tagged":
+                        settings_obj.general_allowed_tagged.append(int(vlan))
+                    elif tag_type == "untagged":
+                        settings_obj.general_allowed_untagged.append(int(vlan))
+            elif line.startswith("switchport general forbidden vlan add"):
+                vlan = line.split()[-1]
+                if vlan.isdigit():
+                    settings_obj.general_forbiden.append(int(vlan))
+            elif line.startswith("switchport general pvid"):
+                vlan = line.split()[-1]
+                if vlan.isdigit():
+                    settings_obj.pvid_vlan = int(vlan)
+            elif line.startswith("switchport customer vlan"):
+                vlan = line.split()[-1]
+                if vlan.isdigit():
+                    settings_obj.customer_vlan = int(vlan)
+        objects[iface_name] = settings_obj
+    return objects
+
+
+def indexed_build(running_config: list, ports: list) -> dict:
+    model = Running_config_parser().parse(running_config)
+    objects = {}
+    for iface_name in ports:
+        settings_obj = Physical_interface_settings(name=iface_name, values=STATUS_VALUES)
+        section = model.get("interface", iface_name)
+        if section is not None:
+            apply_interface_config(settings_obj, section.lines)
+        objects[iface_name] = settings_obj
+    return objects
+
+
+def legacy_section_lookup(running_config: list, header: str) -> list:
+    """
+    What a new feature has to do without the model: re-scan the config for its section.
+    """
+    block = None
+    for line in running_config:
+        if block is not None:
+            if line.startswith("interface ") or line.startswith("line ") or line == "vlan database":
+                break
+            block.append(line)
+        elif line == header:
+            block = []
+    return block
+
+
+def _best_of(function, running_config, ports, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function(running_config, ports)
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def run(port_counts=(52,), repeat: int = 200):
+    for port_count in port_counts:
+        running_config = clean_config_text("\r\n".join(build_running_config(ports=port_count)))
+        ports = [f"gi{port}" for port in range(1, port_count + 1)]
+
+        legacy = legacy_build(running_config, ports)
+        rebuilt = indexed_build(running_config, ports)
+        vlan_fields = Physical_interface_settings.VLAN_FIELDS
+        for iface_name in ports:
+            # VLAN fields are excluded: the old loop dropped ranges such as '2-51'
+            legacy_values = {key: value for key, value in vars(legacy[iface_name]).items()
+                             if key in Physical_interface_settings.__slots__ and key not in vlan_fields}
+            rebuilt_values = {key: value for key, value in rebuilt[iface_name].as_dict().items() if key not in vlan_fields}
+            assert legacy_values == rebuilt_values, iface_name
+
+        legacy_time = _best_of(legacy_build, running_config, ports, repeat)
+        build_time = _best_of(indexed_build, running_config, ports, repeat)
+        print(f"{port_count} ports, {len(running_config)} lines: legacy {legacy_time * 1000:.3f} ms, "
+              f"indexed parser {build_time * 1000:.3f} ms ({legacy_time / build_time:.2f}x)")
+
+        model = Running_config_parser().parse(running_config)
+        lookups = (("line ssh", "line", "ssh"), ("vlan database", "vlan", "database"),
+                   (f"interface GigabitEthernet{port_count}", "interface", f"gi{port_count}"))
+        assert all(model.get(kind, name) is not None for _, kind, name in lookups)
+        rescan_time = _best_of(lambda config, _: [legacy_section_lookup(config, header) for header, _, _ in lookups],
+                               running_config, None, repeat)
+        indexed_time = _best_of(lambda _, __: [model.get(kind, name) for _, kind, name in lookups],
+                                None, None, repeat)
+        print(f"{len(lookups)} follow-up section lookups: re-scan {rescan_time * 1000:.3f} ms, "
+              f"indexed {indexed_time * 1000:.4f} ms")
+
+
+if __name__ == '__main__':
+    run()
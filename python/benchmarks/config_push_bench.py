@@ -0,0 +1,78 @@
+import argparse
+import copy
+import sys
+import time
+
+from benchmarks.end_to_end_bench import PASSWORD, USERNAME, simulator_command
+from core.config_push import Config_push_engine
+from core.initializer import Initializer
+from infrastructure.ssh_client import Session_handler
+
+
+def _connected_initializer(command: str) -> Initializer:
+    session = Session_handler("sim", USERNAME, PASSWORD, spawn_command=command)
+    session.connect()
+    initializer = Initializer(session)
+    initializer.initialize()
+    assert initializer.physical_interfaces_settings_objects, initializer.initialization_log
+    return initializer
+
+
+def _desired(initializer: Initializer, ports: int, vlan: int) -> dict:
+    desired = {}
+    for name, settings_obj in list(initializer.physical_interfaces_settings_objects.items())[:ports]:
+        desired[name] = copy.deepcopy(settings_obj)
+        desired[name].active_mode = "access"
+        desired[name].access_vlan = vlan
+    return desired
+
+
+def bench_per_port(command: str, ports: int, vlan: int):
+    """
+    Baseline: one config session per port with that port's commands, then a full initialize() to verify.
+    """
+    initializer = _connected_initializer(command)
+    engine = Config_push_engine(initializer)
+    desired = _desired(initializer, ports, vlan)
+    sessions = sent = 0
+    started = time.perf_counter()
+    for name, desired_obj in desired.items():
+        lines = engine.plan({name: desired_obj})
+        if lines:
+            initializer.session.send_config_batch(lines)
+            sessions += 1
+            sent += len(lines) + 2
+    initializer.initialize()
+    print(f"{'per-port sessions':<22} {(time.perf_counter() - started) * 1000:8.1f} ms   "
+          f"{sessions:3d} config sessions, {sent:4d} lines sent")
+    initializer.session.disconnect()
+
+
+def bench_push(command: str, ports: int, vlan: int):
+    initializer = _connected_initializer(command)
+    engine = Config_push_engine(initializer)
+    desired = _desired(initializer, ports, vlan)
+    started = time.perf_counter()
+    push_result = engine.push(desired)
+    print(f"{'Config_push_engine':<22} {(time.perf_counter() - started) * 1000:8.1f} ms   "
+          f"  1 config session,  {len(push_result.commands) + 2:4d} lines sent, verified={push_result.verified}")
+    for line in push_result.commands:
+        print(f"    {line}")
+    initializer.session.disconnect()
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Access VLAN change on many ports: per-port sessions vs one batched push.")
+    parser.add_argument("--ports", type=int, default=48, help="ports to change")
+    parser.add_argument("--vlan", type=int, default=42)
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args(argv)
+
+    command = simulator_command(52, 100, args.latency, 0.0)
+    print(f"set access VLAN {args.vlan} on {args.ports} ports, simulator latency {args.latency}s")
+    bench_per_port(command, args.ports, args.vlan)
+    bench_push(command, args.ports, args.vlan)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
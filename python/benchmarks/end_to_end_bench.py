@@ -0,0 +1,100 @@
+import argparse
+import statistics
+import sys
+import time
+
+from core.fleet_runner import Fleet_runner
+from core.initializer import Initializer
+from infrastructure.ssh_client import Session_handler
+from infrastructure.transport import Asyncssh_transport, Event_loop_thread
+
+USERNAME = "TestAdmin"
+PASSWORD = "Pa$$w0rd"
+
+
+def simulator_command(ports: int, vlans: int, latency: float, login_delay: float) -> str:
+    return (f"{sys.executable} -m simulator.cbs250_cli --ports {ports} --vlans {vlans} "
+            f"--latency {latency} --login-delay {login_delay}")
+
+
+def _timed(function) -> float:
+    started = time.perf_counter()
+    function()
+    return time.perf_counter() - started
+
+
+def _report(name: str, samples: list):
+    print(f"{name:<24} median {statistics.median(samples) * 1000:8.1f} ms   "
+          f"min {min(samples) * 1000:8.1f} ms   max {max(samples) * 1000:8.1f} ms")
+
+
+def bench_session(session_factory, rounds: int):
+    connect, get_config, interfaces, initialize, refresh = [], [], [], [], []
+    for _ in range(rounds):
+        session = session_factory("sim", USERNAME, PASSWORD)
+        connect.append(_timed(lambda: session.connect()))
+        get_config.append(_timed(lambda: session.get_config("running")))
+        interfaces.append(_timed(lambda: session.get_interfaces_status()))
+        session.disconnect()
+
+        session = session_factory("sim", USERNAME, PASSWORD)
+        initializer = Initializer(session)
+        initialize.append(_timed(lambda: (session.connect(), initializer.initialize())))
+        assert initializer.physical_interfaces_settings_objects, initializer.initialization_log
+        refresh.append(_timed(lambda: initializer.refresh_interface("gi5")))
+        session.disconnect()
+
+    _report("connect", connect)
+    _report("get_config(running)", get_config)
+    _report("get_interfaces_status", interfaces)
+    _report("connect + initialize", initialize)
+    _report("refresh_interface(gi5)", refresh)
+
+
+def bench_fleet(session_factory, devices: int, concurrency: int):
+    inventory = [{"ip": f"sim-{index}", "username": USERNAME, "password": PASSWORD} for index in range(devices)]
+    runner = Fleet_runner(inventory, max_concurrency=concurrency, session_factory=session_factory)
+    fleet_result = runner.run()
+    print(f"fleet: {devices} devices, concurrency {concurrency}: wall {fleet_result.wall_time:.2f} s, "
+          f"sum of device times {fleet_result.sequential_time:.2f} s, "
+          f"{devices / fleet_result.wall_time:.1f} devices/s, {len(fleet_result.failed)} failed")
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="End-to-end benchmarks against the local CBS250 simulator.")
+    parser.add_argument("--ports", type=int, default=52)
+    parser.add_argument("--vlans", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--login-delay", type=float, default=0.5)
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--devices", type=int, default=50)
+    parser.add_argument("--concurrency", type=int, default=25)
+    parser.add_argument("--transport", choices=("wexpect", "asyncssh"), default="wexpect",
+                        help="wexpect spawns the simulator per session, asyncssh talks to its SSH server")
+    args = parser.parse_args(argv)
+
+    print(f"simulator: {args.ports} ports, {args.vlans} VLANs, latency {args.latency}s, "
+          f"login delay {args.login_delay}s, transport {args.transport}")
+    if args.transport == "wexpect":
+        command = simulator_command(args.ports, args.vlans, args.latency, args.login_delay)
+
+        def session_factory(ip, username, password):
+            return Session_handler(ip, username, password, spawn_command=command)
+    else:
+        from simulator.ssh_server import Cbs250_ssh_server
+
+        loop_thread = Event_loop_thread()
+        server = Cbs250_ssh_server(ports=args.ports, vlans=args.vlans, latency=args.latency,
+                                   login_delay=args.login_delay)
+        loop_thread.run(server.start())
+        transport = Asyncssh_transport(port=server.port, loop_thread=loop_thread)
+
+        def session_factory(ip, username, password):
+            return Session_handler("127.0.0.1", username, password, transport=transport)
+
+    bench_session(session_factory, args.rounds)
+    bench_fleet(session_factory, args.devices, args.concurrency)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,93 @@
+import tracemalloc
+
+from domain.physical_interface import Physical_interface_current_status, Physical_interface_settings
+
+STATUS_LINE = "1G-Copper  Full  1000  Enabled  Off  Up  Disabled  Off"
+
+
+class Legacy_interface_settings:
+    """
+    The previous per-instance representation of Physical_interface_settings, kept as baseline.
+    """
+    def __init__(self, name: str, values: list[str]):
+        self.name = name
+        self.type = values[0] if len(values) > 0 else None
+        self.duplex_values = ["Full", "Half"]
+        self.duplex = "Full"
+        self.speed_values = ["10", "100", "1000", "10000"]
+        self.speed = "1000"
+        self.negotiation_values = ["Enabled", "Disabled"]
+        self.negotiation = "Enabled"
+        self.flow_ctrl_values = ["Off", "On", "Auto"]
+        self.flow_ctrl = "Off"
+        self.link_admin_state_values = ["shutdown", "no shutdown"]
+        self.link_admin_state = "no shutdown"
+        self.back_pressure_values = ["Disabled", "Enabled"]
+        self.back_pressure = "Disabled"
+        self.mdix_mode_values = ["Auto", "On"]
+        self.mdix_mode = "Auto"
+        self.ethernet_negotiation = True
+        self.description = ""
+        self.modes = ["access", "trunk", "general", "customer", "no switchport"]
+        self.active_mode = "access"
+        self.access_vlan = 1
+        self.allowed_vlans = []
+        self.native_vlan = 0
+        self.general_allowed_tagged = []
+        self.general_allowed_untagged = []
+        self.general_forbiden = []
+        self.pvid_vlan = 0
+        self.customer_vlan = 0
+        self.physical_interface_ips = {"DHCP": False}
+
+
+class Legacy_interface_current_status:
+    def __init__(self, name: str, values: list[str]):
+        self.name = name
+        self.type = values[0] if len(values) > 0 else None
+        self.duplex = values[1] if len(values) > 1 else None
+        self.speed = values[2] if len(values) > 2 else None
+        self.negotiation = values[3] if len(values) > 3 else None
+        self.flow_ctrl = values[4] if len(values) > 4 else None
+        self.link_state = values[5] if len(values) > 5 else None
+        self.back_pressure = values[6] if len(values) > 6 else None
+        self.mdix_mode = values[7] if len(values) > 7 else None
+
+
+def build_fleet(settings_class, status_class, switches: int, ports: int) -> list:
+    fleet = []
+    for _ in range(switches):
+        settings, status = {}, {}
+        for port in range(1, ports + 1):
+            name = f"gi{port}"
+            values = STATUS_LINE.split()  # fresh strings per port, as after parsing switch output
+            settings_obj = settings_class(name, values)
+            # A typical trunk port carrying 40 VLANs
+            settings_obj.allowed_vlans = type(settings_obj.allowed_vlans)(range(100, 140))
+            settings[name] = settings_obj
+            status[name] = status_class(name, values)
+        fleet.append((settings, status))
+    return fleet
+
+
+def measure(settings_class, status_class, switches: int, ports: int) -> int:
+    tracemalloc.start()
+    fleet = build_fleet(settings_class, status_class, switches, ports)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del fleet
+    return current
+
+
+def run(switches: int = 500, ports: int = 52):
+    before = measure(Legacy_interface_settings, Legacy_interface_current_status, switches, ports)
+    after = measure(Physical_interface_settings, Physical_interface_current_status, switches, ports)
+    objects = switches * ports
+    print(f"{switches} switches x {ports} ports ({objects} settings + {objects} status objects)")
+    print(f"before: {before / 2 ** 20:8.1f} MiB ({before / objects:6.0f} B per port)")
+    print(f"after:  {after / 2 ** 20:8.1f} MiB ({after / objects:6.0f} B per port)")
+    print(f"saved:  {(before - after) / 2 ** 20:8.1f} MiB ({1 - after / before:.0%})")
+
+
+if __name__ == '__main__':
+    run()
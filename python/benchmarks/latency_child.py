@@ -0,0 +1,72 @@
+import re
+import time
+
+import wexpect
+
+
+class Latency_child:
+    def __init__(self, responses: dict, rtt: float = 0.05, processing: float = 0.005, prompt: str = "switch01#"):
+        """
+        In-memory stand-in for a wexpect child talking to a switch over a link with a given
+        round-trip time. The CLI works through commands one after another; each answer
+        (echo, output, prompt) arrives half an RTT after the CLI finished it.
+
+        Args:
+            responses (dict): command -> output text
+            rtt (float): Network round-trip time in seconds
+            processing (float): CLI time per command in seconds
+            prompt (str): Prompt printed after every answer
+        """
+        self.responses = responses
+        self.rtt = rtt
+        self.processing = processing
+        self.prompt = prompt
+        self.before = ""
+        self.after = ""
+        self._segments = []     # (arrival time, text), in arrival order
+        self._buffer = ""
+        self._cli_free_at = 0.0
+
+    def sendline(self, command: str = ""):
+        started = max(time.perf_counter() + self.rtt / 2, self._cli_free_at)
+        self._cli_free_at = started + self.processing
+        output = self.responses.get(command, "% Unrecognized command") if command else ""
+        text = f"{command}\r\n{output}\r\n{self.prompt}" if command else f"\r\n{self.prompt}"
+        self._segments.append((self._cli_free_at + self.rtt / 2, text))
+
+    def send(self, text: str):
+        pass
+
+    def close(self):
+        self._segments.clear()
+
+    def expect(self, patterns, timeout: float = 10):
+        if not isinstance(patterns, list):
+            patterns = [patterns]
+        deadline = time.perf_counter() + timeout
+        while True:
+            now = time.perf_counter()
+            while self._segments and self._segments[0][0] <= now:
+                self._buffer += self._segments.pop(0)[1]
+
+            best = None
+            for index, pattern in enumerate(patterns):
+                if pattern is wexpect.EOF or pattern is wexpect.TIMEOUT:
+                    continue
+                match = re.search(pattern, self._buffer)
+                if match and (best is None or match.start() < best[1].start()):
+                    best = (index, match)
+            if best is not None:
+                index, match = best
+                self.before, self.after = self._buffer[:match.start()], match.group(0)
+                self._buffer = self._buffer[match.end():]
+                return index
+
+            next_arrival = self._segments[0][0] if self._segments else None
+            if next_arrival is None or next_arrival > deadline:
+                time.sleep(max(0.0, deadline - now))
+                if wexpect.TIMEOUT in patterns:
+                    self.before, self.after = self._buffer, ""
+                    return patterns.index(wexpect.TIMEOUT)
+                raise wexpect.TIMEOUT("Timeout exceeded.")
+            time.sleep(max(0.0, next_arrival - now))
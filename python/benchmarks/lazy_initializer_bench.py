@@ -0,0 +1,68 @@
+import argparse
+import sys
+import time
+
+from benchmarks.end_to_end_bench import PASSWORD, USERNAME, simulator_command
+from core.initializer import Initializer
+from core.lazy_initializer import VIEWS, Lazy_initializer
+from infrastructure.instrumentation import Metrics_recorder
+from infrastructure.ssh_client import Session_handler
+
+
+def _session(command: str) -> Session_handler:
+    return Session_handler("sim", USERNAME, PASSWORD, spawn_command=command, metrics=Metrics_recorder())
+
+
+def _commands(session: Session_handler) -> list:
+    return [record.command for record in session.metrics.commands if record.command != "connect"]
+
+
+def bench_eager(command: str):
+    session = _session(command)
+    started = time.perf_counter()
+    session.connect()
+    initializer = Initializer(session)
+    initializer.initialize()
+    first_paint = time.perf_counter() - started
+    print(f"{'Initializer.initialize()':<30} first paint {first_paint * 1000:8.1f} ms")
+    print(f"    {'; '.join(_commands(session))}")
+    session.disconnect()
+    return initializer
+
+
+def bench_lazy(command: str, view: str, prefetch: tuple):
+    session = _session(command)
+    started = time.perf_counter()
+    session.connect()
+    initializer = Lazy_initializer(session)
+    initializer.load_view(view, prefetch=prefetch)
+    first_paint = time.perf_counter() - started
+    painted = len(_commands(session))
+    initializer.wait_for_prefetch()
+    print(f"{'Lazy_initializer.load_view()':<30} first paint {first_paint * 1000:8.1f} ms   "
+          f"all views {(time.perf_counter() - started) * 1000:8.1f} ms")
+    commands = _commands(session)
+    print(f"    before paint: {'; '.join(commands[:painted])}")
+    print(f"    prefetched:   {'; '.join(commands[painted:])}")
+    session.disconnect()
+    return initializer
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Time to first paint: eager initialize() vs a lazy, view-first load.")
+    parser.add_argument("--view", default="status_grid", choices=sorted(VIEWS))
+    parser.add_argument("--latency", type=float, default=0.02)
+    args = parser.parse_args(argv)
+
+    command = simulator_command(52, 100, args.latency, 0.0)
+    prefetch = tuple(view for view in VIEWS if view != args.view)
+    print(f"view {args.view}, prefetch {', '.join(prefetch)}, simulator latency {args.latency}s")
+    eager = bench_eager(command)
+    lazy = bench_lazy(command, args.view, prefetch)
+    assert lazy.running_config == eager.running_config and lazy.startup_config == eager.startup_config
+    assert ({name: obj.as_dict() for name, obj in lazy.physical_interfaces_settings_objects.items()}
+            == {name: obj.as_dict() for name, obj in eager.physical_interfaces_settings_objects.items()})
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,63 @@
+import argparse
+import sys
+import time
+
+from benchmarks.latency_child import Latency_child
+from infrastructure.prompt import Adaptive_timeout
+from infrastructure.ssh_client import Session_handler
+
+
+class Hanging_child(Latency_child):
+    """
+    Latency_child whose CLI stops answering after hang_command, like a switch stuck on a task.
+    """
+    def __init__(self, responses: dict, hang_command: str, **kwargs):
+        super().__init__(responses, **kwargs)
+        self.hang_command = hang_command
+        self.hung = False
+
+    def sendline(self, command: str = ""):
+        self.hung = self.hung or command == self.hang_command
+        if not self.hung:
+            super().sendline(command)
+
+
+def _session(rtt: float, timeouts: Adaptive_timeout) -> Session_handler:
+    session = Session_handler("198.51.100.1", "bench", "bench", timeouts=timeouts)
+    session.child = Hanging_child({"show clock": "12:00:00"}, "show system", rtt=rtt)
+    session.connection_is_active = True
+    return session
+
+
+def bench(label: str, rtt: float, timeouts: Adaptive_timeout, warmup: int):
+    session = _session(rtt, timeouts)
+    for _ in range(warmup):
+        session.send_command_read_answer("show clock")
+    started = time.perf_counter()
+    try:
+        session.send_command_read_answer("show system")
+    except RuntimeError:
+        pass
+    hang = time.perf_counter() - started
+    started = time.perf_counter()
+    try:
+        session.send_command_read_answer("show clock")
+    except RuntimeError:
+        pass
+    print(f"{label:<34} hung command {hang * 1000:8.1f} ms   next command {(time.perf_counter() - started) * 1000:8.1f} ms"
+          f"   timeout {timeouts.value:.2f}s")
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Cost of a switch that stops answering: fixed vs adaptive timeouts.")
+    parser.add_argument("--rtt", type=float, default=0.05)
+    parser.add_argument("--warmup", type=int, default=20, help="answered commands before the hang")
+    args = parser.parse_args(argv)
+
+    print(f"rtt {args.rtt * 1000:.0f} ms, {args.warmup} answered commands, then the switch hangs")
+    bench("fixed 10 s timeout", args.rtt, Adaptive_timeout(minimum=10.0, maximum=10.0), args.warmup)
+    bench("adaptive timeout + one probe", args.rtt, Adaptive_timeout(), args.warmup)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
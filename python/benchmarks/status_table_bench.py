@@ -0,0 +1,93 @@
+import argparse
+import random
+import sys
+import time
+
+from core.status_table import Fleet_status_table
+from domain.physical_interface import Physical_interface_current_status
+from infrastructure.ssh_client import Session_handler
+from simulator.synthetic_config import build_interfaces_status
+
+
+def build_status_rows(devices: int, ports: int, seed: int = 1) -> dict:
+    """
+    ip -> parsed 'show interfaces status' rows, with some ports down or negotiated at 100M half duplex.
+    """
+    template = Session_handler.parse_interfaces_status(build_interfaces_status(ports))
+    randomizer = random.Random(seed)
+    fleet = {}
+    for index in range(devices):
+        rows = {}
+        for name, values in template.items():
+            values = list(values)
+            if name.startswith("gi"):
+                roll = randomizer.random()
+                if roll < 0.1:
+                    values = [values[0], "--", "--", "--", "--", "Down", "--", "--"]
+                elif roll < 0.13:
+                    values = [values[0], "Half", "100", "Enabled", "Off", "Up", "Disabled", "On"]
+            rows[name] = values
+        fleet[f"10.0.{index // 250}.{index % 250 + 1}"] = rows
+    return fleet
+
+
+def _timed(function):
+    started = time.perf_counter()
+    result = function()
+    return result, time.perf_counter() - started
+
+
+def object_walk(objects: dict):
+    slow_ports = [(ip, name) for ip, status_objects in objects.items() for name, status_obj in status_objects.items()
+                  if status_obj.speed == "100" and status_obj.duplex == "Half"]
+    down_per_switch = {}
+    for ip, status_objects in objects.items():
+        down = sum(1 for status_obj in status_objects.values() if status_obj.link_state == "Down")
+        if down:
+            down_per_switch[ip] = down
+    return slow_ports, down_per_switch
+
+
+def columnar(table: Fleet_status_table):
+    slow_ports = table.rows(table.mask(speed="100", duplex="Half"))
+    down_per_switch = table.count_by("device", table.mask(link_state="Down"))
+    return slow_ports, down_per_switch
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Fleet-wide status queries: object walk vs Fleet_status_table.")
+    parser.add_argument("--devices", type=int, default=500)
+    parser.add_argument("--ports", type=int, default=52)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args(argv)
+
+    fleet = build_status_rows(args.devices, args.ports)
+    objects, build_objects = _timed(lambda: {
+        ip: {name: Physical_interface_current_status(name, values) for name, values in rows.items()
+             if name != "headers" and name.startswith("gi")}
+        for ip, rows in fleet.items()})
+    table = Fleet_status_table(capacity=args.devices * (args.ports + 8))
+    _, build_table = _timed(lambda: [table.set_device(ip, {name: values for name, values in rows.items()
+                                                           if name.startswith("gi")})
+                                     for ip, rows in fleet.items()])
+
+    walk_result, _ = _timed(lambda: object_walk(objects))
+    column_result, _ = _timed(lambda: columnar(table))
+    assert sorted(walk_result[0]) == sorted(column_result[0])
+    assert walk_result[1] == column_result[1]
+
+    walk_time = min(_timed(lambda: object_walk(objects))[1] for _ in range(args.repeat))
+    column_time = min(_timed(lambda: columnar(table))[1] for _ in range(args.repeat))
+    mask_time = min(_timed(lambda: table.count(table.mask(speed="100", duplex="Half")))[1] for _ in range(args.repeat))
+
+    print(f"{args.devices} switches x {args.ports} ports = {len(table)} rows; "
+          f"{len(walk_result[0])} ports at 100M half, {len(walk_result[1])} switches with links down")
+    print(f"{'build objects':<34} {build_objects * 1000:8.1f} ms")
+    print(f"{'build Fleet_status_table':<34} {build_table * 1000:8.1f} ms")
+    print(f"{'object walk (both queries)':<34} {walk_time * 1000:8.2f} ms")
+    print(f"{'columnar (both queries)':<34} {column_time * 1000:8.2f} ms   {walk_time / column_time:5.1f}x")
+    print(f"{'columnar count only (100M half)':<34} {mask_time * 1000:8.2f} ms")
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,65 @@
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from core.initializer import Initializer
+from infrastructure.ssh_client import Session_handler
+from infrastructure.storage import Snapshot_store, Sqlite_backend
+from simulator.synthetic_config import build_interfaces_status, build_running_config
+
+
+def build_fleet(devices: int, ports: int, vlans: int) -> dict:
+    """
+    ip -> Initializer filled from synthetic configs, without any SSH traffic.
+    """
+    running_config = build_running_config(ports=ports, vlans=vlans, hostname="switch01")
+    interfaces_status = Session_handler.parse_interfaces_status(build_interfaces_status(ports))
+    fleet = {}
+    for index in range(devices):
+        initializer = Initializer(session=None)
+        initializer.running_config = running_config
+        initializer.startup_config = running_config
+        initializer.model_name = "CBS250-48T-4G"
+        initializer.interfaces_status = interfaces_status
+        initializer._initialize_physical_interfaces_and_current_status()
+        fleet[f"10.0.{index // 250}.{index % 250 + 1}"] = initializer
+    return fleet
+
+
+def _record(store: Snapshot_store, fleet: dict, label: str):
+    round_trips = store.backend.round_trips
+    started = time.perf_counter()
+    store.record_devices(fleet)
+    print(f"{label:<34} {(time.perf_counter() - started) * 1000:8.1f} ms   "
+          f"{store.backend.round_trips - round_trips:3d} round trips")
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Snapshot_store write cost for a fleet run (SQLite).")
+    parser.add_argument("--devices", type=int, default=500)
+    parser.add_argument("--ports", type=int, default=52)
+    parser.add_argument("--vlans", type=int, default=100)
+    args = parser.parse_args(argv)
+
+    fleet = build_fleet(args.devices, args.ports, args.vlans)
+    with tempfile.TemporaryDirectory() as directory:
+        store = Snapshot_store(Sqlite_backend(os.path.join(directory, "snapshots.sqlite")))
+        print(f"{args.devices} devices x {args.ports} ports")
+        _record(store, fleet, "first run (everything new)")
+        _record(store, fleet, "second run (nothing changed)")
+
+        for initializer in list(fleet.values())[:args.devices // 10]:
+            status_obj = initializer.interfaces_current_status_objects["gi1"]
+            status_obj.link_state = "Down" if status_obj.link_state == "Up" else "Up"
+        _record(store, fleet, "third run (10% of devices flapped)")
+
+        counts = {table: store.backend.execute(f"SELECT COUNT(*) FROM {table}")[0][0]
+                  for table in ("config_snapshots", "interface_settings", "status_samples", "device_runs")}
+        print(f"rows: {counts}")
+        store.backend.close()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
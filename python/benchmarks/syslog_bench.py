@@ -0,0 +1,71 @@
+import argparse
+import asyncio
+import socket
+import sys
+import threading
+import time
+
+from infrastructure.syslog_receiver import Syslog_receiver
+
+MESSAGES = (
+    "<189>Oct 17 10:00:00 switch01 %LINK-W-Down:  gi{port}",
+    "<189>Oct 17 10:00:01 switch01 %LINK-I-Up:  gi{port}",
+    "<190>Oct 17 10:00:02 switch01 %STP-W-PORTSTATUS: gi{port}: STP status Forwarding",
+    "<189>Oct 17 10:00:03 switch01 %COPY-N-TRAP: The copy operation was completed successfully",
+)
+
+
+def send_messages(port: int, messages: int, rate: int) -> int:
+    """
+    Sends messages at about 'rate' per second in 10 ms bursts, like a fleet-wide link storm.
+    """
+    payloads = [MESSAGES[index % len(MESSAGES)].format(port=index % 52 + 1).encode() for index in range(messages)]
+    sender = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    burst = max(1, rate // 100)
+    started = time.perf_counter()
+    for position in range(0, messages, burst):
+        for payload in payloads[position:position + burst]:
+            sender.sendto(payload, ("127.0.0.1", port))
+        delay = started + (position + burst) / rate - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+    sender.close()
+    return messages
+
+
+async def bench(messages: int, rate: int, batch_size: int, buffer_size: int, max_pending: int):
+    receiver = Syslog_receiver(host="127.0.0.1", port=0, buffer_size=buffer_size, max_pending=max_pending,
+                               batch_size=batch_size)
+    await receiver.start()
+    events = []
+    receiver.add_listener(events.extend)
+
+    started = time.perf_counter()
+    sender = threading.Thread(target=send_messages, args=(receiver.port, messages, rate))
+    sender.start()
+    while sender.is_alive() or receiver.stats()["pending"]:
+        await asyncio.sleep(0.05)
+    await asyncio.sleep(0.2)  # datagrams still in the socket buffer
+    elapsed = time.perf_counter() - started
+    receiver.close()
+
+    print(f"offered {messages} at {rate:,}/s: received {receiver.received} "
+          f"({messages - receiver.received} lost before the receiver), parsed {receiver.parsed}, "
+          f"dropped {receiver.dropped}, overwritten {receiver.overwritten}")
+    print(f"{receiver.parsed / elapsed:,.0f} messages/s sustained, {len(events)} events, "
+          f"rates {receiver.device_rates}")
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Syslog receiver throughput on localhost.")
+    parser.add_argument("--messages", type=int, default=200000)
+    parser.add_argument("--rate", type=int, default=50000, help="messages per second offered")
+    parser.add_argument("--batch-size", type=int, default=1024)
+    parser.add_argument("--buffer-size", type=int, default=65536)
+    parser.add_argument("--max-pending", type=int, default=65536)
+    args = parser.parse_args(argv)
+    asyncio.run(bench(args.messages, args.rate, args.batch_size, args.buffer_size, args.max_pending))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
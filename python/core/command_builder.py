@@ -0,0 +1,171 @@
+import re
+
+from domain.physical_interface import Physical_interface_settings
+from domain.vlan_set import Vlan_set
+
+
+_INTERFACE_NAME = re.compile(r"^([A-Za-z-]+)(\d+)$")
+
+
+def _vlan_delta(command: str, current: Vlan_set, desired: Vlan_set, suffix: str = "") -> list:
+    """
+    'add' / 'remove' commands turning current into desired, e.g. 'switchport trunk allowed vlan add 10-20'.
+    """
+    commands = []
+    removed = current - desired
+    added = desired - current
+    if removed:
+        commands.append(f"{command} remove {removed.to_cli()}")
+    if added:
+        commands.append(f"{command} add {added.to_cli()}{suffix}")
+    return commands
+
+
+class Command_builder:
+    """
+    Turns the difference between two Physical_interface_settings into CBS250 interface
+    sub-commands, and groups ports with identical changes into 'interface range' blocks.
+
+    Commands come out in a fixed field order that the CLI accepts: the switchport mode
+    before mode-specific VLAN settings, negotiation before speed / duplex, IP addresses
+    removed before new ones are added, and the admin state last.
+    """
+
+    @staticmethod
+    def interface_commands(current: Physical_interface_settings, desired: Physical_interface_settings) -> list:
+        """
+        Smallest list of sub-commands turning current into desired (empty if nothing differs).
+        Each item is (rank, command); rank is the position in the field order above.
+        """
+        commands = []
+
+        def emit(rank: int, command: str):
+            commands.append((rank, command))
+
+        if desired.active_mode != current.active_mode:
+            emit(0, "no switchport" if desired.active_mode == "no switchport"
+                 else f"switchport mode {desired.active_mode}")
+        if desired.description != current.description:
+            emit(1, f"description {desired.description}" if desired.description else "no description")
+        if desired.negotiation != current.negotiation:
+            emit(2, "negotiation" if desired.negotiation == "Enabled" else "no negotiation")
+        if desired.speed != current.speed:
+            emit(3, f"speed {desired.speed}")
+        if desired.duplex != current.duplex:
+            emit(4, f"duplex {desired.duplex.lower()}")
+        if desired.flow_ctrl != current.flow_ctrl:
+            emit(5, f"flowcontrol {desired.flow_ctrl.lower()}")
+        if desired.back_pressure != current.back_pressure:
+            emit(6, "back-pressure" if desired.back_pressure == "Enabled" else "no back-pressure")
+        if desired.mdix_mode != current.mdix_mode:
+            emit(7, f"mdix {desired.mdix_mode.lower()}")
+        if desired.access_vlan != current.access_vlan:
+            emit(8, f"switchport access vlan {desired.access_vlan}")
+        for command in _vlan_delta("switchport trunk allowed vlan", current.allowed_vlans, desired.allowed_vlans):
+            emit(9, command)
+        if desired.native_vlan != current.native_vlan:
+            emit(10, f"switchport trunk native vlan {desired.native_vlan}" if desired.native_vlan else "no switchport trunk native vlan")
+
+        # General mode: a VLAN is either tagged or untagged, so removals cover both lists
+        current_general = current.general_allowed_tagged | current.general_allowed_untagged
+        desired_general = desired.general_allowed_tagged | desired.general_allowed_untagged
+        removed = current_general - desired_general
+        if removed:
+            emit(11, f"switchport general allowed vlan remove {removed.to_cli()}")
+        tagged = desired.general_allowed_tagged - current.general_allowed_tagged
+        if tagged:
+            emit(11, f"switchport general allowed vlan add {tagged.to_cli()} tagged")
+        untagged = desired.general_allowed_untagged - current.general_allowed_untagged
+        if untagged:
+            emit(11, f"switchport general allowed vlan add {untagged.to_cli()} untagged")
+        for command in _vlan_delta("switchport general forbidden vlan", current.general_forbiden,
+                                   desired.general_forbiden):
+            emit(12, command)
+        if desired.pvid_vlan != current.pvid_vlan:
+            emit(13, f"switchport general pvid {desired.pvid_vlan}" if desired.pvid_vlan else "no switchport general pvid")
+        if desired.customer_vlan != current.customer_vlan:
+            emit(14, f"switchport customer vlan {desired.customer_vlan}" if desired.customer_vlan else "no switchport customer vlan")
+
+        # L3: {'DHCP': bool, address: mask, ...}; a changed mask is a removal plus an addition
+        current_ips, desired_ips = current.physical_interface_ips, desired.physical_interface_ips
+        if current_ips.get("DHCP") and not desired_ips.get("DHCP"):
+            emit(15, "no ip address dhcp")
+        for address, mask in current_ips.items():
+            if address != "DHCP" and desired_ips.get(address) != mask:
+                emit(15, f"no ip address {address}")
+        if desired_ips.get("DHCP") and not current_ips.get("DHCP"):
+            emit(16, "ip address dhcp")
+        for address, mask in desired_ips.items():
+            if address != "DHCP" and current_ips.get(address) != mask:
+                emit(16, f"ip address {address} {mask}")
+
+        if desired.link_admin_state != current.link_admin_state:
+            emit(17, desired.link_admin_state)
+        return commands
+
+    @staticmethod
+    def range_expression(names: list) -> str:
+        """
+        CBS250 interface range syntax for a list of ports, e.g. ['gi1', 'gi2', 'gi3', 'gi7'] -> 'gi1-3,gi7'.
+        """
+        by_prefix = {}
+        for name in names:
+            match = _INTERFACE_NAME.match(name)
+            if match:
+                by_prefix.setdefault(match.group(1), []).append(int(match.group(2)))
+            else:
+                by_prefix.setdefault(name, [])
+        items = []
+        for prefix, numbers in by_prefix.items():
+            if not numbers:
+                items.append(prefix)
+                continue
+            numbers = sorted(set(numbers))
+            start = previous = numbers[0]
+            for number in numbers[1:] + [None]:
+                if number is not None and number == previous + 1:
+                    previous = number
+                    continue
+                items.append(f"{prefix}{start}" if start == previous else f"{prefix}{start}-{previous}")
+                if number is not None:
+                    start = previous = number
+        return ",".join(items)
+
+    @classmethod
+    def build(cls, current: dict, desired: dict) -> list:
+        """
+        Commands for every port of desired that differs from current (name -> settings object).
+
+        Ports needing the same command are handled by one 'interface range' block. Blocks are
+        emitted rank by rank, so every port still receives its commands in field order, and
+        consecutive blocks for the same ports are merged.
+
+        Returns:
+            list[str]: Interface blocks ('interface ...', sub-commands, 'exit'), without configure / end
+        """
+        by_rank = {}    # rank -> {command: [port, ...]}
+        for name, desired_obj in desired.items():
+            current_obj = current.get(name)
+            if current_obj is None:
+                continue
+            for rank, command in cls.interface_commands(current_obj, desired_obj):
+                by_rank.setdefault(rank, {}).setdefault(command, []).append(name)
+
+        blocks = []     # [(ports tuple, [commands])]
+        for rank in sorted(by_rank):
+            for command, ports in sorted(by_rank[rank].items(), key=lambda item: (item[1], item[0])):
+                ports = tuple(ports)
+                if blocks and blocks[-1][0] == ports:
+                    blocks[-1][1].append(command)
+                else:
+                    blocks.append((ports, [command]))
+
+        lines = []
+        for ports, commands in blocks:
+            if len(ports) == 1:
+                lines.append(f"interface {ports[0]}")
+            else:
+                lines.append(f"interface range {cls.range_expression(list(ports))}")
+            lines += commands
+            lines.append("exit")
+        return lines
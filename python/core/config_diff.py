@@ -0,0 +1,109 @@
+from collections import Counter
+
+from core.config_parser import Running_config_parser
+
+
+class Section_diff:
+    def __init__(self, kind: str, name: str, status: str, added: list, removed: list):
+        """
+        Changes of one config section, seen from the startup config towards the running config.
+        status is 'added' (section only in running), 'removed' (only in startup) or 'changed'.
+        'added' lines exist only in the running config (unsaved), 'removed' lines only in startup.
+        """
+        self.kind = kind
+        self.name = name
+        self.status = status
+        self.added = added
+        self.removed = removed
+
+    def __repr__(self):
+        return f"<Section_diff {self.status} {self.kind} {self.name or '-'} +{len(self.added)} -{len(self.removed)}>"
+
+
+class Config_diff:
+    def __init__(self, sections: list):
+        """
+        Result of diff_configs(): only the sections that differ.
+        """
+        self.sections = sections
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.sections)
+
+    def __iter__(self):
+        return iter(self.sections)
+
+    def __len__(self):
+        return len(self.sections)
+
+    def __repr__(self):
+        return f"<Config_diff changed_sections={len(self.sections)}>"
+
+
+def _section_counters(config_lines: list, parser: Running_config_parser) -> dict:
+    """
+    Maps (kind, name) -> Counter of the section's lines. Lines are hashed within their
+    section, so identical lines in different sections never cancel each other out,
+    and reordering inside a section is not reported as a change.
+    """
+    model = parser.parse(config_lines)
+    return {key: Counter(section.lines) for key, section in model.sections.items()}
+
+
+def diff_configs(running_config: list, startup_config: list, parser: Running_config_parser = None) -> Config_diff:
+    """
+    Section-aware diff over two lists returned by Session_handler.get_config().
+    Runs in linear time over both configs and reports only the changed sections.
+
+    Args:
+        running_config (list): Cleaned running-config lines
+        startup_config (list): Cleaned startup-config lines
+        parser (Running_config_parser): Optional parser instance to reuse across calls
+
+    Returns:
+        Config_diff: Changed sections, ordered as they appear in the running config
+    """
+    if running_config == startup_config:
+        return Config_diff([])
+
+    parser = parser or Running_config_parser()
+    running = _section_counters(running_config, parser)
+    startup = _section_counters(startup_config, parser)
+
+    sections = []
+    for key in list(running) + [key for key in startup if key not in running]:
+        running_lines = running.get(key)
+        startup_lines = startup.get(key)
+        if running_lines == startup_lines:
+            continue
+        if startup_lines is None:
+            status, startup_lines = "added", Counter()
+        elif running_lines is None:
+            status, running_lines = "removed", Counter()
+        else:
+            status = "changed"
+        added = list((running_lines - startup_lines).elements())
+        removed = list((startup_lines - running_lines).elements())
+        sections.append(Section_diff(key[0], key[1], status, added, removed))
+
+    return Config_diff(sections)
+
+
+def find_unsaved_changes(configs: dict) -> dict:
+    """
+    Batch mode: answers "which switches have unsaved changes" for a whole fleet in one call.
+
+    Args:
+        configs (dict): ip -> (running_config, startup_config)
+
+    Returns:
+        dict: ip -> Config_diff, only for switches whose running config differs from startup
+    """
+    parser = Running_config_parser()
+    unsaved = {}
+    for ip, (running_config, startup_config) in configs.items():
+        config_diff = diff_configs(running_config, startup_config, parser)
+        if config_diff.has_changes:
+            unsaved[ip] = config_diff
+    return unsaved
@@ -0,0 +1,190 @@
+_NO_MATCH = object()
+
+
+class Command_table:
+    def __init__(self, max_cached_lines: int = 4096):
+        """
+        Dict dispatch from command prefixes to handlers.
+        Prefixes are bucketed by their first word, so a lookup is one dict access plus a
+        couple of startswith() checks inside a small bucket, independent of how many
+        handlers are registered. Inside a bucket the longest prefix wins.
+
+        Results are memoised per line: configs repeat the same lines ('switchport mode trunk',
+        'exit', ...) on every port, so most lookups are a single dict hit.
+        """
+        self._buckets = {}
+        self._matches = {}
+        self.max_cached_lines = max_cached_lines
+
+    def register(self, prefix: str, handler):
+        bucket = self._buckets.setdefault(prefix.partition(" ")[0], [])
+        bucket.append((prefix, handler))
+        bucket.sort(key=lambda entry: len(entry[0]), reverse=True)
+        self._matches.clear()
+
+    def copy(self) -> "Command_table":
+        table = Command_table(self.max_cached_lines)
+        table._buckets = {first_word: list(bucket) for first_word, bucket in self._buckets.items()}
+        return table
+
+    def match(self, line: str, default=None):
+        """
+        Returns the handler of the longest registered prefix of line, or default when no
+        prefix matches (so a registered None handler can be told apart from no match).
+        """
+        handler = self._matches.get(line, _NO_MATCH)
+        if handler is _NO_MATCH and line not in self._matches:
+            for prefix, candidate in self._buckets.get(line.partition(" ")[0], ()):
+                if line.startswith(prefix):
+                    handler = candidate
+                    break
+            if len(self._matches) >= self.max_cached_lines:
+                self._matches.clear()
+            self._matches[line] = handler
+        return default if handler is _NO_MATCH else handler
+
+    def __contains__(self, line: str) -> bool:
+        return self.match(line) is not None
+
+
+class Config_section:
+    def __init__(self, kind: str, name: str, header: str = ""):
+        """
+        One block of the configuration, e.g. kind='interface', name='gi5'.
+        """
+        self.kind = kind
+        self.name = name
+        self.header = header
+        self.lines = []
+
+    def __repr__(self):
+        return f"<Config_section kind={self.kind} name={self.name} lines={len(self.lines)}>"
+
+
+class Config_model:
+    def __init__(self):
+        """
+        Indexed view of a configuration: every section can be looked up in O(1)
+        by (kind, name), and all sections of one kind are grouped together.
+        """
+        self.sections = {}
+        self.by_kind = {}
+        self.global_section = self.add_section("global", "")
+
+    def add_section(self, kind: str, name: str, header: str = "") -> Config_section:
+        """
+        Returns the section for (kind, name), creating it on first use.
+        A repeated header continues the existing section instead of replacing it.
+        """
+        section = self.sections.get((kind, name))
+        if section is None:
+            section = Config_section(kind, name, header)
+            self.sections[(kind, name)] = section
+            self.by_kind.setdefault(kind, {})[name] = section
+        return section
+
+    def get(self, kind: str, name: str = ""):
+        return self.sections.get((kind, name))
+
+    def remove_section(self, kind: str, name: str):
+        """
+        Drops the section for (kind, name) and returns it, or None if there was none.
+        """
+        section = self.sections.pop((kind, name), None)
+        if section is not None:
+            self.by_kind[kind].pop(name, None)
+        return section
+
+    def names(self, kind: str) -> list:
+        return list(self.by_kind.get(kind, {}))
+
+    def __contains__(self, key: tuple) -> bool:
+        return key in self.sections
+
+    def __repr__(self):
+        counts = ", ".join(f"{kind}={len(names)}" for kind, names in self.by_kind.items())
+        return f"<Config_model {counts}>"
+
+
+# Lines that always belong to the global configuration and therefore close an open section.
+GLOBAL_COMMANDS = (
+    "config-file-header", "unit-type-control-start", "unit-type-control-end", "unit-type",
+    "file SSD", "CLI v", "@", "hostname", "username", "enable password", "ip ssh", "ip http", "ip telnet", "ip default-gateway", "ip domain",
+    "ip name-server", "ip dhcp snooping", "aaa", "snmp-server", "logging", "clock", "sntp",
+    "voice vlan", "macro auto", "bonjour", "crypto", "management", "spanning-tree mode",
+    "spanning-tree priority", "encrypted", "errdisable",
+)
+
+
+class Running_config_parser:
+    _default_dispatch = None     # built once and shared, so its line cache stays warm across parses
+
+    def __init__(self):
+        """
+        Single-pass parser turning cleaned config lines (as returned by
+        Session_handler.get_config) into a Config_model.
+
+        Section headers and global commands share one Command_table, so every line costs
+        a single dispatch. Since cleaned output carries no 'exit' lines, an open section
+        ends at the next header, at a known global command or, for sections with a fixed
+        vocabulary, at the first line outside that vocabulary.
+
+        All parsers share the default table; register_section() gives a parser its own copy.
+        """
+        if Running_config_parser._default_dispatch is None:
+            self._dispatch, self._shared = Command_table(), False
+            self.register_section("interface GigabitEthernet", "interface", "gi")
+            self.register_section("interface Port-channel", "port-channel", "Po")
+            self.register_section("interface vlan", "vlan-interface", "vlan")
+            self.register_section("interface", "interface")
+            self.register_section("vlan database", "vlan", "database", members=("vlan",))
+            self.register_section("line", "line")
+            for command in GLOBAL_COMMANDS:
+                self._dispatch.register(command, None)
+            Running_config_parser._default_dispatch = self._dispatch
+        self._dispatch, self._shared = Running_config_parser._default_dispatch, True
+
+    def register_section(self, prefix: str, kind: str, short_name: str = "", members: tuple = None):
+        """
+        Registers a section header.
+
+        Args:
+            prefix (str): Header prefix, e.g. 'interface GigabitEthernet'
+            kind (str): Section kind in the resulting Config_model
+            short_name (str): Replaces the prefix in the section name, e.g. 'gi' -> 'gi5'
+            members (tuple): Optional prefixes of the only lines allowed inside the section
+        """
+        if self._shared:
+            self._dispatch, self._shared = self._dispatch.copy(), False
+        member_table = None
+        if members:
+            member_table = Command_table()
+            for member in members:
+                member_table.register(member, True)
+        self._dispatch.register(prefix, (kind, len(prefix), short_name, member_table))
+
+    def is_section_header(self, line: str) -> bool:
+        """
+        True if line opens a section, i.e. parse() would start a new section at it.
+        """
+        return isinstance(self._dispatch.match(line, False), tuple)
+
+    def parse(self, lines: list) -> Config_model:
+        model = Config_model()
+        global_section = current = model.global_section
+        match = self._dispatch.match
+        members = None
+
+        for line in lines:
+            header = match(line, False)
+            if header:
+                kind, length, short_name, members = header
+                current = model.add_section(kind, short_name + line[length:].strip(), line)
+                continue
+
+            if header is None or (members is not None and line not in members):
+                # Known global command, or a line outside the open section's vocabulary
+                current, members = global_section, None
+            current.lines.append(line)
+
+        return model
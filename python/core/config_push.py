@@ -0,0 +1,106 @@
+from core.command_builder import Command_builder
+from core.initializer import Initializer
+from infrastructure.instrumentation import phase_scope
+
+
+class Push_result:
+    def __init__(self, commands: list, results: list, errors: list, verified: bool, mismatches: dict):
+        """
+        Outcome of Config_push_engine.push().
+
+        Args:
+            commands (list[str]): Lines sent below 'configure terminal'
+            results (list[Command_result]): Per-command results of the config session
+            errors (list[str]): Switch errors and session failures
+            verified (bool): True if the re-read ports match the desired settings
+            mismatches (dict): Port name -> commands that would still be needed after the push
+        """
+        self.commands = commands
+        self.results = results
+        self.errors = errors
+        self.verified = verified
+        self.mismatches = mismatches
+
+    @property
+    def ok(self) -> bool:
+        return not self.errors and self.verified
+
+    def __repr__(self):
+        return (f"<Push_result commands={len(self.commands)} errors={len(self.errors)} "
+                f"verified={self.verified}>")
+
+
+class Config_push_engine:
+    def __init__(self, initializer: Initializer):
+        """
+        Pushes desired interface settings to one switch with as few commands as possible.
+
+        The desired Physical_interface_settings are compared against the initializer's parsed
+        state, only differing fields become commands, and ports with identical changes share
+        an 'interface range' block. Everything goes out in one config session with a single
+        'end'; afterwards only the changed ports are re-read (one batch) and compared again.
+
+        Args:
+            initializer (Initializer): Initialized device; its objects are the current state
+        """
+        self.initializer = initializer
+
+    def changed_ports(self, desired: dict) -> list:
+        """
+        Names of the ports in desired (name -> Physical_interface_settings) whose settings differ.
+        """
+        current = self.initializer.physical_interfaces_settings_objects
+        return [name for name, desired_obj in desired.items()
+                if name in current and Command_builder.interface_commands(current[name], desired_obj)]
+
+    def plan(self, desired: dict) -> list:
+        """
+        Config lines push() would send for desired, without 'configure terminal' / 'end'.
+        """
+        return Command_builder.build(self.initializer.physical_interfaces_settings_objects, desired)
+
+    def push(self, desired: dict, verify: bool = True) -> Push_result:
+        """
+        Applies desired (name -> Physical_interface_settings) in one config session.
+
+        Unknown port names are reported as errors and skipped. When verify is set the changed
+        ports are refreshed afterwards; a port that still differs is listed in mismatches.
+
+        Returns:
+            Push_result: Sent commands, per-command results and the verification outcome
+        """
+        session = self.initializer.session
+        current = self.initializer.physical_interfaces_settings_objects
+        errors = [f"Unknown interface {name}." for name in desired if name not in current]
+        changed = self.changed_ports(desired)
+        commands = self.plan(desired)
+        if not commands:
+            return Push_result([], [], errors, True, {})
+
+        metrics = getattr(session, "metrics", None)
+        with phase_scope(metrics, session.ip, "push"):
+            try:
+                if not session.connection_is_active:
+                    session.connect()
+                results = session.send_config_batch(commands)
+            except RuntimeError as e:
+                errors.append(f"SSH session not active while pushing: {e}")
+                return Push_result(commands, [], errors, False, {})
+        errors += [f"'{result.command}' failed: {result.error}" for result in results if not result.ok]
+
+        if not verify:
+            return Push_result(commands, results, errors, False, {})
+        with phase_scope(metrics, session.ip, "verify"):
+            refreshed = self.initializer.refresh_interfaces(changed)
+        if not refreshed:
+            errors.append("Re-reading the changed interfaces failed, see initialization_log.")
+
+        mismatches = {}
+        for name in changed:
+            remaining = Command_builder.interface_commands(current[name], desired[name])
+            if remaining:
+                mismatches[name] = [command for _, command in remaining]
+        return Push_result(commands, results, errors, refreshed and not mismatches, mismatches)
+
+    def __repr__(self):
+        return f"<Config_push_engine {self.initializer.session.ip}>"
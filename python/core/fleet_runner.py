@@ -0,0 +1,186 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from infrastructure.ssh_client import Session_handler
+from core.initializer import Initializer
+from core.config_diff import find_unsaved_changes
+from core.status_table import Fleet_status_table
+from domain.physical_interface import ports_carrying_vlan
+
+
+class Device_result:
+    def __init__(self, ip: str):
+        """
+        Holds the outcome of one device initialization inside a fleet run.
+        """
+        self.ip = ip
+        self.connect_status = None
+        self.initializer = None
+        self.timed_out = False
+        self.error = None
+        self.timings = {"connect": 0.0, "initialize": 0.0, "total": 0.0}
+
+    @property
+    def succeeded(self) -> bool:
+        return self.connect_status == "Connection established" and not self.timed_out and self.error is None
+
+    @property
+    def initialization_log(self) -> list:
+        return self.initializer.initialization_log if self.initializer else []
+
+    @property
+    def physical_interfaces_settings_objects(self) -> dict:
+        return self.initializer.physical_interfaces_settings_objects if self.initializer else {}
+
+    @property
+    def interfaces_current_status_objects(self) -> dict:
+        return self.initializer.interfaces_current_status_objects if self.initializer else {}
+
+    def __repr__(self):
+        return f"<Device_result ip={self.ip} ok={self.succeeded} total={self.timings['total']:.2f}s>"
+
+
+class Fleet_result:
+    def __init__(self):
+        """
+        Collects Device_result objects of a fleet run, keyed by device IP.
+        """
+        self.devices = {}
+        self.wall_time = 0.0
+        self.run_id = None
+
+    @property
+    def succeeded(self) -> list:
+        return [result for result in self.devices.values() if result.succeeded]
+
+    @property
+    def failed(self) -> list:
+        return [result for result in self.devices.values() if not result.succeeded]
+
+    @property
+    def sequential_time(self) -> float:
+        """
+        Sum of per-device times, i.e. what the run would have cost one switch after another.
+        """
+        return sum(result.timings["total"] for result in self.devices.values())
+
+    def unsaved_changes(self) -> dict:
+        """
+        Returns ip -> Config_diff for every successfully initialized switch
+        whose running config differs from its startup config.
+        """
+        return find_unsaved_changes({
+            result.ip: (result.initializer.running_config, result.initializer.startup_config)
+            for result in self.succeeded
+        })
+
+    def ports_carrying_vlan(self, vlan: int) -> dict:
+        """
+        Returns ip -> interface names of every port in the fleet that carries vlan.
+        """
+        return ports_carrying_vlan({result.ip: result.physical_interfaces_settings_objects
+                                    for result in self.succeeded}, vlan)
+
+    def status_table(self) -> Fleet_status_table:
+        """
+        Interface status of every successfully initialized switch as one columnar table,
+        for fleet-wide filters and counts (see core.status_table).
+        """
+        return Fleet_status_table.from_initializers({result.ip: result.initializer for result in self.succeeded})
+
+    def __getitem__(self, ip: str) -> Device_result:
+        return self.devices[ip]
+
+    def __repr__(self):
+        return (f"<Fleet_result devices={len(self.devices)} ok={len(self.succeeded)} "
+                f"failed={len(self.failed)} wall={self.wall_time:.2f}s>")
+
+
+class Fleet_runner:
+    def __init__(self, inventory: list[dict], max_concurrency: int = 32, device_deadline: float = 120.0,
+                 session_factory=None, snapshot_cache=None, metrics=None, store=None):
+        """
+        Runs connect() + Initializer.initialize() over many switches at once.
+
+        Args:
+            inventory (list[dict]): Items with 'ip', 'username' and 'password' keys.
+            max_concurrency (int): Upper bound of devices handled at the same time.
+            device_deadline (float): Seconds a single device may take before its session is torn down.
+            session_factory: Optional callable (ip, username, password) -> Session_handler.
+            snapshot_cache: Optional Snapshot_cache shared by all devices.
+            metrics: Optional Metrics_recorder shared by all sessions.
+            store: Optional Snapshot_store; the results of each run are written in one transaction.
+        """
+        self.inventory = inventory
+        self.max_concurrency = max_concurrency
+        self.device_deadline = device_deadline
+        self.session_factory = session_factory or Session_handler
+        self.snapshot_cache = snapshot_cache
+        self.metrics = metrics
+        self.store = store
+
+    def run(self) -> Fleet_result:
+        """
+        Initializes every device in the inventory. Wall-clock time tracks the slowest
+        switch (per concurrency slot) instead of the sum of all of them.
+        """
+        fleet_result = Fleet_result()
+        started = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+            futures = [executor.submit(self._run_device, device) for device in self.inventory]
+            for future in futures:
+                result = future.result()
+                fleet_result.devices[result.ip] = result
+
+        fleet_result.wall_time = time.perf_counter() - started
+        if self.store is not None:
+            fleet_result.run_id = self.store.record_fleet(fleet_result)
+        return fleet_result
+
+    def _run_device(self, device: dict) -> Device_result:
+        """
+        Worker body: connects, initializes and disconnects a single switch. Any failure,
+        including the session factory raising, ends up in this device's result only.
+        A watchdog timer cancels the session once the per-device deadline has passed: the
+        worker stops at its next read (within one timeout) and no reconnect is attempted.
+        """
+        result = Device_result(device["ip"])
+        started = time.perf_counter()
+        try:
+            session = self.session_factory(device["ip"], device["username"], device["password"])
+        except Exception as e:
+            result.error = f"Creating the session failed: {e}"
+            result.timings["total"] = time.perf_counter() - started
+            return result
+        if self.metrics is not None:
+            session.metrics = self.metrics
+
+        def on_deadline():
+            result.timed_out = True
+            session.cancel(f"Deadline of {self.device_deadline}s exceeded")
+
+        watchdog = threading.Timer(self.device_deadline, on_deadline)
+        watchdog.daemon = True
+        watchdog.start()
+        try:
+            result.connect_status = session.connect()
+            result.timings["connect"] = time.perf_counter() - started
+            if result.connect_status != "Connection established":
+                result.error = result.connect_status
+                return result
+
+            result.initializer = Initializer(session, self.snapshot_cache)
+            init_started = time.perf_counter()
+            result.initializer.initialize()
+            result.timings["initialize"] = time.perf_counter() - init_started
+        except Exception as e:
+            result.error = f"Device run failed: {e}"
+        finally:
+            watchdog.cancel()
+            if result.timed_out:
+                result.error = result.error or f"Deadline of {self.device_deadline}s exceeded"
+            session.disconnect()
+            result.timings["total"] = time.perf_counter() - started
+        return result
@@ -1,25 +1,45 @@
+import re
+
 from infrastructure.ssh_client import Session_handler
 from domain.physical_interface import Physical_interface_current_status, Physical_interface_settings
+from core.config_parser import Running_config_parser
+from core.interface_config import apply_interface_config
+from infrastructure.config_cleaner import clean_config_text
+from infrastructure.snapshot_cache import Snapshot_cache
+from infrastructure.instrumentation import phase_scope
 
 
 class Initializer:
-    def __init__(self, session: Session_handler):
+    # refresh_interfaces() reads the whole running config once instead of one section per port above this
+    FULL_CONFIG_REFRESH_PORTS = 8
+
+    def __init__(self, session: Session_handler, snapshot_cache: Snapshot_cache = None):
         """
         Takes an active Session_handler object and prepares for initialization tasks.
+        An optional Snapshot_cache lets unchanged configs skip parsing.
         """
         self.initialization_log = []
         self.session = session
+        self.snapshot_cache = snapshot_cache
         self.running_config = []
         self.startup_config = []
         self.model_name = "Unknown"
         self.interfaces_status = {}
         self.physical_interfaces_settings_objects = {}
         self.interfaces_current_status_objects = {}
+        self.config_model = None
+        self.handshake_count = 0
 
     def initialize(self):
-        self._get_data()
-        self._initialize_physical_interfaces_and_current_status()
-        self.session._quetly_reset_connection()
+        handshakes_before = self.session.handshake_count
+        metrics = getattr(self.session, "metrics", None)
+        with phase_scope(metrics, self.session.ip, "get_data"):
+            self._get_data()
+        with phase_scope(metrics, self.session.ip, "interfaces"):
+            self._initialize_physical_interfaces_and_current_status()
+        self.session.ensure_connection()
+        self.handshake_count = self.session.handshake_count - handshakes_before
+        self.initialization_log.append(f"SSH handshakes during initialization: {self.handshake_count}.")
 
     def _get_data(self):
         """
@@ -31,8 +51,15 @@ class Initializer:
         """
         try:
             self.running_config, self.startup_config = self.session.get_both_configs()
-            self.model_name = self.session.get_model_name()
-            self.interfaces_status = self.session.get_interfaces_status()
+            self.session.ensure_connection()
+            system, status = self.session.send_commands_batch(["show system", "show interfaces status"])
+            for result in (system, status):
+                if not result.ok:
+                    self.initialization_log.append(f"'{result.command}' failed: {result.error}")
+            if system.ok:
+                self.model_name = self.session.parse_model_name(system.output)
+            if status.ok:
+                self.interfaces_status = self.session.parse_interfaces_status(status.output)
             self.initialization_log.append("Data collected successfully.")
         except RuntimeError as e:
             self.initialization_log.append(f"SSH session not active during data collection: {e}")
@@ -50,108 +77,204 @@ class Initializer:
                 self.initialization_log.append("Missing interfaces_status or running_config.")
                 return
 
-            self.physical_interfaces = {}
-            self.interfaces_current_status_objects = {}
-
-            # Group config blocks
-            current_iface = None
-            iface_blocks = {}
-
-            for line in self.running_config:
-                if line.startswith("interface GigabitEthernet"):
-                    current_iface = "gi" + line.split("GigabitEthernet")[1].strip()
-                    iface_blocks[current_iface] = []
-                elif current_iface:
-                    iface_blocks[current_iface].append(line.strip())
+            iface_names = [name for name in self.interfaces_status if name != "headers" and name.startswith("gi")]
+            snapshot = self._load_snapshot(iface_names)
+            if snapshot is not None:
+                self.config_model, self.physical_interfaces_settings_objects = snapshot
+            else:
+                self.config_model = Running_config_parser().parse(self.running_config)
+                self.physical_interfaces_settings_objects = {}
 
-            # Parse each interface
-            for iface_name, status_values in self.interfaces_status.items():
-                if iface_name == "headers" or not iface_name.startswith("gi"):
+            self.interfaces_current_status_objects = {}
+            for iface_name in iface_names:
+                status_values = self.interfaces_status[iface_name]
+                self.interfaces_current_status_objects[iface_name] = Physical_interface_current_status(name=iface_name, values=status_values)
+                if snapshot is not None:
                     continue
 
-                # Initialize both objects
                 settings_obj = Physical_interface_settings(name=iface_name, values=status_values)
-                status_obj = Physical_interface_current_status(name=iface_name, values=status_values)
-
-                if iface_name in iface_blocks:
-                    config_lines = iface_blocks[iface_name]
-
-                    for line in config_lines:
-                        if line.startswith("description"):
-                            settings_obj.description = line.replace("description", "").strip()
-                        elif line == "no negotiation":
-                            settings_obj.negotiation = "Disabled"
-                            settings_obj.ethernet_negotiation = False
-                        elif line.startswith("speed"):
-                            settings_obj.speed = line.split()[-1]
-                        elif line.startswith("duplex"):
-                            settings_obj.duplex = line.split()[-1].capitalize()
-                        elif line.startswith("mdix"):
-                            settings_obj.mdix_mode = line.split()[-1].capitalize()
-                        elif line.startswith("flowcontrol"):
-                            settings_obj.flow_ctrl = "On" if "on" in line else "Off"
-                        elif line.startswith("back-pressure"):
-                            settings_obj.back_pressure = "Enabled"
-                        elif line == "shutdown":
-                            settings_obj.link_admin_state = "shutdown"
-
-                        # Layer 2/3 settings (same as before)
-                        elif line.startswith("ip address dhcp"):
-                            settings_obj.physical_interface_ips = {"DHCP": True}
-                        elif line.startswith("ip address"):
-                            if settings_obj.physical_interface_ips.get("DHCP") != True:
-                                parts = line.split()
-                                if len(parts) == 4:
-                                    ip = parts[2]
-                                    mask = parts[3]
-                                    settings_obj.physical_interface_ips[ip] = mask
-                        elif line == "no switchport":
-                            settings_obj.active_mode = "no switchport"
-                        elif "switchport mode trunk" in line:
-                            settings_obj.active_mode = "trunk"
-                        elif "switchport mode general" in line:
-                            settings_obj.active_mode = "general"
-                        elif "switchport mode customer" in line:
-                            settings_obj.active_mode = "customer"
-                        elif line.startswith("switchport access vlan"):
-                            vlan = line.split()[-1]
-                            if vlan.isdigit():
-                                settings_obj.access_vlan = int(vlan)
-                        elif line.startswith("switchport trunk allowed vlan"):
-                            vlans = line.split()[-1].split(",")
-                            settings_obj.allowed_vlans = [int(v) for v in vlans if v.isdigit()]
-                        elif line.startswith("switchport trunk native vlan"):
-                            vlan = line.split()[-1]
-                            if vlan.isdigit():
-                                settings_obj.native_vlan = int(vlan)
-                        elif line.startswith("switchport general allowed vlan add"):
-                            parts = line.split()
-                            vlan = parts[5]
-                            tag_type = parts[6]
-                            if vlan.isdigit():
-                                if tag_type == "tagged":
-                                    settings_obj.general_allowed_tagged.append(int(vlan))
-                                elif tag_type == "untagged":
-                                    settings_obj.general_allowed_untagged.append(int(vlan))
-                        elif line.startswith("switchport general forbidden vlan add"):
-                            vlan = line.split()[-1]
-                            if vlan.isdigit():
-                                settings_obj.general_forbiden.append(int(vlan))
-                        elif line.startswith("switchport general pvid"):
-                            vlan = line.split()[-1]
-                            if vlan.isdigit():
-                                settings_obj.pvid_vlan = int(vlan)
-                        elif line.startswith("switchport customer vlan"):
-                            vlan = line.split()[-1]
-                            if vlan.isdigit():
-                                settings_obj.customer_vlan = int(vlan)
-
+                section = self.config_model.get("interface", iface_name)
+                if section is not None:
+                    apply_interface_config(settings_obj, section.lines)
                 self.physical_interfaces_settings_objects[iface_name] = settings_obj
-                self.interfaces_current_status_objects[iface_name] = status_obj
 
-            self.initialization_log.append(f"Initialized {len(self.physical_interfaces)} physical interface settings.")
+            if snapshot is None:
+                self._store_snapshot()
+
+            self.initialization_log.append(f"Initialized {len(self.physical_interfaces_settings_objects)} physical interface settings.")
             self.initialization_log.append(f"Initialized {len(self.interfaces_current_status_objects)} current interface status objects.")
 
         except Exception as e:
             self.initialization_log.append(f"Error in _initialize_physical_interfaces_and_current_status: {e}")
 
+    def _load_snapshot(self, iface_names: list):
+        """
+        Returns (config_model, physical_interfaces_settings_objects) from the snapshot cache
+        when the running config is unchanged, otherwise None. Hits and misses are logged.
+        """
+        if self.snapshot_cache is None:
+            return None
+        self._snapshot_digest = Snapshot_cache.config_hash(self.running_config)
+        try:
+            snapshot = self.snapshot_cache.load(self.session.ip, self._snapshot_digest)
+        except Exception as e:
+            self.initialization_log.append(f"Snapshot cache read failed: {e}")
+            snapshot = None
+
+        if snapshot is not None and list(snapshot[1]) == iface_names:
+            self.initialization_log.append(f"Snapshot cache hit ({self._snapshot_digest[:12]}).")
+            return snapshot
+        self.initialization_log.append(f"Snapshot cache miss ({self._snapshot_digest[:12]}).")
+        return None
+
+    def _store_snapshot(self):
+        if self.snapshot_cache is None:
+            return
+        try:
+            self.snapshot_cache.store(self.session.ip, self._snapshot_digest,
+                                      (self.config_model, self.physical_interfaces_settings_objects))
+        except Exception as e:
+            self.initialization_log.append(f"Snapshot cache write failed: {e}")
+
+    def refresh_interface(self, iface_name: str) -> bool:
+        """
+        Re-reads a single port after an edit instead of re-running initialize(), see refresh_interfaces().
+
+        Returns:
+            bool: True if both objects were refreshed; failures are logged to initialization_log
+        """
+        return self.refresh_interfaces([iface_name])
+
+    def refresh_interfaces(self, iface_names: list[str]) -> bool:
+        """
+        Re-reads the given ports after an edit instead of re-running initialize():
+        one 'show running-config interface <name>' per port (or a single 'show running-config'
+        for more than FULL_CONFIG_REFRESH_PORTS ports) plus one 'show interfaces status' (for a
+        single port just its row) go out as one batch (one round trip), then each port's
+        Physical_interface_settings and Physical_interface_current_status objects are updated
+        in place. The ports' sections in running_config / config_model are replaced as well.
+        The batch is sent a second time only if the session was lost on the way; a '%' error
+        of the switch would just repeat, so it is logged for its port instead.
+
+        Returns:
+            bool: True if every port was refreshed; failures are logged to initialization_log
+        """
+        if not iface_names:
+            return True
+        status_command = "show interfaces status"
+        if len(iface_names) == 1:
+            status_command += f" {iface_names[0]}"
+        full_config = len(iface_names) > self.FULL_CONFIG_REFRESH_PORTS
+        if full_config:
+            config_commands = ["show running-config"]
+        else:
+            config_commands = [f"show running-config interface {name}" for name in iface_names]
+        commands = config_commands + [status_command]
+        try:
+            if not self.session.connection_is_active:
+                self.session.connect()
+            results = self.session.send_commands_batch(commands)
+            if any(result.session_lost for result in results) and self.session.ensure_connection():
+                results = self.session.send_commands_batch(commands)  # stale session: one retry
+        except RuntimeError as e:
+            self.initialization_log.append(f"SSH session not active while refreshing {', '.join(iface_names)}: {e}")
+            return False
+        status_result = results[-1]
+        if not status_result.ok:
+            self.initialization_log.append(f"'{status_result.command}' failed: {status_result.error}")
+            return False
+        status_rows = self.session.parse_interfaces_status(status_result.output)
+        parser = Running_config_parser()
+        parsed_result, config_model = None, None
+
+        refreshed = True
+        for position, iface_name in enumerate(iface_names):
+            config_result = results[0 if full_config else position]
+            if not config_result.ok:
+                self.initialization_log.append(f"'{config_result.command}' failed: {config_result.error}")
+                refreshed = False
+                continue
+            status_values = status_rows.get(iface_name)
+            if status_values is None:
+                self.initialization_log.append(f"No status row for {iface_name}.")
+                refreshed = False
+                continue
+            if config_result is not parsed_result:  # the full config is parsed once for all ports
+                config_model = parser.parse(clean_config_text(config_result.output))
+                parsed_result = config_result
+            self._apply_interface_refresh(iface_name, config_model.get("interface", iface_name), status_values)
+        return refreshed
+
+    def _apply_interface_refresh(self, iface_name: str, section, status_values: list):
+        """
+        Updates one port's objects and config section from its freshly read section and status row.
+        """
+        section_lines = section.lines if section is not None else []
+
+        status_obj = self.interfaces_current_status_objects.get(iface_name)
+        if status_obj is None:
+            self.interfaces_current_status_objects[iface_name] = Physical_interface_current_status(name=iface_name, values=status_values)
+        else:
+            status_obj.update(status_values)
+
+        fresh_settings = Physical_interface_settings(name=iface_name, values=status_values)
+        apply_interface_config(fresh_settings, section_lines)
+        settings_obj = self.physical_interfaces_settings_objects.get(iface_name)
+        if settings_obj is None:
+            self.physical_interfaces_settings_objects[iface_name] = fresh_settings
+        else:
+            settings_obj.update_from(fresh_settings)
+
+        self._replace_config_section("interface", iface_name, section)
+        self.initialization_log.append(f"Refreshed {iface_name}.")
+
+    def _replace_config_section(self, kind: str, name: str, section):
+        """
+        Swaps one section of config_model and running_config for its freshly read version.
+        section None means the switch no longer shows it (e.g. a port reset to defaults), so
+        it is removed; a section that was not there before is added after the last section
+        of its kind.
+        """
+        if self.config_model is None:
+            return
+        old_section = self.config_model.get(kind, name)
+        if old_section is None:
+            if section is not None:
+                self._insert_config_section(kind, name, section)
+            return
+        try:
+            start = self.running_config.index(old_section.header)
+        except ValueError:
+            start = None
+        end = None if start is None else start + 1 + len(old_section.lines)
+        if start is not None and self.running_config[start + 1:end] != old_section.lines:
+            start = None    # running_config no longer matches the model; only the model is updated
+        if section is None:
+            self.config_model.remove_section(kind, name)
+            if start is not None:
+                del self.running_config[start:end]
+            return
+        if start is not None:
+            self.running_config[start + 1:end] = section.lines
+        old_section.lines = section.lines
+
+    def _insert_config_section(self, kind: str, name: str, section):
+        """
+        Adds a section to config_model and puts it into running_config where the switch shows
+        it: before the first section of its kind with a higher number ('gi3' before 'gi4'),
+        otherwise after the last one, otherwise at the end.
+        """
+        def natural(text: str) -> list:
+            return [(0, int(part), "") if part.isdigit() else (1, 0, part) for part in re.split(r"(\d+)", text)]
+
+        position = len(self.running_config)
+        for sibling in self.config_model.by_kind.get(kind, {}).values():
+            if sibling.header not in self.running_config:
+                continue
+            start = self.running_config.index(sibling.header)
+            if natural(sibling.name) > natural(name):
+                position = start
+                break
+            position = start + 1 + len(sibling.lines)
+        self.running_config[position:position] = [section.header] + section.lines
+        self.config_model.add_section(kind, name, section.header).lines = section.lines
@@ -0,0 +1,220 @@
+from core.config_parser import Command_table
+from domain.physical_interface import Physical_interface_settings
+from domain.vlan_set import Vlan_set
+
+
+def _description(settings_obj: Physical_interface_settings, line: str):
+    settings_obj.description = line.replace("description", "").strip()
+
+
+def _no_description(settings_obj: Physical_interface_settings, line: str):
+    settings_obj.description = ""
+
+
+def _negotiation(settings_obj: Physical_interface_settings, line: str):
+    if line == "negotiation":
+        settings_obj.negotiation = "Enabled"
+        settings_obj.ethernet_negotiation = True
+
+
+def _no_negotiation(settings_obj: Physical_interface_settings, line: str):
+    if line == "no negotiation":
+        settings_obj.negotiation = "Disabled"
+        settings_obj.ethernet_negotiation = False
+
+
+def _speed(settings_obj: Physical_interface_settings, line: str):
+    settings_obj.speed = line.split()[-1]
+
+
+def _duplex(settings_obj: Physical_interface_settings, line: str):
+    settings_obj.duplex = line.split()[-1].capitalize()
+
+
+def _mdix(settings_obj: Physical_interface_settings, line: str):
+    settings_obj.mdix_mode = line.split()[-1].capitalize()
+
+
+def _flowcontrol(settings_obj: Physical_interface_settings, line: str):
+    settings_obj.flow_ctrl = {"on": "On", "auto": "Auto"}.get(line.split()[-1], "Off")
+
+
+def _back_pressure(settings_obj: Physical_interface_settings, line: str):
+    settings_obj.back_pressure = "Enabled"
+
+
+def _no_back_pressure(settings_obj: Physical_interface_settings, line: str):
+    settings_obj.back_pressure = "Disabled"
+
+
+def _shutdown(settings_obj: Physical_interface_settings, line: str):
+    if line == "shutdown":
+        settings_obj.link_admin_state = "shutdown"
+
+
+def _no_shutdown(settings_obj: Physical_interface_settings, line: str):
+    if line == "no shutdown":
+        settings_obj.link_admin_state = "no shutdown"
+
+
+def _ip_address_dhcp(settings_obj: Physical_interface_settings, line: str):
+    settings_obj.physical_interface_ips = {"DHCP": True}
+
+
+def _ip_address(settings_obj: Physical_interface_settings, line: str):
+    if settings_obj.physical_interface_ips.get("DHCP") != True:
+        parts = line.split()
+        if len(parts) == 4:
+            settings_obj.physical_interface_ips[parts[2]] = parts[3]
+
+
+def _no_switchport(settings_obj: Physical_interface_settings, line: str):
+    if line == "no switchport":
+        settings_obj.active_mode = "no switchport"
+
+
+def _switchport_mode(mode: str):
+    def handler(settings_obj: Physical_interface_settings, line: str):
+        settings_obj.active_mode = mode
+    return handler
+
+
+def _clear_vlan_field(attribute: str):
+    """
+    Builds a handler for the 'no ...' form of a single-VLAN setting.
+    """
+    def handler(settings_obj: Physical_interface_settings, line: str):
+        setattr(settings_obj, attribute, 0)
+    return handler
+
+
+def _vlan_field(attribute: str):
+    """
+    Builds a handler storing the last word of the line as an int VLAN id in attribute.
+    """
+    def handler(settings_obj: Physical_interface_settings, line: str):
+        vlan = line.split()[-1]
+        if vlan.isdigit():
+            setattr(settings_obj, attribute, int(vlan))
+    return handler
+
+
+def _parse_vlans(text: str):
+    """
+    Parses a CBS250 VLAN list such as '2-10,20'; returns None if it is malformed.
+    """
+    try:
+        return Vlan_set.parse(text)
+    except ValueError:
+        return None
+
+
+def _trunk_allowed_vlans(settings_obj: Physical_interface_settings, line: str):
+    # switchport trunk allowed vlan {add|remove|except} <list> | all | none
+    parts = line.split()
+    if len(parts) < 5:
+        return
+    action = parts[4]
+    if action in ("all", "none"):
+        settings_obj.allowed_vlans = Vlan_set.parse(action)
+        return
+    vlans = _parse_vlans(parts[-1])
+    if vlans is None:
+        return
+    if action == "add":
+        settings_obj.allowed_vlans.update(vlans)
+    elif action == "remove":
+        settings_obj.allowed_vlans.difference_update(vlans)
+    elif action == "except":
+        settings_obj.allowed_vlans = Vlan_set.all() - vlans
+    else:
+        settings_obj.allowed_vlans = vlans
+
+
+def _general_allowed_vlan(settings_obj: Physical_interface_settings, line: str):
+    # switchport general allowed vlan add <list> [tagged|untagged]
+    parts = line.split()
+    if len(parts) < 6:
+        return
+    vlans = _parse_vlans(parts[5])
+    if vlans is None:
+        return
+    tag_type = parts[6] if len(parts) > 6 else "tagged"
+    # Re-adding a VLAN with the other tagging moves it, as on the switch
+    if tag_type == "tagged":
+        settings_obj.general_allowed_tagged.update(vlans)
+        settings_obj.general_allowed_untagged.difference_update(vlans)
+    elif tag_type == "untagged":
+        settings_obj.general_allowed_untagged.update(vlans)
+        settings_obj.general_allowed_tagged.difference_update(vlans)
+
+
+def _general_allowed_vlan_remove(settings_obj: Physical_interface_settings, line: str):
+    # switchport general allowed vlan remove <list>: drops the VLANs whatever their tagging
+    vlans = _parse_vlans(line.split()[-1])
+    if vlans is not None:
+        settings_obj.general_allowed_tagged.difference_update(vlans)
+        settings_obj.general_allowed_untagged.difference_update(vlans)
+
+
+def _general_forbidden_vlan(settings_obj: Physical_interface_settings, line: str):
+    vlans = _parse_vlans(line.split()[-1])
+    if vlans is not None:
+        settings_obj.general_forbiden.update(vlans)
+
+
+def _general_forbidden_vlan_remove(settings_obj: Physical_interface_settings, line: str):
+    vlans = _parse_vlans(line.split()[-1])
+    if vlans is not None:
+        settings_obj.general_forbiden.difference_update(vlans)
+
+
+# Interface sub-command prefix -> handler. Longest prefix wins, so e.g.
+# 'ip address dhcp' and 'ip address' can be registered side by side.
+INTERFACE_HANDLERS = Command_table()
+for _prefix, _handler in (
+    ("description", _description),
+    ("no description", _no_description),
+    ("negotiation", _negotiation),
+    ("no negotiation", _no_negotiation),
+    ("speed", _speed),
+    ("duplex", _duplex),
+    ("mdix", _mdix),
+    ("flowcontrol", _flowcontrol),
+    ("back-pressure", _back_pressure),
+    ("no back-pressure", _no_back_pressure),
+    ("shutdown", _shutdown),
+    ("no shutdown", _no_shutdown),
+    ("ip address dhcp", _ip_address_dhcp),
+    ("ip address", _ip_address),
+    ("no switchport", _no_switchport),
+    ("switchport mode access", _switchport_mode("access")),
+    ("switchport mode trunk", _switchport_mode("trunk")),
+    ("switchport mode general", _switchport_mode("general")),
+    ("switchport mode customer", _switchport_mode("customer")),
+    ("switchport access vlan", _vlan_field("access_vlan")),
+    ("switchport trunk allowed vlan", _trunk_allowed_vlans),
+    ("switchport trunk native vlan", _vlan_field("native_vlan")),
+    ("no switchport trunk native vlan", _clear_vlan_field("native_vlan")),
+    ("switchport general allowed vlan add", _general_allowed_vlan),
+    ("switchport general allowed vlan remove", _general_allowed_vlan_remove),
+    ("switchport general forbidden vlan add", _general_forbidden_vlan),
+    ("switchport general forbidden vlan remove", _general_forbidden_vlan_remove),
+    ("switchport general pvid", _vlan_field("pvid_vlan")),
+    ("no switchport general pvid", _clear_vlan_field("pvid_vlan")),
+    ("switchport customer vlan", _vlan_field("customer_vlan")),
+    ("no switchport customer vlan", _clear_vlan_field("customer_vlan")),
+):
+    INTERFACE_HANDLERS.register(_prefix, _handler)
+
+
+def apply_interface_config(settings_obj: Physical_interface_settings, lines: list):
+    """
+    Applies the lines of one interface section to a Physical_interface_settings object.
+    Lines without a registered handler are ignored.
+    """
+    match = INTERFACE_HANDLERS.match
+    for line in lines:
+        handler = match(line)
+        if handler is not None:
+            handler(settings_obj, line)
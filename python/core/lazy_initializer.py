@@ -0,0 +1,282 @@
+import threading
+
+from core.config_parser import Running_config_parser
+from core.initializer import Initializer
+from core.interface_config import apply_interface_config
+from domain.physical_interface import Physical_interface_current_status, Physical_interface_settings
+from infrastructure.config_cleaner import clean_config_text
+from infrastructure.instrumentation import phase_scope
+from infrastructure.snapshot_cache import Snapshot_cache
+from infrastructure.ssh_client import Session_handler
+
+
+class Resource:
+    def __init__(self, command: str = None, depends: tuple = ()):
+        """
+        One piece of switch data a Lazy_initializer can provide.
+
+        Args:
+            command (str): CLI command fetching it, or None for data derived from other resources
+            depends (tuple): Resources that must be loaded first
+        """
+        self.command = command
+        self.depends = depends
+
+    def __repr__(self):
+        return f"<Resource command={self.command!r} depends={self.depends}>"
+
+
+# Fetch graph: interface settings need the running config, never the startup config.
+RESOURCES = {
+    "running_config": Resource("show running-config"),
+    "startup_config": Resource("show startup-config"),
+    "model_name": Resource("show system"),
+    "interfaces_status": Resource("show interfaces status"),
+    "config_model": Resource(depends=("running_config",)),
+    "interfaces_current_status_objects": Resource(depends=("interfaces_status",)),
+    "physical_interfaces_settings_objects": Resource(depends=("interfaces_status", "running_config")),
+}
+
+# What each screen shows, i.e. what has to be loaded before it can be drawn.
+VIEWS = {
+    "status_grid": ("interfaces_current_status_objects",),
+    "port_settings": ("physical_interfaces_settings_objects",),
+    "unsaved_changes": ("running_config", "startup_config"),
+    "summary": ("model_name", "interfaces_status"),
+}
+
+
+class _Resource_property:
+    def __init__(self, name: str):
+        """
+        Memoised attribute of a Lazy_initializer: the first read loads the resource (and
+        whatever it depends on); assigning a value marks it loaded, as initialize() and the
+        refresh methods of Initializer do.
+        """
+        self.name = name
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            return self
+        if self.name not in instance._loaded:
+            instance.load(self.name)
+        return instance._values.get(self.name)
+
+    def __set__(self, instance, value):
+        instance._values[self.name] = value
+        instance._loaded.add(self.name)
+
+
+class Lazy_initializer(Initializer):
+    running_config = _Resource_property("running_config")
+    startup_config = _Resource_property("startup_config")
+    model_name = _Resource_property("model_name")
+    interfaces_status = _Resource_property("interfaces_status")
+    config_model = _Resource_property("config_model")
+    interfaces_current_status_objects = _Resource_property("interfaces_current_status_objects")
+    physical_interfaces_settings_objects = _Resource_property("physical_interfaces_settings_objects")
+
+    def __init__(self, session: Session_handler, snapshot_cache: Snapshot_cache = None):
+        """
+        Initializer that fetches on demand instead of up front.
+
+        Every resource in RESOURCES is a memoised attribute: the first read fetches it together
+        with the resources it depends on, all missing commands in one batch (one round trip),
+        and later reads cost nothing. The port status grid therefore needs only
+        'show interfaces status'; the settings grid adds 'show running-config', and the startup
+        config is only read when something asks for it. load_view() draws the screen the user
+        is looking at first and prefetches the others in the background.
+
+        initialize() still loads everything, in a single batch.
+        """
+        self._values = {}
+        self._loaded = set()
+        self._lock = threading.RLock()
+        self._prefetch_thread = None
+        super().__init__(session, snapshot_cache)
+        self._loaded.clear()        # the defaults assigned by Initializer.__init__ are not data
+
+    def is_loaded(self, name: str) -> bool:
+        return name in self._loaded
+
+    def _missing(self, names) -> list:
+        """
+        Unloaded resources needed for names, dependencies before dependents.
+        """
+        order, seen = [], set()
+
+        def visit(name):
+            if name in seen or name in self._loaded:
+                return
+            seen.add(name)
+            for dependency in RESOURCES[name].depends:
+                visit(dependency)
+            order.append(name)
+
+        for name in names:
+            visit(name)
+        return order
+
+    def load(self, *names):
+        """
+        Loads the given resources and their dependencies now: one command batch for everything
+        that has to come from the switch, then the derived objects. Failures are logged to
+        initialization_log and leave the resource at its default until invalidate().
+        """
+        with self._lock:
+            missing = self._missing(names)
+            if not missing:
+                return
+            metrics = getattr(self.session, "metrics", None)
+            with phase_scope(metrics, self.session.ip, "load"):
+                fetched = [name for name in missing if RESOURCES[name].command is not None]
+                if fetched:
+                    self._fetch(fetched)
+                for name in missing:
+                    if RESOURCES[name].command is None and name not in self._loaded:
+                        try:
+                            getattr(self, f"_build_{name}")()
+                        except Exception as e:
+                            self.initialization_log.append(f"Building {name} failed: {e}")
+                            self._loaded.add(name)
+
+    def _fetch(self, names: list):
+        commands = [RESOURCES[name].command for name in names]
+        try:
+            if not self.session.connection_is_active:
+                self.session.connect()
+            results = self.session.send_commands_batch(commands)
+            if any(result.session_lost for result in results) and self.session.ensure_connection():
+                results = self.session.send_commands_batch(commands)  # stale session: one retry
+        except RuntimeError as e:
+            self.initialization_log.append(f"SSH session not active while loading {', '.join(names)}: {e}")
+            self._loaded.update(names)
+            return
+        for name, result in zip(names, results):
+            if result.ok:
+                getattr(self, f"_parse_{name}")(result.output)
+            else:
+                self.initialization_log.append(f"'{result.command}' failed: {result.error}")
+                self._loaded.add(name)
+        self.initialization_log.append(f"Loaded {', '.join(names)} ({len(commands)} commands in one batch).")
+
+    def invalidate(self, *names):
+        """
+        Forgets the given resources and everything derived from them; the next read fetches again.
+        """
+        with self._lock:
+            stale = set(names)
+            changed = True
+            while changed:
+                changed = False
+                for name, resource in RESOURCES.items():
+                    if name not in stale and stale.intersection(resource.depends):
+                        stale.add(name)
+                        changed = True
+            self._loaded.difference_update(stale)
+
+    def on_syslog_events(self, events: list):
+        """
+        Syslog_receiver listener: a config copy on this switch (e.g. 'write memory' or a copy
+        from TFTP) makes the cached running and startup configs stale, so both are invalidated
+        and fetched again on the next read.
+        """
+        if any(event.kind == "config_change" and event.ip == self.session.ip for event in events):
+            self.invalidate("running_config", "startup_config")
+
+    def _parse_running_config(self, output: str):
+        self.running_config = lines = clean_config_text(output)
+        self.session.archive_config("running", lines)
+
+    def _parse_startup_config(self, output: str):
+        self.startup_config = lines = clean_config_text(output)
+        self.session.archive_config("startup", lines)
+
+    def _parse_model_name(self, output: str):
+        self.model_name = self.session.parse_model_name(output)
+
+    def _parse_interfaces_status(self, output: str):
+        self.interfaces_status = self.session.parse_interfaces_status(output)
+
+    def _build_config_model(self):
+        self.config_model = Running_config_parser().parse(self.running_config)
+
+    def _interface_names(self) -> list:
+        return [name for name in self.interfaces_status if name != "headers" and name.startswith("gi")]
+
+    def _build_interfaces_current_status_objects(self):
+        self.interfaces_current_status_objects = {
+            iface_name: Physical_interface_current_status(name=iface_name, values=self.interfaces_status[iface_name])
+            for iface_name in self._interface_names()}
+        self.initialization_log.append(f"Initialized {len(self._values['interfaces_current_status_objects'])} current interface status objects.")
+
+    def _build_physical_interfaces_settings_objects(self):
+        iface_names = self._interface_names()
+        snapshot = self._load_snapshot(iface_names) if self.running_config else None
+        if snapshot is not None:
+            self.config_model, self.physical_interfaces_settings_objects = snapshot
+        else:
+            config_model = self.config_model
+            settings_objects = {}
+            for iface_name in iface_names:
+                settings_obj = Physical_interface_settings(name=iface_name, values=self.interfaces_status[iface_name])
+                section = config_model.get("interface", iface_name)
+                if section is not None:
+                    apply_interface_config(settings_obj, section.lines)
+                settings_objects[iface_name] = settings_obj
+            self.physical_interfaces_settings_objects = settings_objects
+            if self.running_config:
+                self._store_snapshot()
+        self.initialization_log.append(f"Initialized {len(self._values['physical_interfaces_settings_objects'])} physical interface settings.")
+
+    def _replace_config_section(self, kind: str, name: str, section):
+        """
+        Splices a refreshed section only into a config that was actually loaded; a loaded
+        running config without its model is dropped instead, so it is re-read when needed.
+        """
+        if "config_model" in self._loaded:
+            super()._replace_config_section(kind, name, section)
+        elif "running_config" in self._loaded:
+            self.invalidate("running_config")
+
+    def initialize(self):
+        """
+        Eager mode: every resource, with all four commands in one batch.
+        """
+        handshakes_before = self.session.handshake_count
+        self.load(*RESOURCES)
+        self.handshake_count = self.session.handshake_count - handshakes_before
+        self.initialization_log.append(f"SSH handshakes during initialization: {self.handshake_count}.")
+
+    def load_view(self, view: str, prefetch: tuple = ()) -> dict:
+        """
+        Loads what the given view (see VIEWS) shows and returns it, then starts loading the
+        prefetch views in a background thread, in the given order. Session_handler.lock is held
+        for every exchange on the channel, so the prefetch never interleaves with on-demand
+        reads, refresh_interfaces() or a Config_push_engine using the same session.
+
+        Returns:
+            dict: Resource name -> value for the view
+        """
+        names = VIEWS[view]
+        self.load(*names)
+        later = [name for other in prefetch for name in VIEWS[other] if name not in self._loaded]
+        if later:
+            self._prefetch_thread = threading.Thread(target=self._prefetch, args=(later,),
+                                                     name=f"prefetch-{self.session.ip}", daemon=True)
+            self._prefetch_thread.start()
+        return {name: self._values.get(name) for name in names}
+
+    def _prefetch(self, names: list):
+        for name in names:
+            try:
+                self.load(name)
+            except Exception as e:
+                self.initialization_log.append(f"Prefetching {name} failed: {e}")
+
+    def wait_for_prefetch(self, timeout: float = None):
+        if self._prefetch_thread is not None:
+            self._prefetch_thread.join(timeout)
+
+    def __repr__(self):
+        return f"<Lazy_initializer {self.session.ip} loaded={sorted(self._loaded)}>"
@@ -0,0 +1,297 @@
+import heapq
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from domain.physical_interface import Physical_interface_current_status
+from infrastructure.session_pool import Session_pool
+from infrastructure.ssh_client import Session_handler
+
+
+class Status_change:
+    def __init__(self, ip: str, interface: str, kind: str, changes: dict = None):
+        """
+        One change event emitted by the Status_poller.
+
+        Args:
+            ip (str): Device the interface belongs to
+            interface (str): Interface name, e.g. 'gi5'
+            kind (str): 'changed', 'added' or 'removed'
+            changes (dict): field -> (old, new), e.g. {'link_state': ('Up', 'Down')}
+        """
+        self.ip = ip
+        self.interface = interface
+        self.kind = kind
+        self.changes = changes or {}
+        self.timestamp = time.time()
+
+    def __repr__(self):
+        return f"<Status_change {self.ip} {self.interface} {self.kind} {self.changes}>"
+
+
+class Device_poll_state:
+    def __init__(self, ip: str, username: str, password: str, interval: float):
+        """
+        Per-device polling state: last raw output, the live status objects and the adaptive interval.
+        """
+        self.ip = ip
+        self.username = username
+        self.password = password
+        self.interval = interval
+        self.next_poll = 0.0
+        self.last_raw = None
+        self.status_objects = {}
+        self.polls = 0
+        self.unchanged_polls = 0
+        self.changes = 0
+        self.failures = 0
+        self.last_error = None
+        self.in_flight = False
+        self.repoll = False         # poll_now() arrived while a poll was in flight
+        self.ports = None           # interface names the status objects are kept for; None = all rows
+
+    def __repr__(self):
+        return (f"<Device_poll_state {self.ip} interval={self.interval:.1f}s polls={self.polls} "
+                f"changes={self.changes} failures={self.failures}>")
+
+
+class Status_poller:
+    def __init__(self, session_pool: Session_pool = None, min_interval: float = 2.0, max_interval: float = 60.0,
+                 initial_interval: float = 10.0, speedup: float = 0.5, slowdown: float = 1.5,
+                 max_parallel_polls: int = 16, jitter: float = 0.1):
+        """
+        Polls 'show interfaces status' on many switches and keeps one
+        Physical_interface_current_status object per port up to date.
+
+        Each poll is diffed against the previous one: an identical output costs a string
+        comparison only, otherwise only the rows that changed are applied to their objects
+        and reported as Status_change events to the listeners.
+
+        Intervals adapt per device: a poll that found changes multiplies the interval by
+        speedup (flapping ports are watched closely), an unchanged poll by slowdown, within
+        [min_interval, max_interval]. At most max_parallel_polls run at the same time, so a
+        large fleet is spread out instead of hitting every switch CPU at once.
+
+        Args:
+            session_pool (Session_pool): Warm sessions used for the polls; if omitted, a private one is
+                created, started by start() and closed by stop()
+            min_interval (float): Fastest poll interval in seconds
+            max_interval (float): Slowest poll interval in seconds
+            initial_interval (float): Interval of a newly tracked device
+            speedup (float): Interval factor after a poll with changes (< 1)
+            slowdown (float): Interval factor after an unchanged poll (> 1)
+            max_parallel_polls (int): Upper bound of polls in flight
+            jitter (float): Random +/- fraction applied to every interval, so devices do not poll in lockstep
+        """
+        self._owns_pool = session_pool is None
+        self.session_pool = session_pool or Session_pool()
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.initial_interval = initial_interval
+        self.speedup = speedup
+        self.slowdown = slowdown
+        self.max_parallel_polls = max_parallel_polls
+        self.jitter = jitter
+
+        self.devices = {}           # ip -> Device_poll_state
+        self.listeners = []
+        self._schedule = []         # heap of (next_poll, ip)
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._scheduler_thread = None
+        self._executor = None
+
+    def add_listener(self, callback):
+        """
+        Registers callback(list[Status_change]); it is called from poller threads once per poll with changes.
+        """
+        self.listeners.append(callback)
+
+    def track(self, ip: str, username: str, password: str, status_objects: dict = None):
+        """
+        Starts polling a device. status_objects (e.g. Initializer.interfaces_current_status_objects)
+        are updated in place instead of being rebuilt, so holders of those objects see live values.
+        Only the ports already in status_objects are tracked then: the Initializer keeps gi ports
+        only, so Port-channel rows are neither written into its dict nor reported as 'added'.
+        """
+        with self._condition:
+            state = Device_poll_state(ip, username, password, self.initial_interval)
+            if status_objects:
+                state.status_objects = status_objects
+                state.ports = frozenset(status_objects)
+            self.devices[ip] = state
+            heapq.heappush(self._schedule, (state.next_poll, ip))
+            self._condition.notify()
+        return state
+
+    def untrack(self, ip: str):
+        with self._condition:
+            self.devices.pop(ip, None)
+
+    def poll_now(self, ip: str):
+        """
+        Moves a tracked device to the front of the schedule. While its poll is in flight the
+        request is remembered and the device is polled again as soon as that poll finishes,
+        since the running poll may have read the status before the event.
+        Safe to call from any thread, e.g. a syslog listener.
+        """
+        with self._condition:
+            state = self.devices.get(ip)
+            if state is None:
+                return
+            if state.in_flight:
+                state.repoll = True
+                return
+            state.next_poll = time.monotonic()
+            heapq.heappush(self._schedule, (state.next_poll, ip))
+            self._condition.notify()
+
+    def on_syslog_events(self, events: list):
+        """
+        Syslog_receiver listener: a link up/down message triggers an immediate poll of just
+        that device, whose delta then updates only the affected status objects.
+        """
+        for ip in {event.ip for event in events if event.kind in ("link_up", "link_down")}:
+            self.poll_now(ip)
+
+    def start(self):
+        if self._scheduler_thread is None:
+            if self._owns_pool:
+                self.session_pool.start()
+            self._stop.clear()
+            self._executor = ThreadPoolExecutor(max_workers=self.max_parallel_polls)
+            self._scheduler_thread = threading.Thread(target=self._scheduler_loop, name="status-poller", daemon=True)
+            self._scheduler_thread.start()
+
+    def stop(self):
+        self._stop.set()
+        with self._condition:
+            self._condition.notify_all()
+        if self._scheduler_thread is not None:
+            self._scheduler_thread.join()
+            self._scheduler_thread = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._owns_pool:
+            self.session_pool.close()
+
+    def _scheduler_loop(self):
+        """
+        Hands due devices to the worker pool. A device is re-queued only after its poll finished,
+        so a slow switch never has two polls in flight.
+        """
+        while not self._stop.is_set():
+            with self._condition:
+                due = None
+                while self._schedule and not self._stop.is_set():
+                    next_poll, ip = self._schedule[0]
+                    state = self.devices.get(ip)
+                    if state is None or state.next_poll != next_poll or state.in_flight:
+                        heapq.heappop(self._schedule)  # untracked or stale entry
+                        continue
+                    wait = next_poll - time.monotonic()
+                    if wait > 0:
+                        self._condition.wait(wait)
+                        continue
+                    heapq.heappop(self._schedule)
+                    state.in_flight = True
+                    due = state
+                    break
+                if due is None:
+                    if not self._schedule:
+                        self._condition.wait(1.0)
+                    continue
+            self._executor.submit(self._poll_and_reschedule, due)
+
+    def _poll_and_reschedule(self, state: Device_poll_state):
+        try:
+            self.poll_once(state.ip)
+        finally:
+            with self._condition:
+                state.in_flight = False
+                if state.repoll:
+                    state.repoll = False
+                    state.next_poll = time.monotonic()
+                if self.devices.get(state.ip) is state:
+                    heapq.heappush(self._schedule, (state.next_poll, state.ip))
+                    self._condition.notify()
+
+    def poll_once(self, ip: str) -> list[Status_change]:
+        """
+        Polls one device right away, applies the delta and adapts its interval.
+
+        Returns:
+            list[Status_change]: Events of this poll (also sent to the listeners)
+        """
+        state = self.devices[ip]
+        state.polls += 1
+        try:
+            with self.session_pool.lease(state.ip, state.username, state.password) as session:
+                result = session.send_commands_batch(["show interfaces status"])[0]
+            if not result.ok:
+                raise RuntimeError(result.error)
+        except Exception as e:
+            state.failures += 1
+            state.last_error = str(e)
+            self._reschedule(state, self.max_interval)
+            return []
+
+        state.last_error = None
+        baseline = state.last_raw is None
+        events = self.apply_status_output(state, result.output)
+        if baseline:
+            # First poll only establishes the reference, it says nothing about flapping
+            self._reschedule(state, state.interval)
+            if events:
+                for listener in self.listeners:
+                    listener(events)
+        elif events:
+            state.changes += len(events)
+            state.unchanged_polls = 0
+            self._reschedule(state, state.interval * self.speedup)
+            for listener in self.listeners:
+                listener(events)
+        else:
+            state.unchanged_polls += 1
+            self._reschedule(state, state.interval * self.slowdown)
+        return events
+
+    @staticmethod
+    def apply_status_output(state: Device_poll_state, raw: str) -> list[Status_change]:
+        """
+        Diffs a 'show interfaces status' output against the previous one of the device.
+        Identical output is detected without parsing; otherwise only changed rows touch their objects.
+        """
+        if raw == state.last_raw:
+            return []
+        state.last_raw = raw
+
+        rows = Session_handler.parse_interfaces_status(raw)
+        rows.pop("headers", None)
+        if state.ports is not None:
+            rows = {name: values for name, values in rows.items() if name in state.ports}
+        events = []
+        status_objects = state.status_objects
+        for name, values in rows.items():
+            status_obj = status_objects.get(name)
+            if status_obj is None:
+                status_objects[name] = Physical_interface_current_status(name=name, values=values)
+                events.append(Status_change(state.ip, name, "added"))
+                continue
+            changes = status_obj.update(values)
+            if changes:
+                events.append(Status_change(state.ip, name, "changed", changes))
+        for name in [name for name in status_objects if name not in rows]:
+            del status_objects[name]
+            events.append(Status_change(state.ip, name, "removed"))
+        return events
+
+    def _reschedule(self, state: Device_poll_state, interval: float):
+        state.interval = min(self.max_interval, max(self.min_interval, interval))
+        spread = state.interval * self.jitter
+        state.next_poll = time.monotonic() + state.interval + random.uniform(-spread, spread)
+
+    def __repr__(self):
+        return f"<Status_poller devices={len(self.devices)} running={self._scheduler_thread is not None}>"
@@ -0,0 +1,228 @@
+import numpy as np
+
+
+STATUS_COLUMNS = ("type", "duplex", "speed", "negotiation", "flow_ctrl", "link_state", "back_pressure", "mdix_mode")
+
+
+class Dictionary_column:
+    def __init__(self):
+        """
+        Dictionary-encoded column: every distinct value (e.g. 'Full', 'Half', '--', None) gets a
+        small integer code once, and the rows only store codes in a NumPy array.
+        """
+        self.values = []        # code -> value
+        self.codes = {}         # value -> code
+
+    def encode(self, value) -> int:
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def encode_all(self, values) -> list:
+        codes = self.codes
+        try:
+            return [codes[value] for value in values]
+        except KeyError:        # a value seen for the first time
+            return [self.encode(value) for value in values]
+
+    def lookup(self, values) -> list:
+        """
+        Codes of the given value(s) that occur in the column; unknown values are skipped.
+        """
+        if not isinstance(values, (list, tuple, set, frozenset)):
+            values = (values,)
+        return [self.codes[value] for value in values if value in self.codes]
+
+    def __len__(self):
+        return len(self.values)
+
+    def __repr__(self):
+        return f"<Dictionary_column values={self.values}>"
+
+
+class Fleet_status_table:
+    def __init__(self, capacity: int = 4096):
+        """
+        Column store of 'show interfaces status' rows for a whole fleet.
+
+        Each row is one port of one switch. The device and port are stored as int32 indexes
+        (into self.devices / the port dictionary), every status field as a uint16 code of its
+        Dictionary_column, so a fleet of 500 switches x 52 ports is a handful of flat arrays
+        instead of 26,000 Python objects. Queries compare codes over whole arrays (mask(),
+        count_by()) instead of walking objects.
+
+        A device's rows are contiguous; set_device() on a known device overwrites them in place.
+
+        Args:
+            capacity (int): Initial number of rows; the arrays double when full
+        """
+        self.devices = []                   # device index -> ip
+        self._device_index = {}             # ip -> device index
+        self._device_rows = {}              # ip -> (start, stop)
+        self.ports = Dictionary_column()
+        self.dictionaries = {column: Dictionary_column() for column in STATUS_COLUMNS}
+        self.length = 0
+        self._device = np.empty(capacity, dtype=np.int32)
+        self._port = np.empty(capacity, dtype=np.int32)
+        self._codes = {column: np.empty(capacity, dtype=np.uint16) for column in STATUS_COLUMNS}
+
+    @classmethod
+    def from_initializers(cls, initializers: dict) -> "Fleet_status_table":
+        """
+        Table of ip -> Initializer results (their parsed interfaces_status).
+        """
+        table = cls(capacity=max(1, 64 * len(initializers)))
+        for ip, initializer in initializers.items():
+            table.set_device(ip, initializer.interfaces_status)
+        return table
+
+    def set_device(self, ip: str, status_rows: dict):
+        """
+        Stores one switch's rows, replacing the rows it had before.
+
+        Args:
+            status_rows (dict): Port name -> field list, as returned by Session_handler.parse_interfaces_status()
+                (the 'headers' entry is ignored)
+        """
+        names = [name for name in status_rows if name != "headers"]
+        width = len(STATUS_COLUMNS)
+        padding = (None,) * width
+        # Transpose the rows into columns; short rows (port-channels) are padded with None
+        columns = zip(*[(tuple(status_rows[name]) + padding)[:width] for name in names]) if names else [()] * width
+        encoded = {column: dictionary.encode_all(values)
+                   for (column, dictionary), values in zip(self.dictionaries.items(), columns)}
+        ports = self.ports.encode_all(names)
+
+        known = self._device_rows.get(ip)
+        if known is not None and known[1] - known[0] == len(names):
+            start, stop = known
+            self._port[start:stop] = ports
+        else:
+            if known is not None:
+                self._remove_rows(*known)
+                device = self._device_index[ip]
+            else:
+                device = self._device_index[ip] = len(self.devices)
+                self.devices.append(ip)
+            self._reserve(len(names))
+            start, stop = self.length, self.length + len(names)
+            self._device[start:stop] = device
+            self._port[start:stop] = ports
+            self._device_rows[ip] = (start, stop)
+            self.length = stop
+        for column, codes in encoded.items():
+            self._codes[column][start:stop] = codes
+
+    def _reserve(self, rows: int):
+        needed = self.length + rows
+        capacity = len(self._device)
+        if needed <= capacity:
+            return
+        while capacity < needed:
+            capacity *= 2
+        self._device = np.resize(self._device, capacity)
+        self._port = np.resize(self._port, capacity)
+        self._codes = {column: np.resize(codes, capacity) for column, codes in self._codes.items()}
+
+    def _remove_rows(self, start: int, stop: int):
+        """
+        Closes the gap of a device whose port count changed; later devices move down.
+        """
+        count = stop - start
+        for array in (self._device, self._port, *self._codes.values()):
+            array[start:self.length - count] = array[stop:self.length]
+        self.length -= count
+        self._device_rows = {ip: (first - count, last - count) if first >= stop else (first, last)
+                             for ip, (first, last) in self._device_rows.items()}
+
+    def column(self, name: str) -> np.ndarray:
+        """
+        Codes (status columns) or indexes ('device', 'port') of all rows, as a read-only view.
+        """
+        if name == "device":
+            array = self._device
+        elif name == "port":
+            array = self._port
+        else:
+            array = self._codes[name]
+        view = array[:self.length]
+        view.flags.writeable = False
+        return view
+
+    def _dictionary(self, name: str) -> list:
+        if name == "device":
+            return self.devices
+        if name == "port":
+            return self.ports.values
+        return self.dictionaries[name].values
+
+    def mask(self, **conditions) -> np.ndarray:
+        """
+        Boolean row mask for equality conditions, vectorised over all rows, e.g.
+        mask(speed="100", duplex="Half") or mask(link_state=("Down", "Not Present")).
+        A value may be one value or a tuple / list / set of alternatives.
+        """
+        result = np.ones(self.length, dtype=bool)
+        for name, values in conditions.items():
+            if name == "device":
+                values = values if isinstance(values, (list, tuple, set, frozenset)) else (values,)
+                codes = [self._device_index[ip] for ip in values if ip in self._device_index]
+            elif name == "port":
+                codes = self.ports.lookup(values)
+            else:
+                codes = self.dictionaries[name].lookup(values)
+            column = self.column(name)
+            if len(codes) == 1:
+                result &= column == codes[0]
+            else:
+                result &= np.isin(column, codes)
+        return result
+
+    def rows(self, mask: np.ndarray = None) -> list:
+        """
+        (ip, port name) of the rows selected by mask (all rows without one).
+        """
+        indexes = np.flatnonzero(mask) if mask is not None else np.arange(self.length)
+        devices, ports = self._device[indexes], self._port[indexes]
+        port_names = self.ports.values
+        return [(self.devices[device], port_names[port]) for device, port in zip(devices.tolist(), ports.tolist())]
+
+    def count(self, mask: np.ndarray = None) -> int:
+        return self.length if mask is None else int(np.count_nonzero(mask))
+
+    def count_by(self, columns, mask: np.ndarray = None) -> dict:
+        """
+        Group-by count over one or more columns, e.g. count_by("device", mask(link_state="Down"))
+        gives ip -> link-down ports, count_by(("speed", "duplex")) gives (speed, duplex) -> ports.
+        The group key is computed from the codes with integer arithmetic and counted with one
+        np.bincount call; only non-empty groups are returned.
+        """
+        single = isinstance(columns, str)
+        columns = (columns,) if single else tuple(columns)
+        key = np.zeros(self.length, dtype=np.int64)
+        sizes = []
+        for name in columns:
+            size = max(1, len(self._dictionary(name)))
+            key = key * size + self.column(name)
+            sizes.append(size)
+        if mask is not None:
+            key = key[mask]
+        counts = np.bincount(key, minlength=0)
+
+        result = {}
+        for group in np.flatnonzero(counts).tolist():
+            values, rest = [], group
+            for name, size in zip(reversed(columns), reversed(sizes)):
+                rest, code = divmod(rest, size)
+                values.append(self._dictionary(name)[code])
+            values.reverse()
+            result[values[0] if single else tuple(values)] = int(counts[group])
+        return result
+
+    def __len__(self):
+        return self.length
+
+    def __repr__(self):
+        return f"<Fleet_status_table devices={len(self.devices)} rows={self.length}>"
@@ -1,47 +1,65 @@
 #from core.command_builder import Command_builder
+import sys
+
+from domain.vlan_set import Vlan_set
+
+
+def _intern(value):
+    return sys.intern(value) if isinstance(value, str) else value
 
 
 class Physical_interface_settings:
+    # Allowed values are shared by all instances instead of being copied per port.
+    duplex_values = ("Full", "Half")
+    speed_values = ("10", "100", "1000", "10000")
+    negotiation_values = ("Enabled", "Disabled")
+    flow_ctrl_values = ("Off", "On", "Auto")
+    link_admin_state_values = ("shutdown", "no shutdown")
+    back_pressure_values = ("Disabled", "Enabled")
+    mdix_mode_values = ("Auto", "On")
+    modes = ("access", "trunk", "general", "customer", "no switchport")
+
+    VLAN_FIELDS = ("allowed_vlans", "general_allowed_tagged", "general_allowed_untagged", "general_forbiden")
+
+    __slots__ = (
+        "name", "type", "duplex", "speed", "negotiation", "flow_ctrl", "link_admin_state",
+        "back_pressure", "mdix_mode", "ethernet_negotiation", "description", "active_mode",
+        "access_vlan", "allowed_vlans", "native_vlan", "general_allowed_tagged",
+        "general_allowed_untagged", "general_forbiden", "pvid_vlan", "customer_vlan",
+        "physical_interface_ips",
+    )
+
     def __init__(self, name: str, values: list[str]):
         """
         Initialize a physical interface with its base status data.
         """
         self.name = name
-        self.type = values[0] if len(values) > 0 else None
-        self.duplex_values = ["Full", "Half"]
+        self.type = _intern(values[0]) if len(values) > 0 else None
         self.duplex = "Full"
-        self.speed_values = ["10", "100", "1000", "10000"]
         self.speed = "1000"
-        self.negotiation_values = ["Enabled", "Disabled"]
         self.negotiation = "Enabled"
-        self.flow_ctrl_values = ["Off", "On", "Auto"]
         self.flow_ctrl = "Off"
-        self.link_admin_state_values = ["shutdown", "no shutdown"]
         self.link_admin_state = "no shutdown"
-        self.back_pressure_values = ["Disabled", "Enabled"]
         self.back_pressure = "Disabled"
-        self.mdix_mode_values = ["Auto", "On"]
         self.mdix_mode = "Auto"
 
         self.ethernet_negotiation = True
 
         # Switchport description
         self.description = ""
-        self.modes = ["access", "trunk", "general", "customer","no switchport"]
         self.active_mode = "access"
-        
 
         # Access
         self.access_vlan = 1
 
         # Trunk
-        self.allowed_vlans = []
+        self.allowed_vlans = Vlan_set()
         self.native_vlan = 0
 
         # General
-        self.general_allowed_tagged = []
-        self.general_allowed_untagged = []
-        self.general_forbiden = []
+        self.general_allowed_tagged = Vlan_set()
+        self.general_allowed_untagged = Vlan_set()
+        self.general_forbiden = Vlan_set()
 
         self.pvid_vlan = 0
 
@@ -50,24 +68,103 @@ class Physical_interface_settings:
 
         # L3
         self.physical_interface_ips = {"DHCP":False}
-    
 
-    
+    def as_dict(self) -> dict:
+        """
+        Plain-Python view of all settings (VLAN storage as lists), e.g. for printing or comparison.
+        """
+        result = {}
+        for attribute in self.__slots__:
+            value = getattr(self, attribute)
+            result[attribute] = list(value) if attribute in self.VLAN_FIELDS else value
+        return result
+
+    def update_from(self, other: "Physical_interface_settings"):
+        """
+        Copies every setting of other into this object, so existing references see the new values.
+        """
+        for attribute in self.__slots__:
+            setattr(self, attribute, getattr(other, attribute))
+
+    def carried_vlans(self) -> Vlan_set:
+        """
+        VLANs this port forwards in its active mode.
+        """
+        if self.active_mode == "access":
+            return Vlan_set([self.access_vlan])
+        if self.active_mode == "trunk":
+            carried = Vlan_set(self.allowed_vlans)
+            if self.native_vlan:
+                carried.add(self.native_vlan)
+            return carried
+        if self.active_mode == "general":
+            carried = self.general_allowed_tagged | self.general_allowed_untagged
+            if self.pvid_vlan:
+                carried.add(self.pvid_vlan)
+            return carried - self.general_forbiden
+        if self.active_mode == "customer" and self.customer_vlan:
+            return Vlan_set([self.customer_vlan])
+        return Vlan_set()
 
     def __repr__(self):
-        return f"<Physical_interface name={self.name} mode={self.active_mode} link={self.link_state}>"
+        return f"<Physical_interface name={self.name} mode={self.active_mode} link={self.link_admin_state}>"
 
 class Physical_interface_current_status:
+    __slots__ = ("name", "type", "duplex", "speed", "negotiation", "flow_ctrl", "link_state", "back_pressure",
+                 "mdix_mode")
+
     def __init__(self, name: str, values: list[str]):
         """
         Initialize a physical interface with its base status data.
+        Repeated status strings ('Full', '1000', 'Up', ...) are interned and shared between ports.
         """
         self.name = name
-        self.type = values[0] if len(values) > 0 else None
-        self.duplex = values[1] if len(values) > 1 else None
-        self.speed = values[2] if len(values) > 2 else None
-        self.negotiation = values[3] if len(values) > 3 else None
-        self.flow_ctrl = values[4] if len(values) > 4 else None
-        self.link_state = values[5] if len(values) > 5 else None
-        self.back_pressure = values[6] if len(values) > 6 else None
-        self.mdix_mode = values[7] if len(values) > 7 else None
\ No newline at end of file
+        self.type = _intern(values[0]) if len(values) > 0 else None
+        self.duplex = _intern(values[1]) if len(values) > 1 else None
+        self.speed = _intern(values[2]) if len(values) > 2 else None
+        self.negotiation = _intern(values[3]) if len(values) > 3 else None
+        self.flow_ctrl = _intern(values[4]) if len(values) > 4 else None
+        self.link_state = _intern(values[5]) if len(values) > 5 else None
+        self.back_pressure = _intern(values[6]) if len(values) > 6 else None
+        self.mdix_mode = _intern(values[7]) if len(values) > 7 else None
+
+    def as_dict(self) -> dict:
+        return {attribute: getattr(self, attribute) for attribute in self.__slots__}
+
+    def update(self, values: list[str]) -> dict:
+        """
+        Applies a fresh 'show interfaces status' row in place, so existing references stay valid.
+
+        Returns:
+            dict: field -> (old, new) for the fields that changed
+        """
+        changes = {}
+        for position, attribute in enumerate(self.__slots__[1:]):
+            new = _intern(values[position]) if len(values) > position else None
+            old = getattr(self, attribute)
+            if old != new:
+                setattr(self, attribute, new)
+                changes[attribute] = (old, new)
+        return changes
+
+    def __repr__(self):
+        return f"<Physical_interface_current_status name={self.name} link={self.link_state}>"
+
+
+def ports_carrying_vlan(devices: dict, vlan: int) -> dict:
+    """
+    Fleet-wide query: which ports carry a VLAN. Each port costs one bit test on its Vlan_set.
+
+    Args:
+        devices (dict): ip -> {interface name -> Physical_interface_settings}
+        vlan (int): VLAN id
+
+    Returns:
+        dict: ip -> list of interface names, only for devices with at least one match
+    """
+    result = {}
+    for ip, settings_objects in devices.items():
+        ports = [name for name, settings_obj in settings_objects.items() if vlan in settings_obj.carried_vlans()]
+        if ports:
+            result[ip] = ports
+    return result
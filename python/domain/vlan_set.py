@@ -0,0 +1,153 @@
+from functools import lru_cache
+
+MIN_VLAN = 1
+MAX_VLAN = 4094
+
+
+@lru_cache(maxsize=4096)
+def _parse_mask(text: str) -> int:
+    """
+    Bitmap of a CBS250 VLAN list. Memoised: a config repeats the same few lists on many
+    ports, so most parses are a dict hit. Malformed lists raise ValueError (not cached).
+    """
+    text = text.strip()
+    if text == "all":
+        return ((1 << (MAX_VLAN + 1)) - 1) ^ 1
+    mask = 0
+    if text in ("", "none"):
+        return mask
+    for item in text.split(","):
+        first, dash, last = item.strip().partition("-")
+        if not first.isdigit() or (dash and not last.isdigit()):
+            raise ValueError(f"Invalid VLAN list item '{item}'.")
+        low = Vlan_set._checked(first)
+        high = Vlan_set._checked(last) if last else low
+        if high < low:
+            raise ValueError(f"Invalid VLAN range '{item}'.")
+        mask |= ((1 << (high - low + 1)) - 1) << low
+    return mask
+
+
+class Vlan_set:
+    __slots__ = ("_mask",)
+
+    def __init__(self, vlans=()):
+        """
+        Set of VLAN ids backed by a 4094-bit bitmap (bit n set = VLAN n is a member).
+        Membership is a single bit test and union / intersection / difference are single
+        bitwise operations, whatever the number of VLANs.
+
+        Args:
+            vlans: Iterable of VLAN ids, or another Vlan_set
+        """
+        if not vlans:
+            self._mask = 0
+            return
+        if isinstance(vlans, Vlan_set):
+            self._mask = vlans._mask
+            return
+        mask = 0
+        for vlan in vlans:
+            mask |= 1 << self._checked(vlan)
+        self._mask = mask
+
+    @staticmethod
+    def _checked(vlan: int) -> int:
+        vlan = int(vlan)
+        if not MIN_VLAN <= vlan <= MAX_VLAN:
+            raise ValueError(f"VLAN id {vlan} out of range {MIN_VLAN}-{MAX_VLAN}.")
+        return vlan
+
+    @classmethod
+    def _from_mask(cls, mask: int) -> "Vlan_set":
+        vlan_set = cls.__new__(cls)
+        vlan_set._mask = mask
+        return vlan_set
+
+    @classmethod
+    def all(cls) -> "Vlan_set":
+        return cls._from_mask(((1 << (MAX_VLAN + 1)) - 1) ^ 1)
+
+    @classmethod
+    def parse(cls, text: str) -> "Vlan_set":
+        """
+        Parses CBS250 VLAN list syntax, e.g. '1-100,200,300-310'. 'all' and 'none' are accepted too.
+
+        Raises:
+            ValueError: On malformed items or VLAN ids out of range
+        """
+        return cls._from_mask(_parse_mask(text))
+
+    def to_cli(self) -> str:
+        """
+        Emits CBS250 range syntax, e.g. '1-100,200'. An empty set gives ''.
+        """
+        items = []
+        mask = self._mask
+        while mask:
+            low = (mask & -mask).bit_length() - 1
+            # Length of the run of set bits starting at 'low'
+            run = (~(mask >> low) & ((mask >> low) + 1)).bit_length() - 1
+            high = low + run - 1
+            items.append(str(low) if low == high else f"{low}-{high}")
+            mask &= ~(((1 << run) - 1) << low)
+        return ",".join(items)
+
+    def add(self, vlan: int):
+        self._mask |= 1 << self._checked(vlan)
+
+    def discard(self, vlan: int):
+        if MIN_VLAN <= vlan <= MAX_VLAN:
+            self._mask &= ~(1 << vlan)
+
+    def update(self, other: "Vlan_set"):
+        self._mask |= other._mask
+
+    def difference_update(self, other: "Vlan_set"):
+        self._mask &= ~other._mask
+
+    def __contains__(self, vlan: int) -> bool:
+        return isinstance(vlan, int) and MIN_VLAN <= vlan <= MAX_VLAN and (self._mask >> vlan) & 1 == 1
+
+    def __iter__(self):
+        mask = self._mask
+        while mask:
+            lowest = mask & -mask
+            yield lowest.bit_length() - 1
+            mask ^= lowest
+
+    def __len__(self):
+        return bin(self._mask).count("1")
+
+    def __bool__(self):
+        return self._mask != 0
+
+    def __or__(self, other: "Vlan_set") -> "Vlan_set":
+        return Vlan_set._from_mask(self._mask | other._mask)
+
+    def __and__(self, other: "Vlan_set") -> "Vlan_set":
+        return Vlan_set._from_mask(self._mask & other._mask)
+
+    def __sub__(self, other: "Vlan_set") -> "Vlan_set":
+        return Vlan_set._from_mask(self._mask & ~other._mask)
+
+    def __xor__(self, other: "Vlan_set") -> "Vlan_set":
+        return Vlan_set._from_mask(self._mask ^ other._mask)
+
+    def __le__(self, other: "Vlan_set") -> bool:
+        return self._mask & ~other._mask == 0
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, Vlan_set) and self._mask == other._mask
+
+    __hash__ = None
+
+    def __getstate__(self):
+        # Wrapped in a tuple: an empty set's mask of 0 would make pickle skip __setstate__
+        return (self._mask,)
+
+    def __setstate__(self, state: tuple):
+        self._mask = state[0]
+
+    def __repr__(self):
+        return f"<Vlan_set {self.to_cli() or 'none'}>"
@@ -0,0 +1,325 @@
+import difflib
+import hashlib
+import json
+import threading
+import time
+
+from core.config_parser import Running_config_parser
+from infrastructure.snapshot_cache import Snapshot_cache
+from infrastructure.storage import Sql_store
+
+
+ARCHIVE_SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS archive_blocks (
+        digest TEXT PRIMARY KEY,
+        content TEXT)""",
+    """CREATE TABLE IF NOT EXISTS archive_versions (
+        ip TEXT,
+        which TEXT,
+        version INTEGER,
+        digest TEXT,
+        keyframe INTEGER,
+        delta TEXT,
+        first_seen DOUBLE PRECISION,
+        last_seen DOUBLE PRECISION,
+        seen INTEGER,
+        PRIMARY KEY (ip, which, version))""",
+)
+
+def split_blocks(lines: list, parser: Running_config_parser = None) -> list:
+    """
+    Splits cleaned config lines into blocks: the lines before the first section, then one
+    block per section (its header and the lines up to the next header). Section headers are
+    the ones the config parser knows, so blocks follow the sections of Config_model.
+
+    Returns:
+        list: Blocks as '\\n'-joined text
+    """
+    is_section_header = (parser or Running_config_parser()).is_section_header
+    blocks, current = [], []
+    for line in lines:
+        if current and is_section_header(line):
+            blocks.append("\n".join(current))
+            current = []
+        current.append(line)
+    if current:
+        blocks.append("\n".join(current))
+    return blocks
+
+
+def block_digest(block: str) -> str:
+    return hashlib.blake2b(block.encode("utf-8", errors="replace"), digest_size=16).hexdigest()
+
+
+def make_delta(previous: list, current: list) -> list:
+    """
+    Delta between two block digest lists: [start, stop] copies previous[start:stop], a string
+    is a block digest taken as is. Deleted blocks simply do not appear.
+    """
+    delta = []
+    matcher = difflib.SequenceMatcher(None, previous, current, autojunk=False)
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            delta.append([i1, i2])
+        elif tag != "delete":
+            delta.extend(current[j1:j2])
+    return delta
+
+
+def apply_delta(previous: list, delta: list) -> list:
+    current = []
+    for operation in delta:
+        if isinstance(operation, str):
+            current.append(operation)
+        else:
+            current.extend(previous[operation[0]:operation[1]])
+    return current
+
+
+class Config_archive(Sql_store):
+    def __init__(self, backend, keyframe_interval: int = 32, max_cached_blocks: int = 100000):
+        """
+        Every running / startup config retrieved from every switch, deduplicated.
+
+        Configs are cut into blocks (split_blocks: one per section) stored once by content
+        hash in archive_blocks, so a section that is identical on 300 switches or in 50
+        snapshots costs one row. A version is a list of block digests, stored as a delta
+        against the device's previous version; every keyframe_interval versions the full list
+        is stored instead, so reading any version applies at most keyframe_interval - 1 deltas
+        (one query for the chain, one for the blocks). A config identical to the latest
+        version only moves its last_seen / seen counters. Storage therefore grows with the
+        sections that actually changed, not with the number of snapshots.
+
+        Args:
+            backend: Sqlite_backend or Postgres_backend
+            keyframe_interval (int): Versions per delta chain
+            max_cached_blocks (int): Block texts kept in memory for reads
+        """
+        super().__init__(backend, ARCHIVE_SCHEMA)
+        self.keyframe_interval = keyframe_interval
+        self.max_cached_blocks = max_cached_blocks
+        self._latest = {}       # (ip, which) -> (version, digest, keyframe, block digests)
+        self._stored = set()    # block digests known to be in archive_blocks
+        self._blocks = {}       # block digest -> text
+        self._parser = Running_config_parser()
+        self._lock = threading.RLock()
+
+    def archive(self, ip: str, which: str, lines: list, taken_at: float = None) -> int:
+        """
+        Archives one retrieved config.
+
+        Args:
+            which (str): 'running' or 'startup'
+            lines (list): Cleaned config lines, as returned by Session_handler.get_config()
+
+        Returns:
+            int: Version the config was stored as (the latest one if it did not change)
+        """
+        return self._write([(ip, which, lines)], taken_at)[0]
+
+    def archive_devices(self, initializers: dict, taken_at: float = None) -> dict:
+        """
+        Archives running and startup config of ip -> Initializer results in one transaction.
+
+        Returns:
+            dict: (ip, which) -> version
+        """
+        snapshots = [(ip, which, lines) for ip, initializer in initializers.items()
+                     for which, lines in (("running", initializer.running_config),
+                                          ("startup", initializer.startup_config))
+                     if lines]
+        versions = self._write(snapshots, taken_at)
+        return {(ip, which): version for (ip, which, _), version in zip(snapshots, versions)}
+
+    def _write(self, snapshots: list, taken_at: float) -> list:
+        with self._lock:
+            try:
+                with self.transaction():
+                    return self._archive_many(snapshots, time.time() if taken_at is None else taken_at)
+            except BaseException:
+                self._latest.clear()        # the in-memory state may be ahead of the rolled back rows
+                self._stored.clear()
+                raise
+
+    def _archive_many(self, snapshots: list, taken_at: float) -> list:
+        versions, version_rows, unchanged, new_blocks = [], [], [], {}
+        for ip, which, lines in snapshots:
+            digest = Snapshot_cache.config_hash(lines)
+            latest = self._latest_version(ip, which)
+            if latest is not None and latest[1] == digest:
+                unchanged.append((ip, which, latest[0]))
+                versions.append(latest[0])
+                continue
+
+            blocks = split_blocks(lines, self._parser)
+            digests = [block_digest(block) for block in blocks]
+            for block_hash, block in zip(digests, blocks):
+                if block_hash not in self._stored:
+                    new_blocks[block_hash] = block
+            if latest is None:
+                version = keyframe = 0
+                delta = digests
+            else:
+                version = latest[0] + 1
+                if version - latest[2] >= self.keyframe_interval:
+                    keyframe, delta = version, digests
+                else:
+                    keyframe, delta = latest[2], make_delta(latest[3], digests)
+            version_rows.append((ip, which, version, digest, keyframe, json.dumps(delta, separators=(",", ":")),
+                                 taken_at, taken_at, 1))
+            self._latest[(ip, which)] = (version, digest, keyframe, digests)
+            versions.append(version)
+
+        self.insert_rows("archive_blocks", ("digest", "content"), list(new_blocks.items()),
+                         "ON CONFLICT (digest) DO NOTHING")
+        self.insert_rows("archive_versions", ("ip", "which", "version", "digest", "keyframe", "delta",
+                                              "first_seen", "last_seen", "seen"), version_rows)
+        self._touch(unchanged, taken_at)
+        self._stored.update(new_blocks)
+        return versions
+
+    def _touch(self, keys: list, taken_at: float):
+        """
+        Moves last_seen / seen of unchanged versions, many (ip, which, version) keys per UPDATE.
+        """
+        placeholder = self.backend.placeholder
+        key_placeholder = f"({placeholder}, {placeholder}, {placeholder})"
+        keys_per_statement = max(1, (self.backend.max_parameters - 1) // 3)
+        for start in range(0, len(keys), keys_per_statement):
+            chunk = keys[start:start + keys_per_statement]
+            self.backend.execute(
+                f"UPDATE archive_versions SET last_seen = {placeholder}, seen = seen + 1 "
+                f"WHERE (ip, which, version) IN ({', '.join([key_placeholder] * len(chunk))})",
+                [taken_at] + [value for key in chunk for value in key])
+
+    def _latest_version(self, ip: str, which: str):
+        """
+        (version, digest, keyframe, block digests) of the newest version, or None.
+        Read from the database once per device, then kept up to date in memory.
+        """
+        key = (ip, which)
+        if key not in self._latest:
+            placeholder = self.backend.placeholder
+            rows = self.backend.execute(
+                f"SELECT version, digest, keyframe FROM archive_versions WHERE ip = {placeholder} "
+                f"AND which = {placeholder} ORDER BY version DESC LIMIT 1", (ip, which))
+            self._latest[key] = (rows[0][0], rows[0][1], rows[0][2], self._block_digests(ip, which, rows[0][0])) \
+                if rows else None
+            if rows:
+                self._stored.update(self._latest[key][3])
+        return self._latest[key]
+
+    def _block_digests(self, ip: str, which: str, version: int) -> list:
+        """
+        Block digest list of a version: its keyframe with the following deltas applied.
+        """
+        placeholder = self.backend.placeholder
+        rows = self.backend.execute(
+            f"SELECT version, keyframe, delta FROM archive_versions WHERE ip = {placeholder} AND which = {placeholder} "
+            f"AND version <= {placeholder} AND version >= (SELECT keyframe FROM archive_versions "
+            f"WHERE ip = {placeholder} AND which = {placeholder} AND version = {placeholder}) ORDER BY version",
+            (ip, which, version, ip, which, version))
+        if not rows or rows[-1][0] != version:
+            return None
+        digests = []
+        for row_version, keyframe, delta in rows:
+            delta = json.loads(delta)
+            digests = delta if row_version == keyframe else apply_delta(digests, delta)
+        return digests
+
+    def _load_blocks(self, digests) -> dict:
+        """
+        block digest -> text for the given digests, from memory where possible.
+        """
+        blocks = {block_hash: self._blocks[block_hash] for block_hash in digests if block_hash in self._blocks}
+        missing = list({block_hash for block_hash in digests if block_hash not in blocks})
+        for chunk in self.in_chunks(missing):
+            sql = (f"SELECT digest, content FROM archive_blocks WHERE digest IN "
+                   f"({', '.join([self.backend.placeholder] * len(chunk))})")
+            blocks.update(self.backend.execute(sql, chunk))
+        if len(self._blocks) + len(missing) > self.max_cached_blocks:
+            self._blocks.clear()
+        self._blocks.update((block_hash, blocks[block_hash]) for block_hash in missing if block_hash in blocks)
+        return blocks
+
+    def get(self, ip: str, which: str, version: int = None) -> list:
+        """
+        Config lines of a version (the latest without one), or None if it is not archived.
+        """
+        with self._lock:
+            if version is None:
+                latest = self._latest_version(ip, which)
+                if latest is None:
+                    return None
+                version, digests = latest[0], latest[3]
+            else:
+                digests = self._block_digests(ip, which, version)
+                if digests is None:
+                    return None
+            blocks = self._load_blocks(digests)
+            return [line for block_hash in digests for line in blocks[block_hash].split("\n")]
+
+    def versions(self, ip: str, which: str) -> list:
+        """
+        (version, digest, first_seen, last_seen, seen) of every archived version, oldest first.
+        """
+        placeholder = self.backend.placeholder
+        with self._lock:
+            return self.backend.execute(
+                f"SELECT version, digest, first_seen, last_seen, seen FROM archive_versions "
+                f"WHERE ip = {placeholder} AND which = {placeholder} ORDER BY version", (ip, which))
+
+    def version_at(self, ip: str, which: str, timestamp: float):
+        """
+        Version that was current at timestamp (the newest one first seen before it), or None.
+        """
+        placeholder = self.backend.placeholder
+        with self._lock:
+            rows = self.backend.execute(
+                f"SELECT MAX(version) FROM archive_versions WHERE ip = {placeholder} AND which = {placeholder} "
+                f"AND first_seen <= {placeholder}", (ip, which, timestamp))
+        return rows[0][0] if rows else None
+
+    def export(self, ips: list = None):
+        """
+        Bulk export of every archived version, device by device, oldest version first.
+        Each chain is rebuilt incrementally and each block read once per device, so exporting
+        all versions costs about as much as reading the latest of each.
+
+        The rows and blocks of each chunk of devices are read under the archive lock and the
+        versions are yielded after releasing it, so a slow consumer never blocks archive().
+
+        Yields:
+            tuple: (ip, which, version, first_seen, last_seen, lines)
+        """
+        if ips is None:
+            with self._lock:
+                ips = [row[0] for row in self.backend.execute("SELECT DISTINCT ip FROM archive_versions ORDER BY ip")]
+        for chunk in self.in_chunks(list(ips)):
+            with self._lock:
+                rows = self.backend.execute(
+                    f"SELECT ip, which, version, keyframe, delta, first_seen, last_seen FROM archive_versions "
+                    f"WHERE ip IN ({', '.join([self.backend.placeholder] * len(chunk))}) ORDER BY ip, which, version",
+                    chunk)
+                chains = [(row, json.loads(row[4])) for row in rows]
+                blocks = self._load_blocks({operation for _, delta in chains for operation in delta
+                                            if isinstance(operation, str)})
+            digests = []
+            for (ip, which, version, keyframe, _, first_seen, last_seen), delta in chains:
+                digests = delta if version == keyframe else apply_delta(digests, delta)
+                yield ip, which, version, first_seen, last_seen, \
+                    [line for block_hash in digests for line in blocks[block_hash].split("\n")]
+
+    def stats(self) -> dict:
+        """
+        Row counts and stored text sizes, e.g. to compare against full copies.
+        """
+        with self._lock:
+            blocks, block_bytes = self.backend.execute("SELECT COUNT(*), SUM(LENGTH(content)) FROM archive_blocks")[0]
+            versions, delta_bytes, snapshots = self.backend.execute(
+                "SELECT COUNT(*), SUM(LENGTH(delta)), SUM(seen) FROM archive_versions")[0]
+        return {"snapshots": snapshots or 0, "versions": versions, "blocks": blocks,
+                "block_bytes": block_bytes or 0, "delta_bytes": delta_bytes or 0}
+
+    def __repr__(self):
+        return f"<Config_archive {self.backend!r} keyframe_interval={self.keyframe_interval}>"
@@ -0,0 +1,77 @@
+import re
+
+
+_PAGER_TAIL = re.compile(r',?\s*Quit: q or CTRL\+Z, One line: <return> *\r?!?')
+_PRIVILEGE_USERNAME = re.compile(r'(privilege \d+)(username )')
+_PRIVILEGE_SSH = re.compile(r'(privilege \d+)\s*(ip ssh server)')
+_TOKEN_SPLIT = re.compile(r'\n| {2,}')
+
+# Characters that may continue a cleanup match across a line break, so a chunk
+# must never be cut right before them.
+_UNSAFE_CUT_CHARS = frozenset(" \t\r\n\f\v,Qi")
+
+
+def clean_config_text(text: str) -> list:
+    """
+    Cleans a (partial) configuration dump and returns its lines.
+    Runs in linear time: a few regex passes plus one regex split.
+
+    Args:
+        text (str): Raw text collected from 'show running-config' / 'show startup-config'
+
+    Returns:
+        list: Cleaned configuration lines
+    """
+    text = _PAGER_TAIL.sub('', text)
+    text = text.replace('\r\n', '\n').replace('\r', '\n')
+    text = _PRIVILEGE_USERNAME.sub(r'\1\n\2', text)
+    text = _PRIVILEGE_SSH.sub(r'\1\n\2', text)
+
+    outputlines = []
+    for token in _TOKEN_SPLIT.split(text):
+        cleaned = token.strip()
+        if cleaned and cleaned.lower() not in ("exit", "!"):
+            outputlines.append(cleaned)
+    return outputlines
+
+
+class Config_stream_cleaner:
+    def __init__(self):
+        """
+        Incremental version of clean_config_text().
+        Feed it raw pages as they arrive and it yields the lines that are already final.
+        Text after the last safe line break is kept until the next page or close().
+        """
+        self._pending = ""
+
+    def feed(self, chunk: str):
+        """
+        Adds a raw chunk and yields every line that can no longer change.
+        """
+        self._pending += chunk
+        cut = self._find_safe_cut()
+        if cut <= 0:
+            return
+        ready, self._pending = self._pending[:cut], self._pending[cut:]
+        yield from clean_config_text(ready)
+
+    def close(self):
+        """
+        Flushes whatever is still pending.
+        """
+        ready, self._pending = self._pending, ""
+        yield from clean_config_text(ready)
+
+    def _find_safe_cut(self) -> int:
+        """
+        Returns the position right after the last line break that is followed by a character
+        no cleanup pattern can continue through, or 0 if there is none yet.
+        """
+        position = len(self._pending)
+        while True:
+            position = self._pending.rfind('\n', 0, position)
+            if position < 0:
+                return 0
+            following = position + 1
+            if following < len(self._pending) and self._pending[following] not in _UNSAFE_CUT_CHARS:
+                return following
@@ -0,0 +1,232 @@
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager, nullcontext
+
+
+# Metric label values: a command is exported under the longest of these it starts with, or
+# 'other'. The raw text never leaves the process: config commands can carry passwords and SNMP
+# communities, and free text would give the metrics endpoint unbounded label cardinality.
+COMMAND_KINDS = tuple(sorted((
+    "connect", "validate_connection", "terminal datadump", "configure terminal", "end", "exit",
+    "show running-config interface", "show running-config", "show startup-config", "show system",
+    "show interfaces status", "show",
+    "interface range", "interface", "no", "switchport", "description", "speed", "duplex", "negotiation",
+    "flowcontrol", "back-pressure", "mdix", "shutdown", "ip address", "ip", "hostname", "username",
+    "vlan", "snmp-server", "enable", "write", "copy",
+), key=len, reverse=True))
+
+
+def command_kind(command: str) -> str:
+    """
+    Bounded, secret-free label for a command, e.g. 'username admin password x' -> 'username'.
+    """
+    for kind in COMMAND_KINDS:
+        if command.startswith(kind) and (len(command) == len(kind) or command[len(kind)] == " "):
+            return kind
+    return "other"
+
+
+class Command_record:
+    __slots__ = ("device", "command", "kind", "started_at", "wall_time", "expect_time", "bytes_received", "pages",
+                 "timeouts")
+
+    def __init__(self, device: str, command: str):
+        """
+        Hot-path measurements of one CLI command. command is the raw text (kept in memory
+        only); kind is the label it is exported under, see command_kind().
+        """
+        self.device = device
+        self.command = command
+        self.kind = command_kind(command)
+        self.started_at = time.time()
+        self.wall_time = 0.0
+        self.expect_time = 0.0      # time blocked inside expect()
+        self.bytes_received = 0
+        self.pages = 0              # "More: <space>" pages answered
+        self.timeouts = 0
+
+    def as_dict(self) -> dict:
+        return {attribute: getattr(self, attribute) for attribute in self.__slots__}
+
+    def __repr__(self):
+        return (f"<Command_record {self.device} {self.command!r} wall={self.wall_time * 1000:.1f}ms "
+                f"expect={self.expect_time * 1000:.1f}ms bytes={self.bytes_received} pages={self.pages}>")
+
+
+class Phase_record:
+    __slots__ = ("device", "phase", "started_at", "duration")
+
+    def __init__(self, device: str, phase: str):
+        """
+        Duration of one initialization phase (_get_data, interface parsing, ...).
+        """
+        self.device = device
+        self.phase = phase
+        self.started_at = time.time()
+        self.duration = 0.0
+
+    def as_dict(self) -> dict:
+        return {attribute: getattr(self, attribute) for attribute in self.__slots__}
+
+    def __repr__(self):
+        return f"<Phase_record {self.device} {self.phase} {self.duration * 1000:.1f}ms>"
+
+
+class Metrics_recorder:
+    def __init__(self, max_records: int = 10000):
+        """
+        Collects Command_record / Phase_record objects from any number of sessions and threads.
+        The latest max_records of each kind are kept as structured records; running totals per
+        (device, command kind) and (device, phase) are kept forever for the Prometheus export.
+        Commands of a pipelined batch are recorded one by one, so the export shows what each
+        of them cost instead of one opaque sample per batch.
+
+        Sessions without a recorder skip all of this behind a single 'is None' check.
+        """
+        self.commands = deque(maxlen=max_records)
+        self.phases = deque(maxlen=max_records)
+        self._command_totals = {}
+        self._phase_totals = {}
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def command(self, device: str, command: str):
+        record = Command_record(device, command)
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.wall_time = time.perf_counter() - started
+            with self._lock:
+                self.commands.append(record)
+                totals = self._command_totals.setdefault((device, record.kind), [0, 0.0, 0.0, 0, 0, 0])
+                totals[0] += 1
+                totals[1] += record.wall_time
+                totals[2] += record.expect_time
+                totals[3] += record.bytes_received
+                totals[4] += record.pages
+                totals[5] += record.timeouts
+
+    @contextmanager
+    def phase(self, device: str, phase: str):
+        record = Phase_record(device, phase)
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record.duration = time.perf_counter() - started
+            with self._lock:
+                self.phases.append(record)
+                totals = self._phase_totals.setdefault((device, phase), [0, 0.0])
+                totals[0] += 1
+                totals[1] += record.duration
+
+    def to_prometheus(self) -> str:
+        """
+        Renders the running totals in the Prometheus text exposition format.
+        """
+        with self._lock:
+            command_totals = dict(self._command_totals)
+            phase_totals = dict(self._phase_totals)
+
+        lines = []
+        command_metrics = (
+            ("cbs250_command_duration_seconds", "summary", "Wall time per CLI command.", 1),
+            ("cbs250_command_expect_seconds", "summary", "Time blocked in expect() per CLI command.", 2),
+            ("cbs250_command_received_bytes_total", "counter", "Bytes received per CLI command.", 3),
+            ("cbs250_command_pages_total", "counter", "'More: <space>' pages answered.", 4),
+            ("cbs250_command_timeouts_total", "counter", "expect() timeouts hit.", 5),
+        )
+        for name, metric_type, help_text, column in command_metrics:
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+            for (device, kind), totals in command_totals.items():
+                labels = f'device="{_escape(device)}",command="{_escape(kind)}"'
+                if metric_type == "summary":
+                    lines.append(f"{name}_sum{{{labels}}} {totals[column]:.6f}")
+                    lines.append(f"{name}_count{{{labels}}} {totals[0]}")
+                else:
+                    lines.append(f"{name}{{{labels}}} {totals[column]}")
+
+        lines.append("# HELP cbs250_phase_duration_seconds Duration of initialization phases.")
+        lines.append("# TYPE cbs250_phase_duration_seconds summary")
+        for (device, phase), (count, duration) in phase_totals.items():
+            labels = f'device="{_escape(device)}",phase="{_escape(phase)}"'
+            lines.append(f"cbs250_phase_duration_seconds_sum{{{labels}}} {duration:.6f}")
+            lines.append(f"cbs250_phase_duration_seconds_count{{{labels}}} {count}")
+        return "\n".join(lines) + "\n"
+
+    def __repr__(self):
+        return f"<Metrics_recorder commands={len(self.commands)} phases={len(self.phases)}>"
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+_NO_RECORD = nullcontext()
+
+
+def command_scope(recorder: Metrics_recorder, device: str, command: str):
+    """
+    recorder.command() or a shared no-op context when instrumentation is off.
+    """
+    return _NO_RECORD if recorder is None else recorder.command(device, command)
+
+
+def phase_scope(recorder: Metrics_recorder, device: str, phase: str):
+    return _NO_RECORD if recorder is None else recorder.phase(device, phase)
+
+
+def _size(data) -> int:
+    if isinstance(data, str):
+        return len(data.encode(errors="replace"))
+    return len(data) if isinstance(data, bytes) else 0
+
+
+class Metered_child:
+    def __init__(self, child, timeout_marker, owner):
+        """
+        Wraps a wexpect child when instrumentation is on: every expect() adds its blocked time,
+        received bytes, answered pages and timeouts to the owner's current Command_record.
+        Bytes are counted when a pattern consumes them, so output read again after a timeout
+        is counted once.
+        """
+        self._child = child
+        self._timeout_marker = timeout_marker
+        self._owner = owner
+
+    def expect(self, pattern, *args, **kwargs):
+        started = time.perf_counter()
+        record = self._owner._current_record
+        try:
+            index = self._child.expect(pattern, *args, **kwargs)
+        except Exception as e:
+            if record is not None:
+                record.expect_time += time.perf_counter() - started
+                if isinstance(e, self._timeout_marker):
+                    record.timeouts += 1
+            raise
+        if record is not None:
+            record.expect_time += time.perf_counter() - started
+            matched = pattern[index] if isinstance(pattern, list) else pattern
+            if matched is self._timeout_marker:
+                # before is still unconsumed and is seen again by the next expect()
+                record.timeouts += 1
+                return index
+            record.bytes_received += _size(self._child.before) + _size(self._child.after)
+            if isinstance(matched, str) and matched.startswith("More:"):
+                record.pages += 1
+        return index
+
+    @property
+    def before(self):
+        return self._child.before
+
+    @property
+    def after(self):
+        return self._child.after
+
+    def __getattr__(self, name):
+        return getattr(self._child, name)
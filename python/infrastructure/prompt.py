@@ -0,0 +1,75 @@
+import re
+
+
+# Any CLI prompt at the start of a line: 'switch01#', 'switch01(config-if)#'. Used until the
+# device's own hostname is known (login) and when resynchronising after a stall.
+GENERIC_PROMPT = r"(?:^|[\r\n])[\w.-]+(?:\([\w-]+\))?#"
+
+
+def prompt_pattern(hostname: str) -> str:
+    """
+    Regex matching only this device's prompt, in exec or any config mode, at the start of a line.
+    The line break before the prompt is part of the match, so the text before it is exactly
+    the command output.
+    """
+    return r"(?:^|[\r\n])" + re.escape(hostname) + r"(?:\([\w-]+\))?#"
+
+
+def hostname_from_prompt(prompt: str):
+    """
+    Hostname of a matched prompt ('\\r\\nswitch01(config)#' -> 'switch01'), or None.
+    """
+    match = re.fullmatch(r"\s*([\w.-]+)(?:\([\w-]+\))?#", prompt)
+    return match.group(1) if match else None
+
+
+class Adaptive_timeout:
+    def __init__(self, initial: float = 10.0, minimum: float = 1.0, maximum: float = 10.0,
+                 gain: float = 0.125, variance_gain: float = 0.25, variance_factor: float = 4.0):
+        """
+        Per-device read timeout learned from measured waits, the way TCP sizes its
+        retransmission timeout: value = smoothed wait + variance_factor * wait variation,
+        kept between minimum and maximum. Until the first sample the timeout is initial.
+        backoff() doubles the timeout after a stall; the next sample resets it.
+
+        Args:
+            initial (float): Seconds used before anything was measured (login, first command)
+            minimum (float): Lower bound, so scheduling noise never counts as a stall
+            maximum (float): Upper bound, the former fixed timeout
+        """
+        self.initial = initial
+        self.minimum = minimum
+        self.maximum = maximum
+        self.gain = gain
+        self.variance_gain = variance_gain
+        self.variance_factor = variance_factor
+        self.smoothed = None
+        self.variation = 0.0
+        self.multiplier = 1
+        self.samples = 0
+
+    def observe(self, seconds: float):
+        """
+        Adds one measured wait (send or previous chunk -> next chunk of output).
+        """
+        if self.smoothed is None:
+            self.smoothed = seconds
+            self.variation = seconds / 2
+        else:
+            self.variation += self.variance_gain * (abs(self.smoothed - seconds) - self.variation)
+            self.smoothed += self.gain * (seconds - self.smoothed)
+        self.samples += 1
+        self.multiplier = 1
+
+    def backoff(self):
+        self.multiplier = min(self.multiplier * 2, 64)
+
+    @property
+    def value(self) -> float:
+        if self.smoothed is None:
+            return self.initial
+        estimate = (self.smoothed + self.variance_factor * self.variation) * self.multiplier
+        return min(self.maximum, max(self.minimum, estimate))
+
+    def __repr__(self):
+        return f"<Adaptive_timeout {self.value:.2f}s samples={self.samples}>"
@@ -0,0 +1,251 @@
+import threading
+import time
+from contextlib import contextmanager
+
+from infrastructure.ssh_client import Session_handler
+
+
+# CBS250 default idle timeout of SSH sessions (see txtremarks/exec-timeout.txt)
+DEFAULT_EXEC_TIMEOUT_MINUTES = 10
+
+
+class Pooled_session:
+    def __init__(self, session: Session_handler):
+        """
+        Bookkeeping around one warm Session_handler inside the Session_pool.
+        """
+        self.session = session
+        self.leased = False
+        self.last_used = time.monotonic()
+        self.last_heartbeat = self.last_used
+
+    def __repr__(self):
+        return f"<Pooled_session ip={self.session.ip} leased={self.leased}>"
+
+
+class Session_pool:
+    def __init__(self, max_sessions: int = 64, max_sessions_per_device: int = 2, idle_timeout: float = 1800.0,
+                 heartbeat_margin: float = 0.5, acquire_timeout: float = 30.0, session_factory=None):
+        """
+        Keeps logged-in Session_handler objects warm and leases them per device,
+        so repeated operations on a switch cost one command round trip instead of a new login.
+
+        A background thread sends validate_connection() heartbeats to idle sessions before
+        the switch's exec-timeout expires, and evicts sessions that are broken or idle for
+        longer than idle_timeout.
+
+        Args:
+            max_sessions (int): Upper bound of open sessions over all devices
+            max_sessions_per_device (int): Upper bound of open sessions per switch
+            idle_timeout (float): Seconds an unused session is kept before it is closed
+            heartbeat_margin (float): Fraction of the exec-timeout after which an idle session is pinged
+            acquire_timeout (float): Seconds acquire() waits for a free slot
+            session_factory: Optional callable (ip, username, password) -> Session_handler
+        """
+        self.max_sessions = max_sessions
+        self.max_sessions_per_device = max_sessions_per_device
+        self.idle_timeout = idle_timeout
+        self.heartbeat_margin = heartbeat_margin
+        self.acquire_timeout = acquire_timeout
+        self.session_factory = session_factory or Session_handler
+
+        self._sessions = {}          # ip -> list[Pooled_session]
+        self._exec_timeouts = {}     # ip -> seconds, 0 means never
+        self._condition = threading.Condition()
+        self._stop = threading.Event()
+        self._heartbeat_thread = None
+
+    def start(self):
+        """
+        Starts the background heartbeat / eviction thread.
+        """
+        if self._heartbeat_thread is None:
+            self._stop.clear()
+            self._heartbeat_thread = threading.Thread(target=self._heartbeat_loop, name="session-pool-heartbeat",
+                                                      daemon=True)
+            self._heartbeat_thread.start()
+
+    def close(self):
+        """
+        Stops the heartbeat thread and disconnects every pooled session.
+        """
+        self._stop.set()
+        if self._heartbeat_thread is not None:
+            self._heartbeat_thread.join()
+            self._heartbeat_thread = None
+        with self._condition:
+            entries = [entry for entries in self._sessions.values() for entry in entries]
+            self._sessions.clear()
+            self._condition.notify_all()
+        for entry in entries:
+            entry.session.disconnect()
+
+    def set_exec_timeout(self, ip: str, minutes: int):
+        """
+        Records a non-default 'exec-timeout' found in the device's 'line ssh' block.
+        """
+        self._exec_timeouts[ip] = minutes * 60
+
+    def heartbeat_interval(self, ip: str) -> float:
+        exec_timeout = self._exec_timeouts.get(ip, DEFAULT_EXEC_TIMEOUT_MINUTES * 60)
+        if exec_timeout == 0:
+            exec_timeout = DEFAULT_EXEC_TIMEOUT_MINUTES * 60
+        return exec_timeout * self.heartbeat_margin
+
+    @property
+    def session_count(self) -> int:
+        return sum(len(entries) for entries in self._sessions.values())
+
+    def acquire(self, ip: str, username: str, password: str) -> Session_handler:
+        """
+        Leases a connected session for ip. Reuses an idle warm session when possible,
+        otherwise opens a new one within the per-device and overall limits.
+
+        Raises:
+            RuntimeError: No slot freed up within acquire_timeout, or the login failed
+        """
+        deadline = time.monotonic() + self.acquire_timeout
+        with self._condition:
+            while True:
+                entry = self._take_idle(ip)
+                if entry is not None:
+                    break
+                if self._has_free_slot(ip) or self._evict_one_idle(exclude=ip):
+                    entry = Pooled_session(self.session_factory(ip, username, password))
+                    entry.leased = True
+                    self._sessions.setdefault(ip, []).append(entry)
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise RuntimeError(f"No free SSH session slot for {ip} within {self.acquire_timeout}s.")
+                self._condition.wait(remaining)
+
+        session = entry.session
+        if not session.connection_is_active:
+            status = session.connect()
+            if status != "Connection established":
+                self._discard(ip, entry)
+                raise RuntimeError(f"Could not open SSH session to {ip}: {status}")
+        return session
+
+    def release(self, session: Session_handler, broken: bool = False):
+        """
+        Returns a leased session to the pool. Broken or disconnected sessions are closed instead.
+        """
+        with self._condition:
+            entry = self._find(session)
+            if entry is None:
+                return
+            if broken or not session.connection_is_active:
+                self._remove(session.ip, entry)
+            else:
+                entry.leased = False
+                entry.last_used = entry.last_heartbeat = time.monotonic()
+            self._condition.notify_all()
+        if broken or not session.connection_is_active:
+            session.disconnect()
+
+    @contextmanager
+    def lease(self, ip: str, username: str, password: str):
+        """
+        Context manager around acquire()/release(). A session whose block raised is validated
+        before it goes back into the pool.
+        """
+        session = self.acquire(ip, username, password)
+        broken = False
+        try:
+            yield session
+        except Exception:
+            broken = not session.connection_is_active or not session.validate_connection()
+            raise
+        finally:
+            self.release(session, broken=broken)
+
+    def _take_idle(self, ip: str):
+        for entry in self._sessions.get(ip, []):
+            if not entry.leased:
+                entry.leased = True
+                return entry
+        return None
+
+    def _has_free_slot(self, ip: str) -> bool:
+        return (len(self._sessions.get(ip, [])) < self.max_sessions_per_device
+                and self.session_count < self.max_sessions)
+
+    def _evict_one_idle(self, exclude: str) -> bool:
+        """
+        Makes room under the overall limit by closing the least recently used idle session
+        of another device. Only helps if the per-device limit of 'exclude' is not reached.
+        """
+        if len(self._sessions.get(exclude, [])) >= self.max_sessions_per_device:
+            return False
+        idle = [(entry.last_used, ip, entry) for ip, entries in self._sessions.items() if ip != exclude
+                for entry in entries if not entry.leased]
+        if not idle:
+            return False
+        _, ip, entry = min(idle, key=lambda item: item[0])
+        self._remove(ip, entry)
+        threading.Thread(target=entry.session.disconnect, daemon=True).start()
+        return True
+
+    def _find(self, session: Session_handler):
+        for entry in self._sessions.get(session.ip, []):
+            if entry.session is session:
+                return entry
+        return None
+
+    def _remove(self, ip: str, entry: Pooled_session):
+        entries = self._sessions.get(ip, [])
+        if entry in entries:
+            entries.remove(entry)
+        if not entries:
+            self._sessions.pop(ip, None)
+
+    def _discard(self, ip: str, entry: Pooled_session):
+        with self._condition:
+            self._remove(ip, entry)
+            self._condition.notify_all()
+        entry.session.disconnect()
+
+    def _heartbeat_loop(self):
+        while not self._stop.wait(1.0):
+            self.run_maintenance()
+
+    def run_maintenance(self):
+        """
+        One heartbeat / eviction pass. Idle sessions are taken out of circulation while
+        they are pinged, so no expect() runs under the pool lock.
+        """
+        now = time.monotonic()
+        to_ping, to_close = [], []
+        with self._condition:
+            for ip, entries in list(self._sessions.items()):
+                for entry in list(entries):
+                    if entry.leased:
+                        continue
+                    if now - entry.last_used >= self.idle_timeout:
+                        self._remove(ip, entry)
+                        to_close.append(entry)
+                    elif now - entry.last_heartbeat >= self.heartbeat_interval(ip):
+                        entry.leased = True
+                        to_ping.append(entry)
+            if to_close:
+                self._condition.notify_all()
+
+        for entry in to_close:
+            entry.session.disconnect()
+
+        for entry in to_ping:
+            alive = entry.session.connection_is_active and entry.session.validate_connection()
+            with self._condition:
+                if alive:
+                    entry.leased = False
+                    entry.last_heartbeat = time.monotonic()
+                else:
+                    self._remove(entry.session.ip, entry)
+                self._condition.notify_all()
+            if not alive:
+                entry.session.disconnect()
+
+    def __repr__(self):
+        return f"<Session_pool devices={len(self._sessions)} sessions={self.session_count}>"
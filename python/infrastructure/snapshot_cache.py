@@ -0,0 +1,108 @@
+import hashlib
+import os
+import pickle
+import threading
+import uuid
+
+
+# Part of every key: bump whenever the parser or the pickled domain classes change, so
+# snapshots built by older code are never served for an unchanged config.
+SNAPSHOT_VERSION = 3
+
+
+class Snapshot_cache:
+    def __init__(self, directory: str, max_entries: int = 2000, max_bytes: int = 256 * 1024 * 1024):
+        """
+        On-disk cache of parsed configuration snapshots.
+        Entries are keyed by device IP, SNAPSHOT_VERSION and the SHA-256 of the config text,
+        so an unchanged config maps to the same entry as long as the code that built it is
+        the same. The least recently used entries are evicted once either max_entries or
+        max_bytes is exceeded; the directory is scanned once, then tracked in memory.
+
+        Args:
+            directory (str): Folder holding one pickle file per snapshot
+            max_entries (int): Maximum number of snapshots kept
+            max_bytes (int): Maximum total size of all snapshots on disk
+        """
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._entries = None        # path -> [last use, size], see _index()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def config_hash(config_lines: list) -> str:
+        return hashlib.sha256("\n".join(config_lines).encode("utf-8", errors="replace")).hexdigest()
+
+    def _path(self, ip: str, digest: str) -> str:
+        return os.path.join(self.directory, f"{ip.replace(':', '_')}_v{SNAPSHOT_VERSION}_{digest}.pickle")
+
+    def load(self, ip: str, digest: str):
+        """
+        Returns the cached snapshot for (ip, digest), or None on a miss.
+        A hit refreshes the entry's modification time, which drives LRU eviction.
+        """
+        path = self._path(ip, digest)
+        try:
+            with open(path, "rb") as cache_file:
+                snapshot = pickle.load(cache_file)
+            os.utime(path)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError, TypeError):
+            self.misses += 1
+            return None
+        self.hits += 1
+        with self._lock:
+            if self._entries is not None and path in self._entries:
+                self._entries[path][0] = os.path.getmtime(path)
+        return snapshot
+
+    def store(self, ip: str, digest: str, snapshot):
+        """
+        Writes a snapshot atomically, then evicts old entries if the cache is over its limits.
+        """
+        path = self._path(ip, digest)
+        temp_path = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(temp_path, "wb") as cache_file:
+            pickle.dump(snapshot, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(temp_path, path)
+        stat = os.stat(path)
+        with self._lock:
+            entries = self._index()
+            previous = entries.get(path)
+            self._total_bytes += stat.st_size - (previous[1] if previous else 0)
+            entries[path] = [stat.st_mtime, stat.st_size]
+            self._evict()
+
+    def _index(self) -> dict:
+        """
+        path -> [last use, size] of all snapshots, read from the directory on first use only.
+        Snapshots written by other processes sharing the directory are picked up on restart.
+        """
+        if self._entries is None:
+            self._entries = {}
+            for entry in os.scandir(self.directory):
+                if entry.is_file() and entry.name.endswith(".pickle"):
+                    stat = entry.stat()
+                    self._entries[entry.path] = [stat.st_mtime, stat.st_size]
+            self._total_bytes = sum(size for _, size in self._entries.values())
+        return self._entries
+
+    def _evict(self):
+        entries = self._entries
+        if len(entries) <= self.max_entries and self._total_bytes <= self.max_bytes:
+            return
+        for last_use, path in sorted((last_use, path) for path, (last_use, _) in entries.items()):
+            if len(entries) <= self.max_entries and self._total_bytes <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            self._total_bytes -= entries.pop(path)[1]
+
+    def __repr__(self):
+        return f"<Snapshot_cache dir={self.directory} hits={self.hits} misses={self.misses}>"
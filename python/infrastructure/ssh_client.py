@@ -1,49 +1,165 @@
-import wexpect
+import inspect
 import re
+import threading
+import time
 from functools import wraps
 from datetime import datetime
 
+from infrastructure.config_cleaner import Config_stream_cleaner
+from infrastructure.instrumentation import Metered_child, Metrics_recorder, command_scope
+from infrastructure.prompt import GENERIC_PROMPT, Adaptive_timeout, hostname_from_prompt, prompt_pattern
+from infrastructure.transport import Wexpect_transport
+
+
+def _check_connection(session):
+    if session.cancelled:
+        raise RuntimeError(session.cancelled)
+    if not session.connection_is_active:
+        raise RuntimeError("No active SSH session.")
+
+
+def _locked_iteration(session, generator):
+    with session.lock:
+        yield from generator
+
+
+def exclusive(method):
+    """
+    Decorator running the method under the session lock, so threads sharing one session
+    (e.g. a Lazy_initializer prefetch and an on-demand read) never interleave on the channel.
+    """
+    @wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock:
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 def require_connection(method):
     """
-    Decorator to ensure that the session is active before executing a method.
+    Decorator to ensure that the session is active (and not cancelled) before executing a method.
+    The method runs under the session lock (see exclusive); a generator method holds it until
+    it is exhausted or closed.
     """
+    if inspect.isgeneratorfunction(method):
+        @wraps(method)
+        def generator_wrapper(self, *args, **kwargs):
+            _check_connection(self)
+            return _locked_iteration(self, method(self, *args, **kwargs))
+        return generator_wrapper
+
     @wraps(method)
     def wrapper(self, *args, **kwargs):
-        if not self.connection_is_active:
-            raise RuntimeError("No active SSH session.")
-        return method(self, *args, **kwargs)
+        with self.lock:
+            _check_connection(self)
+            return method(self, *args, **kwargs)
     return wrapper
 
 
+def metered(label):
+    """
+    Decorator recording a Command_record for the method when the session has a Metrics_recorder.
+    label is the command name, or a callable building it from the method arguments.
+    Without a recorder the only cost is one attribute check.
+    """
+    def decorator(method):
+        @wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.metrics is None:
+                return method(self, *args, **kwargs)
+            name = label(*args, **kwargs) if callable(label) else label
+            with self.metrics.command(self.ip, name) as record:
+                previous, self._current_record = self._current_record, record
+                try:
+                    return method(self, *args, **kwargs)
+                finally:
+                    self._current_record = previous
+        return wrapper
+    return decorator
+
+
+class Command_result:
+    def __init__(self, command: str, output: str = "", error: str = None, session_lost: bool = False):
+        """
+        Output of one command sent through Session_handler.send_commands_batch().
+        error holds the switch's '%' message, or a transport problem (EOF / timeout);
+        session_lost tells the two apart, since only the latter is worth a retry.
+        """
+        self.command = command
+        self.output = output
+        self.error = error
+        self.session_lost = session_lost
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+    def __repr__(self):
+        return f"<Command_result command={self.command!r} ok={self.ok}>"
+
+
 class Session_handler:
 
-    def __init__(self, ip: str, username: str, password: str):
+    def __init__(self, ip: str, username: str, password: str, spawn_command: str = None,
+                 metrics: Metrics_recorder = None, transport=None, timeouts: Adaptive_timeout = None,
+                 archive=None):
         """
         Initialize the session handler with device credentials.
+        spawn_command replaces 'ssh <ip>', e.g. to talk to the local CBS250 simulator.
+        metrics enables per-command instrumentation (see infrastructure.instrumentation).
+        transport selects the SSH backend (see infrastructure.transport); wexpect by default.
+        timeouts sizes every read from this device's measured response times (see infrastructure.prompt).
+        archive keeps every config get_config() retrieves (see infrastructure.config_archive).
+
+        Reads end on the device's own prompt ('<hostname>#' at the start of a line, learned at
+        login), so a '#' inside a description or banner never ends an answer early.
         """
+        self.transport = transport or Wexpect_transport()
         self.ip = ip
+        self.spawn_command = spawn_command or f"ssh {ip}"
         self.username = username
         self.password = password
         self.child = None
         self.connection_is_active = False
         self.created_at = datetime.now()
-
+        self.handshake_count = 0
+        self.pagination_disabled = False
+        self.metrics = metrics
+        self._current_record = None
+        self.timeouts = timeouts or Adaptive_timeout()
+        self.hostname = None
+        self.prompt = GENERIC_PROMPT    # regex ending every answer; exact once the hostname is known
+        self.resync_count = 0
+        self.stall_count = 0
+        self.archive = archive
+        self.archive_failures = 0
+        self.cancelled = None           # reason, once cancel() was called
+        self.lock = threading.RLock()   # held for every exchange on the channel
+
+    @exclusive
+    @metered("connect")
     def connect(self) -> str:
         """
-        Establish an SSH session using wexpect.
+        Establish an SSH session through the selected transport.
         Handles known SSH scenarios: key confirmation, connection refused, and bad credentials.
         Returns a status message instead of raising exceptions.
         """
+        if self.cancelled:
+            return f"Not connecting: {self.cancelled}"
         try:
-            self.child = wexpect.spawn(f"ssh {self.ip}", timeout=10)
+            self.handshake_count += 1
+            self.pagination_disabled = False
+            self.child = self.transport.open(self.ip, self.username, self.password, self.spawn_command,
+                                             timeout=self.timeouts.initial)
+            if self.metrics is not None:
+                self.child = Metered_child(self.child, self.transport.TIMEOUT, self)
 
             index = self.child.expect([
                 "The authenticity of host .* can't be established",  # First-time connection
                 "ssh: connect to host .* port .*: Connection refused",  # SSH not enabled
                 "User Name:",  # Normal login flow
-                wexpect.EOF,
-                wexpect.TIMEOUT
+                self.transport.EOF,
+                self.transport.TIMEOUT
             ])
 
             if index == 0:
@@ -68,14 +184,16 @@ class Session_handler:
 
             # After sending password, either we get the CLI prompt or we are asked again for "User Name:"
             index = self.child.expect([
-                "#",             # Successful login
+                GENERIC_PROMPT,  # Successful login
                 "User Name:",    # Wrong credentials
-                wexpect.EOF,
-                wexpect.TIMEOUT
+                self.transport.EOF,
+                self.transport.TIMEOUT
             ])
 
             if index == 0:
+                self._learn_prompt(self.child.after)
                 self.connection_is_active = True
+                self.disable_pagination()
                 return "Connection established"
             elif index == 1:
                 self.disconnect()
@@ -84,10 +202,29 @@ class Session_handler:
                 self.disconnect()
                 return "SSH session failed after login attempt (EOF or Timeout)"
 
+        except ConnectionRefusedError:
+            self.connection_is_active = False
+            return "SSH connection refused (is the SSH server enabled?)"
         except Exception as e:
             self.connection_is_active = False
             return f"Connection failed: {str(e)}"    
 
+    def cancel(self, reason: str = "Session cancelled."):
+        """
+        Stops the session from another thread, e.g. a deadline watchdog.
+
+        Only a flag is set: the thread using the session notices it at its next read step
+        (within one timeout), fails with RuntimeError(reason) and closes the channel itself, and
+        connect() / ensure_connection() refuse to log in again. The channel is never closed
+        under a thread that is still reading from it.
+        """
+        self.cancelled = reason
+
+    def _stop_if_cancelled(self) -> bool:
+        if self.cancelled and self.child is not None:
+            self.disconnect()
+        return bool(self.cancelled)
+
     def disconnect(self):
         """
         Gracefully close the SSH session.
@@ -110,8 +247,13 @@ class Session_handler:
         str: The model name (e.g., 'CBS250-8T-E-2G') if found, otherwise 'Unknown'.
         """
 
-        output = self.send_command_read_answer("show system")
+        return self.parse_model_name(self.send_command_read_answer("show system"))
 
+    @staticmethod
+    def parse_model_name(output: str) -> str:
+        """
+        Extracts the model name from 'show system' output, or returns 'Unknown'.
+        """
         # Try to extract from 'System Description'
         match = re.search(r"System Description:\s+(CBS\d{3,4}-[A-Z0-9\-]+)", output)
         if match:
@@ -136,6 +278,167 @@ class Session_handler:
             pass
         self.connect()
 
+    @exclusive
+    def ensure_connection(self) -> bool:
+        """
+        Makes sure the session can take the next command.
+        Reuses the live session whenever validate_connection() succeeds and only
+        falls back to a full reconnect when it actually fails.
+
+        Returns:
+            bool: True if a usable session is available afterwards
+        """
+        if self.cancelled:
+            return False
+        if not self.connection_is_active:
+            return self.connect() == "Connection established"
+        if self.validate_connection():
+            self._drain_pending_output()
+            return True
+        self._quetly_reset_connection()
+        return self.connection_is_active
+
+    @require_connection
+    def disable_pagination(self) -> bool:
+        """
+        Sends 'terminal datadump' so long outputs arrive without "More: <space>" pages.
+        The setting lives as long as the SSH session, so it is repeated after every login.
+        """
+        try:
+            self.send_command_read_answer("terminal datadump")
+            self.pagination_disabled = True
+        except Exception:
+            self.pagination_disabled = False
+        return self.pagination_disabled
+
+    def _drain_pending_output(self):
+        """
+        Consumes prompts already sitting in the buffer (e.g. from earlier blank lines) without
+        waiting for more. Stray prompts that arrive later are harmless: every read first syncs
+        on the echo of its own command.
+        """
+        try:
+            while self.child.expect([self.prompt, self.transport.TIMEOUT], timeout=0) == 0:
+                pass
+        except Exception:
+            pass
+
+    def _learn_prompt(self, matched_prompt):
+        """
+        Anchors all further reads to the exact prompt of this device, e.g. 'switch01#'.
+        """
+        if isinstance(matched_prompt, bytes):
+            matched_prompt = matched_prompt.decode(errors="ignore")
+        hostname = hostname_from_prompt(matched_prompt) if isinstance(matched_prompt, str) else None
+        if hostname is not None:
+            self.hostname = hostname
+            self.prompt = prompt_pattern(hostname)
+
+    def _wait_for_echo(self, command: str, timeout: float = None) -> bool:
+        """
+        Waits for the switch to echo command. Anything before the echo (stray prompts) is skipped.
+        """
+        if self._stop_if_cancelled():
+            return False
+        started = time.perf_counter()
+        index = self.child.expect([re.escape(command), self.transport.EOF, self.transport.TIMEOUT],
+                                  timeout=timeout or self.timeouts.value)
+        if index == 0:
+            self.timeouts.observe(time.perf_counter() - started)
+            return True
+        if index == 2 and not self.cancelled and self._resync():
+            return False
+        self._give_up()
+        return False
+
+    def _iter_answer(self, timeout: float = None):
+        """
+        Yields the output of the command whose echo was just read, chunk by chunk, up to the
+        device prompt, and answers "More: <space>" pages on the way.
+
+        Every wait is bounded by the adaptive timeout, but only silence counts: as long as
+        output keeps arriving the read goes on. After one silent timeout an empty line is sent
+        as a probe and the read gets one more timeout; if the switch still says nothing the
+        session is closed, so a hung switch fails within about two timeouts and later commands
+        fail at once instead of each waiting the full timeout.
+
+        Args:
+            timeout (float): Fixed silence timeout instead of the adaptive one
+
+        Returns (as the generator's return value):
+            str: 'prompt' when the answer is complete, otherwise 'eof', 'timeout' or 'cancelled'
+        """
+        patterns = [self.prompt, "More: <space>", self.transport.EOF, self.transport.TIMEOUT]
+        probed = False
+        waiting_since = time.perf_counter()
+        received = 0
+        while True:
+            if self._stop_if_cancelled():
+                return "cancelled"
+            index = self.child.expect(patterns, timeout=timeout or self.timeouts.value)
+            if index == 3:
+                pending = len(self.child.before or "")
+                if pending > received:
+                    received = pending      # still receiving: not a stall
+                    continue
+                if probed:
+                    self._give_up()
+                    return "timeout"
+                probed = True
+                self.resync_count += 1
+                self.timeouts.backoff()
+                self.child.sendline("")     # probe: a live CLI answers with a prompt
+                continue
+
+            self.timeouts.observe(time.perf_counter() - waiting_since)
+            yield self.child.before
+            if index == 0:
+                return "prompt"
+            if index == 1:
+                self.child.send(" ")  # Pagination is still on
+                waiting_since, received = time.perf_counter(), 0
+                continue
+            self._give_up()
+            return "eof"
+
+    def _read_answer(self, timeout: float = None) -> tuple[str, str]:
+        """
+        Complete output of _iter_answer() and its outcome ('prompt', 'eof' or 'timeout').
+        """
+        chunks = []
+        reader = self._iter_answer(timeout)
+        while True:
+            try:
+                chunks.append(next(reader))
+            except StopIteration as stop:
+                return "".join(chunks), stop.value
+
+    def _resync(self) -> bool:
+        """
+        One attempt to get back in step: sends an empty line and waits for any prompt, then drops
+        whatever is still buffered. The prompt is relearned, in case the hostname was changed.
+        """
+        self.resync_count += 1
+        self.timeouts.backoff()
+        try:
+            self.child.sendline("")
+            if self.child.expect([GENERIC_PROMPT, self.transport.EOF, self.transport.TIMEOUT],
+                                 timeout=self.timeouts.value) != 0:
+                return False
+            self._learn_prompt(self.child.after)
+            self._drain_pending_output()
+            return True
+        except Exception:
+            return False
+
+    def _give_up(self):
+        """
+        Closes a session that stopped answering, so the next command reconnects (ensure_connection)
+        or fails at once with 'No active SSH session.'.
+        """
+        self.stall_count += 1
+        self.disconnect()
+
     @require_connection
     def get_config(self, which: str) -> list:
         """
@@ -147,6 +450,35 @@ class Session_handler:
         Returns:
             list: Cleaned configuration lines
         """
+        lines = list(self.iter_config(which))
+        self.archive_config(which, lines)
+        return lines
+
+    def archive_config(self, which: str, lines: list):
+        """
+        Hands a retrieved configuration to the session's Config_archive, if it has one.
+        A failing archive never fails the read; archive_failures counts those.
+        """
+        if self.archive is None:
+            return
+        try:
+            self.archive.archive(self.ip, which, lines)
+        except Exception:
+            self.archive_failures += 1
+
+    @require_connection
+    def iter_config(self, which: str):
+        """
+        Streaming variant of get_config().
+        Yields cleaned configuration lines page by page while the "More: <space>" pages arrive,
+        producing exactly the same lines as get_config().
+
+        Args:
+            which (str): 'running' or 'startup'
+
+        Yields:
+            str: Cleaned configuration lines
+        """
         if which == "running":
             command = "show running-config"
         elif which == "startup":
@@ -154,114 +486,188 @@ class Session_handler:
         else:
             raise ValueError("Invalid config type. Use 'running' or 'startup'.")
 
-        self.child.sendline(command)
-        self.child.expect(command)  # flush echo
-
-        full_output = ""
-        while True:
-            index = self.child.expect(["More: <space>", "#", wexpect.EOF, wexpect.TIMEOUT], timeout=10)
-            full_output += self.child.before
-            if index == 0:
-                self.child.send(" ")  # Respond to pagination
-            elif index == 1:
-                full_output += self.child.before
-                break
-            else:
-                break
-
-        # Clean and parse output
-        outputlines = []
-        word_to_copy = ""
-
-        full_output = re.sub(r',?\s*Quit: q or CTRL\+Z, One line: <return> *\r?!?', '', full_output)
-        full_output = full_output.replace('\r\n', '\n').replace('\r', '\n')
-        full_output = re.sub(r'(privilege \d+)(username )', r'\1\n\2', full_output)
-        full_output = re.sub(r'(privilege \d+)\s*(ip ssh server)', r'\1\n\2', full_output)
-
-        i = 0
-        while i < len(full_output):
-            char = full_output[i]
-            if char == '\n' or (char == ' ' and i + 1 < len(full_output) and full_output[i + 1] == ' '):
-                cleaned = word_to_copy.strip()
-                if cleaned.lower() not in ["exit", "!"] and cleaned:
-                    outputlines.append(cleaned)
-                word_to_copy = ""
-                while i + 1 < len(full_output) and full_output[i + 1] == ' ':
-                    i += 1
-            else:
-                word_to_copy += char
-            i += 1
-
-        # Final flush
-        cleaned = word_to_copy.strip()
-        if cleaned.lower() not in ["exit", "!"] and cleaned:
-            outputlines.append(cleaned)
-
-        return outputlines
+        with command_scope(self.metrics, self.ip, command) as record:
+            previous, self._current_record = self._current_record, record
+            try:
+                self.child.sendline(command)
+                if not self._wait_for_echo(command):
+                    raise RuntimeError(self.cancelled or f"No echo of '{command}' (EOF or Timeout).")
+
+                cleaner = Config_stream_cleaner()
+                reader = self._iter_answer()
+                while True:
+                    try:
+                        chunk = next(reader)
+                    except StopIteration as stop:
+                        outcome = stop.value
+                        break
+                    yield from cleaner.feed(chunk)
+                if outcome != "prompt":
+                    raise RuntimeError(self.cancelled or f"Session lost (EOF or Timeout) while reading '{command}'.")
+
+                yield from cleaner.close()
+            finally:
+                self._current_record = previous
     
     @require_connection
     def get_both_configs(self) -> tuple[list, list]:
         """
-        Retrieve both running and startup configurations.
+        Retrieve both running and startup configurations over the same SSH session.
         Useful for external comparison logic.
         
         Returns:
             Tuple of two lists: (running_config, startup_config)
         """
         running_config = self.get_config("running")
-        self._quetly_reset_connection()
+        if not self.ensure_connection():
+            raise RuntimeError("No active SSH session.")
         startup_config = self.get_config("startup")
         return running_config, startup_config
 
     @require_connection
+    @metered(lambda command: command)
     def send_command_read_answer(self, command: str) -> str:
         """
         Send a command and return the resulting output.
+
+        Raises:
+            RuntimeError: The switch stopped answering; the session has been closed
         """
         self.child.sendline(command)
-        self.child.expect(command)
-        self.child.expect(["#", wexpect.EOF, wexpect.TIMEOUT])
-        return self.child.before.strip()
+        if not self._wait_for_echo(command):
+            raise RuntimeError(self.cancelled or f"No echo of '{command}' (EOF or Timeout).")
+        output, outcome = self._read_answer()
+        if outcome != "prompt":
+            raise RuntimeError(self.cancelled or f"Session lost (EOF or Timeout) while reading '{command}'.")
+        return output.strip()
 
     @require_connection
+    def send_commands_batch(self, commands: list[str], timeout: float = None) -> list[Command_result]:
+        """
+        Pipelines several show commands: all of them are written in one go, then the stream
+        is split back into per-command outputs on the echo of each command and the prompt
+        that follows its output. Costs about one round trip instead of one per command.
+
+        Errors are reported per command: a switch error line ('% ...') marks only that command,
+        while EOF or a timeout marks the command being read and every command after it.
+
+        Pipelining needs 'terminal datadump': with pagination on, the queued commands would be
+        typed into the first "More: <space>" page. Unless disable_pagination() succeeded on this
+        session, the commands are therefore sent one at a time, each after the previous
+        answer (same results, one round trip per command).
+
+        With a Metrics_recorder every command gets its own record, timed from the end of the
+        previous answer to the end of its own, so the records of a batch add up to its wall time.
+
+        Args:
+            timeout (float): Fixed silence timeout per read; by default the device's adaptive timeout
+
+        Returns:
+            list[Command_result]: One result per command, in the order given
+        """
+        pipelined = self.pagination_disabled
+        if pipelined:
+            try:
+                for command in commands:
+                    self.child.sendline(command)
+            except self.transport.EOF:
+                return [Command_result(command, error=self.cancelled or "Session lost (EOF) while sending the batch.",
+                                       session_lost=True) for command in commands]
+
+        results = []
+        for position, command in enumerate(commands):
+            result = Command_result(command)
+            results.append(result)
+
+            output, outcome = self._read_batch_answer(command, not pipelined, timeout)
+            if outcome != "prompt":
+                result.error = self.cancelled or "Session lost (EOF or Timeout) while reading the answer."
+                result.session_lost = True
+                for remaining in commands[position + 1:]:
+                    results.append(Command_result(remaining, error="Not executed: an earlier command in the batch failed.",
+                                                  session_lost=True))
+                break
+
+            result.output = output.strip()
+            error_line = re.search(r"^\s*(%.*)$", result.output, re.MULTILINE)
+            if error_line:
+                result.error = error_line.group(1).strip()
+
+        return results
+
+    def _read_batch_answer(self, command: str, send: bool, timeout: float = None) -> tuple[str, str]:
+        """
+        Reads one command's answer inside send_commands_batch() (sending it first unless it was
+        pipelined), as its own Command_record when metrics are on.
+        """
+        with command_scope(self.metrics, self.ip, command) as record:
+            previous, self._current_record = self._current_record, record
+            try:
+                if send and self.connection_is_active:
+                    try:
+                        self.child.sendline(command)
+                    except self.transport.EOF:
+                        return "", None
+                if self.connection_is_active and self._wait_for_echo(command, timeout):
+                    return self._read_answer(timeout)
+                return "", None
+            finally:
+                self._current_record = previous
+
+    def send_config_batch(self, commands: list[str], timeout: float = None) -> list[Command_result]:
+        """
+        Applies config commands in one config session: 'configure terminal', the commands
+        and a single 'end' are pipelined like send_commands_batch, so the whole change costs
+        about one round trip. The switch keeps executing after a failing command, so errors
+        are reported per command and the caller decides what to verify or roll back.
+
+        Args:
+            commands (list[str]): Commands below 'configure terminal', e.g. from Command_builder.build()
+
+        Returns:
+            list[Command_result]: One result per command, without the 'configure terminal' / 'end' frame
+                unless one of those failed
+        """
+        results = self.send_commands_batch(["configure terminal", *commands, "end"], timeout=timeout)
+        frame_errors = [result for result in (results[0], results[-1]) if not result.ok]
+        return results[1:-1] + frame_errors
+
+    @require_connection
+    @metered(lambda command: command)
     def send_command(self, command: str):
         """
         Send a command and wait for it to be echoed.
         This ensures CLI is ready for next input.
         """
         self.child.sendline(command)
-        self.child.expect(command)  # Just sync on echo
+        if not self._wait_for_echo(command):  # Just sync on echo
+            raise RuntimeError(self.cancelled or f"No echo of '{command}' (EOF or Timeout).")
 
     @require_connection
+    @metered("end")
     def send_end(self):
         """
         Send 'end' command to exit config mode.
         Only waits for echo.
         """
         self.child.sendline("end")
-        self.child.expect("end")
+        if not self._wait_for_echo("end"):
+            raise RuntimeError(self.cancelled or "No echo of 'end' (EOF or Timeout).")
     
     @require_connection
+    @metered("validate_connection")
     def validate_connection(self) -> bool:
         """
         Checks if the SSH session is still synchronized with the switch prompt.
 
         Returns:
-            bool: True if prompt ends with '#', otherwise False
+            bool: True if the device's privileged prompt ('<hostname>#') answers within the adaptive timeout
         """
         try:
             self.child.sendline("")  # Trigger prompt
-            index = self.child.expect([r"[>#]"], timeout=2)
-            print(f"Matched index: {index}")
-            
-            output = self.child.before.strip()
-            
-
-            matched_prompt = self.child.after
-            if isinstance(matched_prompt, bytes):
-                matched_prompt = matched_prompt.decode(errors="ignore")
-            return matched_prompt.endswith("#")
-        except Exception as e:
+            return self.child.expect([self.prompt, self.transport.EOF, self.transport.TIMEOUT],
+                                     timeout=self.timeouts.value) == 0
+        except Exception:
             return False
 
     @require_connection
@@ -270,8 +676,13 @@ class Session_handler:
         Parses 'show interfaces status' output into a structured dictionary.
         Fixes spacing issues in 'Disabled On' and similar cases.
         """
-        raw = self.send_command_read_answer("show interfaces status")
+        return self.parse_interfaces_status(self.send_command_read_answer("show interfaces status"))
 
+    @staticmethod
+    def parse_interfaces_status(raw: str) -> dict:
+        """
+        Turns raw 'show interfaces status' output into the dictionary returned by get_interfaces_status().
+        """
         # Insert line breaks before each interface
         raw = re.sub(r"\s+(gi\d{1,2})", r"\n\1", raw)
         raw = re.sub(r"\s+(Po\d{1,2})", r"\n\1", raw)
@@ -0,0 +1,282 @@
+import hashlib
+import json
+import sqlite3
+import time
+import uuid
+from contextlib import contextmanager
+
+try:
+    import psycopg
+except ImportError:  # only needed for the PostgreSQL backend
+    psycopg = None
+
+from infrastructure.snapshot_cache import Snapshot_cache
+
+
+SCHEMA = (
+    """CREATE TABLE IF NOT EXISTS runs (
+        run_id TEXT PRIMARY KEY,
+        started_at DOUBLE PRECISION,
+        finished_at DOUBLE PRECISION,
+        devices INTEGER)""",
+    """CREATE TABLE IF NOT EXISTS config_snapshots (
+        ip TEXT,
+        digest TEXT,
+        config TEXT,
+        PRIMARY KEY (ip, digest))""",
+    """CREATE TABLE IF NOT EXISTS device_runs (
+        run_id TEXT,
+        ip TEXT,
+        model_name TEXT,
+        running_digest TEXT,
+        startup_digest TEXT,
+        PRIMARY KEY (run_id, ip))""",
+    """CREATE TABLE IF NOT EXISTS interface_settings (
+        ip TEXT,
+        interface TEXT,
+        digest TEXT,
+        run_id TEXT,
+        settings TEXT,
+        PRIMARY KEY (ip, interface, run_id))""",
+    """CREATE TABLE IF NOT EXISTS status_samples (
+        run_id TEXT,
+        ip TEXT,
+        interface TEXT,
+        sampled_at DOUBLE PRECISION,
+        type TEXT, duplex TEXT, speed TEXT, negotiation TEXT, flow_ctrl TEXT,
+        link_state TEXT, back_pressure TEXT, mdix_mode TEXT)""",
+    """CREATE TABLE IF NOT EXISTS latest_digests (
+        ip TEXT,
+        category TEXT,
+        item TEXT,
+        digest TEXT,
+        PRIMARY KEY (ip, category, item))""",
+)
+
+STATUS_FIELDS = ("type", "duplex", "speed", "negotiation", "flow_ctrl", "link_state", "back_pressure", "mdix_mode")
+
+
+class Sqlite_backend:
+    placeholder = "?"
+
+    def __init__(self, path: str = ":memory:"):
+        """
+        Local SQLite backend, e.g. for tests and single-user installs.
+        round_trips counts every statement sent to the database.
+        """
+        self.path = path
+        self.connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self.max_parameters = self.connection.getlimit(sqlite3.SQLITE_LIMIT_VARIABLE_NUMBER)
+        self.round_trips = 0
+
+    def execute(self, sql: str, parameters=()) -> list:
+        self.round_trips += 1
+        return self.connection.execute(sql, parameters).fetchall()
+
+    def close(self):
+        self.connection.close()
+
+    def __repr__(self):
+        return f"<Sqlite_backend {self.path} round_trips={self.round_trips}>"
+
+
+class Postgres_backend:
+    placeholder = "%s"
+    max_parameters = 65535   # protocol limit of bind parameters per statement
+
+    def __init__(self, dsn: str):
+        """
+        PostgreSQL backend (psycopg 3). Same SQL as SQLite apart from the placeholder style.
+        """
+        if psycopg is None:
+            raise RuntimeError("psycopg is not installed.")
+        self.dsn = dsn
+        self.connection = psycopg.connect(dsn, autocommit=True)
+        self.round_trips = 0
+
+    def execute(self, sql: str, parameters=()) -> list:
+        self.round_trips += 1
+        with self.connection.cursor() as cursor:
+            cursor.execute(sql, parameters)
+            return cursor.fetchall() if cursor.description else []
+
+    def close(self):
+        self.connection.close()
+
+    def __repr__(self):
+        return f"<Postgres_backend round_trips={self.round_trips}>"
+
+
+def _digest(text: str) -> str:
+    return hashlib.blake2b(text.encode("utf-8", errors="replace"), digest_size=16).hexdigest()
+
+
+class Sql_store:
+    def __init__(self, backend, schema: tuple):
+        """
+        Common base of the stores: creates the schema and provides transactions and batched
+        multi-row INSERTs on any backend.
+
+        Args:
+            backend: Sqlite_backend or Postgres_backend (anything with execute(), placeholder
+                and max_parameters)
+            schema (tuple): CREATE TABLE IF NOT EXISTS statements
+        """
+        self.backend = backend
+        for statement in schema:
+            self.backend.execute(statement)
+
+    @contextmanager
+    def transaction(self):
+        self.backend.execute("BEGIN")
+        try:
+            yield
+        except BaseException:
+            self.backend.execute("ROLLBACK")
+            raise
+        self.backend.execute("COMMIT")
+
+    def insert_rows(self, table: str, columns: tuple, rows: list, on_conflict: str = ""):
+        """
+        Multi-row INSERT, split only where the backend's bind parameter limit requires it.
+        """
+        if not rows:
+            return
+        row_placeholders = "(" + ", ".join([self.backend.placeholder] * len(columns)) + ")"
+        rows_per_statement = max(1, self.backend.max_parameters // len(columns))
+        for start in range(0, len(rows), rows_per_statement):
+            chunk = rows[start:start + rows_per_statement]
+            sql = (f"INSERT INTO {table} ({', '.join(columns)}) VALUES "
+                   f"{', '.join([row_placeholders] * len(chunk))} {on_conflict}")
+            self.backend.execute(sql, [value for row in chunk for value in row])
+
+    def in_chunks(self, values: list, extra_parameters: int = 0):
+        """
+        Splits values for 'IN (...)' lists that fit the backend's bind parameter limit.
+        """
+        chunk_size = max(1, self.backend.max_parameters - extra_parameters)
+        for start in range(0, len(values), chunk_size):
+            yield values[start:start + chunk_size]
+
+
+class Snapshot_store(Sql_store):
+    def __init__(self, backend):
+        """
+        Persists Initializer results: config snapshots, interface settings and status samples.
+
+        Writes are batched: one transaction per fleet run, multi-row INSERTs sized to the
+        backend's parameter limit, and unchanged rows are skipped by comparing against the
+        latest digest per (device, item), which is read with one query per run. Recording a
+        run therefore costs a fixed handful of round trips instead of one per interface.
+
+        Args:
+            backend: Sqlite_backend or Postgres_backend (anything with execute(), placeholder
+                and max_parameters)
+        """
+        super().__init__(backend, SCHEMA)
+
+    def _latest_digests(self, ips: list) -> dict:
+        """
+        (ip, category, item) -> digest for all given devices.
+        """
+        latest = {}
+        for chunk in self.in_chunks(ips):
+            sql = (f"SELECT ip, category, item, digest FROM latest_digests WHERE ip IN "
+                   f"({', '.join([self.backend.placeholder] * len(chunk))})")
+            for ip, category, item, digest in self.backend.execute(sql, chunk):
+                latest[(ip, category, item)] = digest
+        return latest
+
+    def record_fleet(self, fleet_result) -> str:
+        """
+        Records every successfully initialized device of a Fleet_result in one transaction.
+        """
+        return self.record_devices({result.ip: result.initializer for result in fleet_result.succeeded})
+
+    def record_devices(self, initializers: dict, started_at: float = None) -> str:
+        """
+        Records ip -> Initializer results as one run.
+
+        Returns:
+            str: run_id of the new run
+        """
+        run_id = uuid.uuid4().hex
+        started_at = started_at or time.time()
+        sampled_at = time.time()
+
+        with self.transaction():
+            latest = self._latest_digests(list(initializers))
+            configs, device_runs, settings, samples, changed = [], [], [], [], []
+            new_configs = set()
+
+            for ip, initializer in initializers.items():
+                digests = []
+                for which, lines in (("running", initializer.running_config), ("startup", initializer.startup_config)):
+                    digest = Snapshot_cache.config_hash(lines)
+                    digests.append(digest)
+                    if latest.get((ip, "config", which)) != digest:
+                        changed.append((ip, "config", which, digest))
+                        if (ip, digest) not in new_configs:  # startup often equals running
+                            new_configs.add((ip, digest))
+                            configs.append((ip, digest, "\n".join(lines)))
+                device_runs.append((run_id, ip, initializer.model_name, digests[0], digests[1]))
+
+                for name, settings_obj in initializer.physical_interfaces_settings_objects.items():
+                    serialized = json.dumps(settings_obj.as_dict(), sort_keys=True)
+                    digest = _digest(serialized)
+                    if latest.get((ip, "settings", name)) != digest:
+                        changed.append((ip, "settings", name, digest))
+                        settings.append((ip, name, digest, run_id, serialized))
+
+                for name, status_obj in initializer.interfaces_current_status_objects.items():
+                    values = tuple(getattr(status_obj, field) for field in STATUS_FIELDS)
+                    digest = _digest("\x1f".join(str(value) for value in values))
+                    if latest.get((ip, "status", name)) != digest:
+                        changed.append((ip, "status", name, digest))
+                        samples.append((run_id, ip, name, sampled_at) + values)
+
+            self.insert_rows("runs", ("run_id", "started_at", "finished_at", "devices"),
+                             [(run_id, started_at, time.time(), len(initializers))])
+            self.insert_rows("config_snapshots", ("ip", "digest", "config"), configs,
+                             "ON CONFLICT (ip, digest) DO NOTHING")
+            self.insert_rows("device_runs", ("run_id", "ip", "model_name", "running_digest", "startup_digest"),
+                             device_runs)
+            self.insert_rows("interface_settings", ("ip", "interface", "digest", "run_id", "settings"), settings)
+            self.insert_rows("status_samples", ("run_id", "ip", "interface", "sampled_at") + STATUS_FIELDS, samples)
+            self.insert_rows("latest_digests", ("ip", "category", "item", "digest"), changed,
+                             "ON CONFLICT (ip, category, item) DO UPDATE SET digest = excluded.digest")
+        return run_id
+
+    def load_config(self, ip: str, digest: str) -> list:
+        """
+        Config lines of a stored snapshot, or None.
+        """
+        rows = self.backend.execute(
+            f"SELECT config FROM config_snapshots WHERE ip = {self.backend.placeholder} "
+            f"AND digest = {self.backend.placeholder}", (ip, digest))
+        return rows[0][0].split("\n") if rows else None
+
+    def interface_history(self, ip: str, interface: str) -> list:
+        """
+        Every settings change of one interface, oldest first: [(run_id, started_at, settings dict)].
+        A row is stored per run that changed the settings, so a return to an earlier state
+        (A -> B -> A) shows up as its own entry.
+        """
+        rows = self.backend.execute(
+            f"SELECT interface_settings.run_id, started_at, settings FROM interface_settings "
+            f"JOIN runs ON runs.run_id = interface_settings.run_id WHERE ip = {self.backend.placeholder} "
+            f"AND interface = {self.backend.placeholder} ORDER BY started_at", (ip, interface))
+        return [(run_id, started_at, json.loads(settings)) for run_id, started_at, settings in rows]
+
+    def latest_run(self, ip: str):
+        """
+        (run_id, model_name, running_digest, startup_digest) of the newest run that recorded ip, or None.
+        """
+        rows = self.backend.execute(
+            f"SELECT device_runs.run_id, model_name, running_digest, startup_digest FROM device_runs "
+            f"JOIN runs ON runs.run_id = device_runs.run_id WHERE ip = {self.backend.placeholder} "
+            f"ORDER BY runs.started_at DESC LIMIT 1", (ip,))
+        return rows[0] if rows else None
+
+    def __repr__(self):
+        return f"<Snapshot_store {self.backend!r}>"
@@ -0,0 +1,250 @@
+import asyncio
+import re
+import socket
+import time
+from collections import deque
+
+
+# RFC 3164 priority, then the CBS250 '%FACILITY-SEVERITY-MNEMONIC: text' part anywhere in the line
+_PRIORITY = re.compile(r"^<(\d{1,3})>")
+_CBS_MESSAGE = re.compile(r"%([A-Z0-9_]+)-([A-Z])-([A-Za-z0-9_]+):\s*(.*)")
+_INTERFACE = re.compile(r"\b(gi|te|fa|Po)(\d+)(?:/\d+/(\d+))?\b")
+
+
+class Syslog_message:
+    __slots__ = ("received_at", "ip", "priority", "facility", "severity", "mnemonic", "text")
+
+    def __init__(self, received_at: float, ip: str, priority: int, facility: str, severity: str,
+                 mnemonic: str, text: str):
+        """
+        One parsed syslog datagram. facility / severity / mnemonic are the CBS250
+        '%LINK-W-Down:' parts, or None for messages without them.
+        """
+        self.received_at = received_at
+        self.ip = ip
+        self.priority = priority
+        self.facility = facility
+        self.severity = severity
+        self.mnemonic = mnemonic
+        self.text = text
+
+    def __repr__(self):
+        return f"<Syslog_message {self.ip} %{self.facility}-{self.severity}-{self.mnemonic}: {self.text!r}>"
+
+
+class Syslog_event:
+    def __init__(self, ip: str, kind: str, interface: str, message: Syslog_message):
+        """
+        A message the application reacts to, mapped to its device and interface.
+
+        Args:
+            kind (str): 'link_up', 'link_down' or 'config_change'
+            interface (str): Interface name as used by Initializer ('gi5'), or None
+        """
+        self.ip = ip
+        self.kind = kind
+        self.interface = interface
+        self.message = message
+
+    def __repr__(self):
+        return f"<Syslog_event {self.ip} {self.kind} {self.interface}>"
+
+
+class Device_rate:
+    __slots__ = ("count", "rate", "last_seen")
+
+    def __init__(self):
+        """
+        Message counter of one device plus an exponentially weighted messages-per-second rate.
+        """
+        self.count = 0
+        self.rate = 0.0
+        self.last_seen = 0.0
+
+    def __repr__(self):
+        return f"<Device_rate count={self.count} rate={self.rate:.1f}/s>"
+
+
+class Syslog_receiver:
+    # (facility, mnemonic) -> event kind
+    EVENT_KINDS = {
+        ("LINK", "Up"): "link_up",
+        ("LINK", "Down"): "link_down",
+        ("COPY", "TRAP"): "config_change",
+        ("COPY", "FILECPY"): "config_change",
+    }
+
+    def __init__(self, host: str = "0.0.0.0", port: int = 514, buffer_size: int = 65536,
+                 max_pending: int = 65536, batch_size: int = 1024, rate_window: float = 10.0,
+                 receive_buffer_bytes: int = 4 * 1024 * 1024):
+        """
+        asyncio UDP syslog server for the CBS250 fleet.
+
+        When the socket becomes readable it is drained with up to batch_size recvfrom() calls
+        and the raw datagrams are queued; parsing runs in batches of batch_size scheduled on
+        the event loop. A burst therefore costs one loop callback per batch rather than one per
+        message (asyncio's datagram transport reads a single datagram per loop iteration).
+        Parsed messages go into a bounded ring buffer (the oldest are overwritten and counted).
+        If parsing falls behind by more than max_pending datagrams, new ones are dropped and
+        counted instead of growing memory without bound.
+
+        Recognised link up/down and config-copy messages become Syslog_events for the
+        listeners, which can then refresh just the affected interface or config instead of
+        re-running Initializer.initialize(): Status_poller.on_syslog_events polls the device
+        on link events, Lazy_initializer.on_syslog_events drops its cached configs on
+        config_change.
+
+        Args:
+            host (str): Address to listen on
+            port (int): UDP port, 0 picks a free one (see self.port after start())
+            buffer_size (int): Capacity of the ring buffer of parsed messages
+            max_pending (int): Unparsed datagrams accepted before new ones are dropped
+            batch_size (int): Datagrams parsed per event loop callback
+            rate_window (float): Time constant (seconds) of the per-device rate average
+            receive_buffer_bytes (int): Requested SO_RCVBUF, so the kernel can hold a burst while a batch is parsed
+        """
+        self.host = host
+        self.port = port
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.rate_window = rate_window
+        self.receive_buffer_bytes = receive_buffer_bytes
+        self.messages = deque(maxlen=buffer_size)
+        self.device_rates = {}      # ip -> Device_rate
+        self.listeners = []
+
+        self.received = 0
+        self.parsed = 0
+        self.dropped = 0            # rejected because parsing fell behind
+        self.overwritten = 0        # pushed out of the full ring buffer
+
+        self._pending = deque()
+        self._scheduled = False
+        self._loop = None
+        self._socket = None
+
+    def add_listener(self, callback):
+        """
+        Registers callback(list[Syslog_event]); called on the event loop once per batch with events.
+        """
+        self.listeners.append(callback)
+
+    async def start(self):
+        self._loop = asyncio.get_running_loop()
+        family = socket.AF_INET6 if ":" in self.host else socket.AF_INET
+        self._socket = socket.socket(family, socket.SOCK_DGRAM)
+        try:
+            self._socket.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, self.receive_buffer_bytes)
+        except OSError:
+            pass  # keep the system default
+        self._socket.bind((self.host, self.port))
+        self._socket.setblocking(False)
+        self.port = self._socket.getsockname()[1]
+        self._loop.add_reader(self._socket.fileno(), self._on_readable)
+
+    def close(self):
+        if self._socket is not None:
+            self._loop.remove_reader(self._socket.fileno())
+            self._socket.close()
+            self._socket = None
+
+    def _on_readable(self):
+        """
+        Drains up to batch_size datagrams per wake-up; the rest wait for the next loop iteration.
+        """
+        receive = self._socket.recvfrom
+        pending = self._pending
+        now = time.time()
+        received = 0
+        for _ in range(self.batch_size):
+            try:
+                data, address = receive(65535)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError:
+                break
+            received += 1
+            if len(pending) >= self.max_pending:
+                self.dropped += 1
+                continue
+            pending.append((now, address[0], data))
+        self.received += received
+        if pending and not self._scheduled:
+            self._scheduled = True
+            self._loop.call_soon(self._process_batch)
+
+    def _process_batch(self):
+        """
+        Parses up to batch_size pending datagrams and hands their events to the listeners.
+        Reschedules itself while work is left, so other loop callbacks (receiving) interleave.
+        """
+        pending = self._pending
+        batch = [pending.popleft() for _ in range(min(self.batch_size, len(pending)))]
+        if pending:
+            self._loop.call_soon(self._process_batch)
+        else:
+            self._scheduled = False
+
+        events = []
+        counts = {}
+        messages = self.messages
+        overflow = max(0, len(messages) + len(batch) - messages.maxlen)
+        for received_at, ip, data in batch:
+            message = self.parse(received_at, ip, data)
+            messages.append(message)
+            counts[ip] = counts.get(ip, 0) + 1
+            kind = self.EVENT_KINDS.get((message.facility, message.mnemonic))
+            if kind is not None:
+                events.append(Syslog_event(ip, kind, self.interface_name(message.text), message))
+        self.parsed += len(batch)
+        self.overwritten += overflow
+        self._update_rates(counts)
+
+        if events:
+            for listener in self.listeners:
+                listener(events)
+
+    @staticmethod
+    def parse(received_at: float, ip: str, data: bytes) -> Syslog_message:
+        text = data.decode("utf-8", errors="replace").strip()
+        priority = None
+        match = _PRIORITY.match(text)
+        if match:
+            priority = int(match.group(1))
+        match = _CBS_MESSAGE.search(text)
+        if match is None:
+            return Syslog_message(received_at, ip, priority, None, None, None, text)
+        facility, severity, mnemonic, rest = match.groups()
+        return Syslog_message(received_at, ip, priority, facility, severity, mnemonic, rest)
+
+    @staticmethod
+    def interface_name(text: str):
+        """
+        Interface of a message in the naming used by Initializer: 'gi1/0/5' and 'gi5' both give 'gi5'.
+        """
+        match = _INTERFACE.search(text)
+        if match is None:
+            return None
+        prefix, first, port = match.groups()
+        return f"{prefix}{port or first}"
+
+    def _update_rates(self, counts: dict):
+        now = time.monotonic()
+        for ip, count in counts.items():
+            device_rate = self.device_rates.get(ip)
+            if device_rate is None:
+                device_rate = self.device_rates[ip] = Device_rate()
+                device_rate.last_seen = now
+            elapsed = max(now - device_rate.last_seen, 1e-3)
+            weight = min(1.0, elapsed / self.rate_window)
+            device_rate.rate += weight * (count / elapsed - device_rate.rate)
+            device_rate.count += count
+            device_rate.last_seen = now
+
+    def stats(self) -> dict:
+        return {"received": self.received, "parsed": self.parsed, "dropped": self.dropped,
+                "overwritten": self.overwritten, "pending": len(self._pending)}
+
+    def __repr__(self):
+        return (f"<Syslog_receiver {self.host}:{self.port} received={self.received} "
+                f"dropped={self.dropped} overwritten={self.overwritten}>")
@@ -0,0 +1,265 @@
+import asyncio
+import re
+import threading
+
+try:
+    import wexpect
+except ImportError:  # Linux hosts only need the asyncssh backend
+    wexpect = None
+
+try:
+    import asyncssh
+except ImportError:
+    asyncssh = None
+
+
+class EOF(Exception):
+    """
+    Raised / matched when the remote side closed the channel (same role as wexpect.EOF).
+    """
+
+
+class TIMEOUT(Exception):
+    """
+    Raised / matched when expect() ran out of time (same role as wexpect.TIMEOUT).
+    """
+
+
+class Wexpect_transport:
+    """
+    Default backend: one 'ssh <ip>' console process per session, driven by wexpect.
+    """
+    name = "wexpect"
+
+    def __init__(self):
+        if wexpect is None:
+            raise RuntimeError("wexpect is not installed; use Asyncssh_transport on this host.")
+        self.EOF = wexpect.EOF
+        self.TIMEOUT = wexpect.TIMEOUT
+
+    def open(self, ip: str, username: str, password: str, spawn_command: str, timeout: float = 10):
+        return wexpect.spawn(spawn_command, timeout=timeout)
+
+    def __repr__(self):
+        return "<Wexpect_transport>"
+
+
+class Async_channel:
+    def __init__(self, connection, process, timeout: float = 10):
+        """
+        Interactive CLI channel on top of an asyncssh shell session, with the pexpect-style
+        expect / send / sendline / before / after semantics Session_handler relies on.
+        Must be used from the event loop that owns the connection.
+        """
+        self._connection = connection
+        self._process = process
+        self.timeout = timeout
+        self.buffer = ""
+        self.before = ""
+        self.after = ""
+        self._eof = False
+
+    def _compile(self, pattern) -> list:
+        patterns = pattern if isinstance(pattern, list) else [pattern]
+        compiled = []
+        for item in patterns:
+            if item is EOF or item is TIMEOUT:
+                compiled.append(item)
+            elif isinstance(item, str):
+                compiled.append(re.compile(item))
+            else:
+                compiled.append(item)
+        return compiled
+
+    def _search(self, compiled: list):
+        best_index, best_match = None, None
+        for index, regex in enumerate(compiled):
+            if regex is EOF or regex is TIMEOUT:
+                continue
+            match = regex.search(self.buffer)
+            if match and (best_match is None or match.start() < best_match.start()):
+                best_index, best_match = index, match
+        return best_index, best_match
+
+    def _special(self, compiled: list, marker) -> int:
+        """
+        EOF / TIMEOUT outcome: returns its index if the caller listed it, otherwise raises it.
+        """
+        self.before = self.buffer
+        self.after = marker
+        if marker is EOF:
+            self.buffer = ""
+        if marker in compiled:
+            return compiled.index(marker)
+        raise marker(f"{marker.__name__} while waiting for {[getattr(p, 'pattern', p) for p in compiled]}")
+
+    async def expect(self, pattern, timeout: float = -1) -> int:
+        """
+        Waits until one of the patterns (regex strings, EOF or TIMEOUT) matches the incoming stream.
+        The earliest match in the stream wins; ties go to the pattern listed first.
+
+        Returns:
+            int: Index of the matched pattern
+        """
+        compiled = self._compile(pattern)
+        if timeout == -1:
+            timeout = self.timeout
+        loop = asyncio.get_running_loop()
+        deadline = None if timeout is None else loop.time() + timeout
+        while True:
+            index, match = self._search(compiled)
+            if match is not None:
+                self.before = self.buffer[:match.start()]
+                self.after = match.group(0)
+                self.buffer = self.buffer[match.end():]
+                return index
+            if self._eof:
+                return self._special(compiled, EOF)
+            remaining = None if deadline is None else deadline - loop.time()
+            if remaining is not None and remaining <= 0:
+                return self._special(compiled, TIMEOUT)
+            try:
+                data = await asyncio.wait_for(self._process.stdout.read(65536), remaining)
+            except asyncio.TimeoutError:
+                continue
+            except (asyncssh.Error, OSError):
+                data = ""
+            if data:
+                self.buffer += data
+            else:
+                self._eof = True
+
+    def send(self, text: str):
+        if self._process.stdin.is_closing():
+            raise EOF("Channel is closed.")
+        self._process.stdin.write(text)
+
+    def sendline(self, text: str = ""):
+        self.send(text + "\r")  # what the Enter key sends on a terminal
+
+    def isalive(self) -> bool:
+        return not self._eof and not self._process.stdin.is_closing()
+
+    async def close(self):
+        self._eof = True
+        self._process.close()
+        self._connection.close()
+        await self._connection.wait_closed()
+
+
+class Event_loop_thread:
+    def __init__(self):
+        """
+        One asyncio event loop running in a daemon thread. Every session of an
+        Asyncssh_transport multiplexes its channel onto this loop.
+        """
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name="asyncssh-transport", daemon=True)
+        self._thread.start()
+
+    def run(self, coroutine):
+        """
+        Runs a coroutine on the loop and blocks the calling thread until it is done.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    def call(self, function, *args):
+        async def call_on_loop():
+            return function(*args)
+        return self.run(call_on_loop())
+
+    def stop(self):
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+
+
+class Asyncssh_child:
+    def __init__(self, channel: Async_channel, loop_thread: Event_loop_thread):
+        """
+        Blocking facade over an Async_channel, so Session_handler can drive it like a wexpect child.
+        """
+        self._channel = channel
+        self._loop_thread = loop_thread
+
+    def expect(self, pattern, timeout: float = -1) -> int:
+        return self._loop_thread.run(self._channel.expect(pattern, timeout))
+
+    def send(self, text: str):
+        self._loop_thread.call(self._channel.send, text)
+
+    def sendline(self, text: str = ""):
+        self._loop_thread.call(self._channel.sendline, text)
+
+    def isalive(self) -> bool:
+        return self._channel.isalive()
+
+    def close(self):
+        self._loop_thread.run(self._channel.close())
+
+    @property
+    def before(self):
+        return self._channel.before
+
+    @property
+    def after(self):
+        return self._channel.after
+
+
+class Asyncssh_transport:
+    """
+    In-process SSH backend: sessions are asyncssh connections multiplexed on one event loop,
+    so no ssh process or console is needed per switch and thousands of sessions can share
+    one loop. Works on Linux as well as Windows.
+    """
+    name = "asyncssh"
+    EOF = EOF
+    TIMEOUT = TIMEOUT
+
+    def __init__(self, port: int = 22, known_hosts=None, term_type: str = "vt100", loop_thread: Event_loop_thread = None):
+        """
+        Args:
+            port (int): SSH port of the switches
+            known_hosts: asyncssh known_hosts setting. None accepts any host key, which is
+                what the wexpect backend does when it answers 'yes' to the authenticity prompt.
+            term_type (str): Terminal type requested for the CLI session
+            loop_thread (Event_loop_thread): Loop to run on; created on first use when omitted
+        """
+        if asyncssh is None:
+            raise RuntimeError("asyncssh is not installed.")
+        self.port = port
+        self.known_hosts = known_hosts
+        self.term_type = term_type
+        self._loop_thread = loop_thread
+        self._lock = threading.Lock()
+
+    @property
+    def loop_thread(self) -> Event_loop_thread:
+        with self._lock:
+            if self._loop_thread is None:
+                self._loop_thread = Event_loop_thread()
+            return self._loop_thread
+
+    async def open_async(self, ip: str, username: str, password: str, timeout: float = 10) -> Async_channel:
+        """
+        Coroutine variant of open() for callers already running on an event loop.
+
+        Raises:
+            ConnectionRefusedError: When nothing listens on the SSH port
+        """
+        connection = await asyncio.wait_for(
+            asyncssh.connect(ip, port=self.port, username=username, password=password,
+                             known_hosts=self.known_hosts, client_keys=None), timeout)
+        try:
+            process = await connection.create_process(term_type=self.term_type, encoding="utf-8")
+        except BaseException:
+            connection.close()
+            raise
+        return Async_channel(connection, process, timeout=timeout)
+
+    def open(self, ip: str, username: str, password: str, spawn_command: str = None, timeout: float = 10):
+        loop_thread = self.loop_thread
+        return Asyncssh_child(loop_thread.run(self.open_async(ip, username, password, timeout)), loop_thread)
+
+    def __repr__(self):
+        return f"<Asyncssh_transport port={self.port}>"
@@ -0,0 +1,322 @@
+import argparse
+import os
+import sys
+import time
+
+from simulator.interface_grammar import Port_config
+from simulator.synthetic_config import (PAGE_LINES, build_interfaces_status, build_running_config,
+                                        build_show_system)
+
+try:
+    import termios
+except ImportError:  # Windows console: fall back to line mode
+    termios = None
+
+
+MORE_PROMPT = "More: <space>,  Quit: q or CTRL+Z, One line: <return> "
+
+
+class Cbs250_simulator:
+    def __init__(self, ports: int = 52, vlans: int = 100, hostname: str = "switch01", username: str = "TestAdmin",
+                 password: str = "Pa$$w0rd", latency: float = 0.0, login_delay: float = 0.0,
+                 page_lines: int = PAGE_LINES, stdin_fd: int = 0, stdout_fd: int = 1):
+        """
+        Local stand-in for the CBS250 CLI as seen through 'ssh <ip>': 'User Name:' / 'Password:'
+        login, the '<hostname>#' prompt, "More: <space>" pagination and the show commands used
+        by Session_handler. Runs on stdin/stdout, so it can be spawned by wexpect like ssh.
+
+        'configure terminal' enters config mode, where 'interface <port>' and 'interface range
+        <ports>' accept the interface sub-commands of simulator.interface_grammar (an
+        implementation independent of the application's parser and command builder); they are
+        applied to the running config, which is then rewritten for the affected ports.
+
+        Args:
+            ports (int): Number of gi ports in configs and status tables
+            vlans (int): Number of VLANs in the VLAN database (drives config size)
+            latency (float): Seconds added before every answer, i.e. the simulated round trip
+            login_delay (float): Seconds before 'User Name:' appears, i.e. the SSH handshake
+            page_lines (int): Lines per "More: <space>" page
+        """
+        self.ports = ports
+        self.hostname = hostname
+        self.username = username
+        self.password = password
+        self.latency = latency
+        self.login_delay = login_delay
+        self.page_lines = page_lines
+        self.stdin_fd = stdin_fd
+        self.stdout_fd = stdout_fd
+        self.datadump = False
+        self.running_config = build_running_config(ports=ports, vlans=vlans, hostname=hostname)
+        self.startup_config = list(self.running_config)
+        self._skip_lf = False
+
+        # Config mode: None (exec), "config", "config-if" or "config-if-range"
+        self.mode = None
+        self._selected_ports = []
+        self._port_configs = {}         # port -> Port_config, parsed on first change
+
+        self.commands = {
+            "show running-config": lambda: self._paged(self._shown_config(self.running_config)),
+            "show startup-config": lambda: self._paged(self.startup_config),
+            "show interfaces status": lambda: self._paged(build_interfaces_status(ports).split("\r\n")),
+            "show system": lambda: self._paged(build_show_system(ports, hostname).split("\r\n")),
+            "terminal datadump": self._terminal_datadump,
+            "configure": self._configure,
+            "configure terminal": self._configure,
+        }
+        # Commands taking one argument, e.g. 'show running-config interface gi5'
+        self.argument_commands = {
+            "show running-config interface": self._show_interface_config,
+            "show interfaces status": self._show_interface_status,
+        }
+
+    @property
+    def prompt(self) -> str:
+        if self.mode is not None:
+            return f"{self.hostname}({self.mode})#"
+        return f"{self.hostname}#"
+
+    def _write(self, text: str):
+        os.write(self.stdout_fd, text.encode())
+
+    def _read_char(self) -> str:
+        char = os.read(self.stdin_fd, 1)
+        if not char:
+            raise EOFError
+        return char.decode(errors="ignore")
+
+    def _read_line(self, echo: bool = True) -> str:
+        line = ""
+        while True:
+            char = self._read_char()
+            if char == "\n" and self._skip_lf:
+                self._skip_lf = False
+                continue
+            self._skip_lf = char == "\r"
+            if char in ("\r", "\n"):
+                self._write("\r\n")
+                return line
+            if char in ("\x08", "\x7f"):
+                if line:
+                    line = line[:-1]
+                    if echo:
+                        self._write("\x08 \x08")
+                continue
+            line += char
+            if echo:
+                self._write(char)
+
+    def _paged(self, lines: list):
+        """
+        Writes output page by page, waiting for <space> between pages unless 'terminal datadump' is on.
+        """
+        if self.datadump:
+            self._write("\r\n".join(lines) + "\r\n")
+            return
+        position, page_size = 0, self.page_lines
+        while True:
+            page = lines[position:position + page_size]
+            self._write("\r\n".join(page) + "\r\n")
+            position += len(page)
+            if position >= len(lines):
+                return
+            self._write(MORE_PROMPT)
+            answer = self._read_char()
+            self._write("\r" + " " * len(MORE_PROMPT) + "\r")
+            if answer in ("q", "\x1a"):
+                return
+            # <return> shows one more line, <space> the next page
+            page_size = 1 if answer in ("\r", "\n") else self.page_lines
+            self._skip_lf = answer == "\r"
+
+    def _terminal_datadump(self):
+        self.datadump = True
+
+    @staticmethod
+    def _port_number(name: str):
+        for prefix in ("GigabitEthernet", "gi"):
+            if name.startswith(prefix) and name[len(prefix):].isdigit():
+                return int(name[len(prefix):])
+        return None
+
+    def _show_interface_config(self, name: str):
+        port = self._port_number(name)
+        header = f"interface GigabitEthernet{port}"
+        if port is None or header not in self.running_config:
+            self._write("% Invalid interface\r\n")
+            return
+        start = self.running_config.index(header)
+        end = self.running_config.index("exit", start)
+        self._paged(self._shown_config(self.running_config[start:end + 1]))
+
+    @staticmethod
+    def _shown_config(lines: list) -> list:
+        """
+        Config as the switch prints it: a port left with only default settings has no section.
+        """
+        return [line for position, line in enumerate(lines)
+                if not (line.startswith("interface ") and lines[position + 1:position + 2] == ["exit"])
+                and not (line == "exit" and position and lines[position - 1].startswith("interface "))]
+
+    def _show_interface_status(self, name: str):
+        port = self._port_number(name)
+        if port is None or not 1 <= port <= self.ports:
+            self._write("% Invalid interface\r\n")
+            return
+        lines = build_interfaces_status(self.ports).split("\r\n")
+        self._paged(lines[:3] + [lines[2 + port]])
+
+    def _configure(self):
+        self.mode = "config"
+
+    def _interface_ports(self, expression: str) -> list:
+        """
+        Port numbers of 'gi5', 'GigabitEthernet5' or a range expression like 'gi1-24,gi30'; None if invalid.
+        """
+        ports = []
+        for item in expression.split(","):
+            first, _, last = item.partition("-")
+            start = self._port_number(first)
+            end = start if not last else (int(last) if last.isdigit() else None)
+            if start is None or end is None or not 1 <= start <= end <= self.ports:
+                return None
+            ports += range(start, end + 1)
+        return ports
+
+    def _port_section(self, port: int) -> tuple:
+        start = self.running_config.index(f"interface GigabitEthernet{port}")
+        return start, self.running_config.index("exit", start)
+
+    def _port_config(self, port: int) -> Port_config:
+        port_config = self._port_configs.get(port)
+        if port_config is None:
+            start, end = self._port_section(port)
+            port_config = self._port_configs[port] = Port_config()
+            for line in self.running_config[start + 1:end]:
+                port_config.apply(line)
+        return port_config
+
+    def _write_port_section(self, port: int):
+        """
+        Rewrites the port's running-config section from its Port_config (only non-default lines).
+        """
+        start, end = self._port_section(port)
+        self.running_config[start + 1:end] = self._port_config(port).lines()
+
+    def _handle_config(self, line: str):
+        """
+        One line in config mode. Interface sub-commands are validated and applied immediately.
+        """
+        command = " ".join(line.split())
+        if command == "end":
+            self.mode = None
+            return
+        if command == "exit":
+            self.mode = "config" if self.mode != "config" else None
+            return
+        if command.startswith("interface "):
+            argument = command[len("interface "):]
+            is_range = argument.startswith("range ")
+            ports = self._interface_ports(argument[len("range "):] if is_range else argument)
+            if ports is None:
+                self._write("% Invalid interface\r\n")
+                return
+            self._selected_ports = ports
+            self.mode = "config-if-range" if is_range else "config-if"
+            return
+        if self.mode == "config":
+            self._write("% Unrecognized command\r\n")
+            return
+        for port in self._selected_ports:
+            error = self._port_config(port).apply(line)
+            if error is not None:
+                self._write(error + "\r\n")
+                return
+            self._write_port_section(port)
+
+    def _login(self) -> bool:
+        time.sleep(self.login_delay)
+        while True:
+            self._write("\r\nUser Name:")
+            username = self._read_line()
+            self._write("Password:")
+            password = self._read_line(echo=False)
+            if username == self.username and password == self.password:
+                return True
+
+    def run(self):
+        attributes = None
+        if termios is not None and os.isatty(self.stdin_fd):
+            attributes = termios.tcgetattr(self.stdin_fd)
+            raw = termios.tcgetattr(self.stdin_fd)
+            raw[3] &= ~(termios.ICANON | termios.ECHO)
+            termios.tcsetattr(self.stdin_fd, termios.TCSANOW, raw)
+        try:
+            self._login()
+            self._write(f"\r\n{self.prompt}")
+            while True:
+                command = self._read_line().strip()
+                if command in ("exit", "logout") and self.mode is None:
+                    return
+                time.sleep(self.latency)
+                self.handle(command)
+                self._write(self.prompt)
+        except (EOFError, OSError):
+            return
+        finally:
+            if attributes is not None:
+                termios.tcsetattr(self.stdin_fd, termios.TCSANOW, attributes)
+
+    def handle(self, command: str):
+        """
+        Runs one CLI command. Unknown commands get the switch's '%' error line.
+        """
+        if not command:
+            return
+        if self.mode is not None:
+            self._handle_config(command)
+            return
+        command = " ".join(command.split())
+        handler = self.commands.get(command)
+        if handler is not None:
+            handler()
+            return
+        prefix, _, argument = command.rpartition(" ")
+        handler = self.argument_commands.get(prefix)
+        if handler is None:
+            self._write("% Unrecognized command\r\n")
+            return
+        handler(argument)
+
+
+def add_simulator_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--ports", type=int, default=52)
+    parser.add_argument("--vlans", type=int, default=100)
+    parser.add_argument("--hostname", default="switch01")
+    parser.add_argument("--username", default="TestAdmin")
+    parser.add_argument("--password", default="Pa$$w0rd")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before every answer")
+    parser.add_argument("--login-delay", type=float, default=0.0, help="seconds before the login prompt")
+    parser.add_argument("--page-lines", type=int, default=PAGE_LINES)
+
+
+def simulator_options(args: argparse.Namespace) -> dict:
+    """
+    Cbs250_simulator keyword arguments from the options added by add_simulator_arguments().
+    """
+    return dict(ports=args.ports, vlans=args.vlans, hostname=args.hostname, username=args.username,
+                password=args.password, latency=args.latency, login_delay=args.login_delay,
+                page_lines=args.page_lines)
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Local CBS250 CLI stand-in for tests and benchmarks.")
+    add_simulator_arguments(parser)
+    args = parser.parse_args(argv)
+
+    Cbs250_simulator(**simulator_options(args)).run()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
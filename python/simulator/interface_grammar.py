@@ -0,0 +1,201 @@
+import ipaddress
+import re
+
+
+# The simulator's own reading of the CBS250 interface sub-commands. It deliberately shares
+# nothing with core.interface_config / core.command_builder: a push verified against the
+# simulator must be checked by a second implementation, not by the one that produced it.
+
+_VLAN_LIST = r"(\d+(?:-\d+)?(?:,\d+(?:-\d+)?)*)"
+_VLAN = r"(\d+)"
+
+# Lines that are the port's default and therefore never shown in the running config.
+DEFAULT_LINES = {"negotiation", "speed 1000", "duplex full", "flowcontrol off", "no back-pressure",
+                 "mdix auto", "switchport mode access", "switchport access vlan 1", "no shutdown"}
+
+# Slot order of a rendered interface section.
+SLOTS = ("description", "negotiation", "speed", "duplex", "flowcontrol", "back-pressure", "mdix", "mode",
+         "access vlan", "trunk allowed", "trunk native", "general allowed", "general forbidden",
+         "general pvid", "customer vlan", "ip address", "shutdown")
+
+
+def parse_vlan_list(text: str) -> set:
+    """
+    '2-5,7' -> {2, 3, 4, 5, 7}; raises ValueError outside 1-4094 or for a reversed range.
+    """
+    vlans = set()
+    for item in text.split(","):
+        first, _, last = item.partition("-")
+        start, end = int(first), int(last or first)
+        if not 1 <= start <= end <= 4094:
+            raise ValueError(item)
+        vlans.update(range(start, end + 1))
+    return vlans
+
+
+def format_vlan_list(vlans) -> str:
+    """
+    {2, 3, 4, 5, 7} -> '2-5,7'.
+    """
+    items = []
+    for vlan in sorted(vlans):
+        if items and items[-1][1] == vlan - 1:
+            items[-1][1] = vlan
+        else:
+            items.append([vlan, vlan])
+    return ",".join(str(start) if start == end else f"{start}-{end}" for start, end in items)
+
+
+def _vlan_id(text: str) -> int:
+    vlan = int(text)
+    if not 1 <= vlan <= 4094:
+        raise ValueError(text)
+    return vlan
+
+
+class Port_config:
+    def __init__(self):
+        """
+        Configuration of one simulated port as the switch keeps it: a value per slot, VLAN sets
+        for the list commands and the IP addresses, rendered back into running-config lines.
+        """
+        self.slots = {}             # slot -> running-config line
+        self.trunk_allowed = set()
+        self.general_tagged = set()
+        self.general_untagged = set()
+        self.general_forbidden = set()
+        self.dhcp = False
+        self.addresses = {}         # address -> mask
+
+        self.grammar = (
+            (r"description (.+)", self._description),
+            (r"no description", lambda: self._clear("description")),
+            (r"(no )?negotiation", lambda no: self._set("negotiation", f"{no or ''}negotiation")),
+            (r"speed (10|100|1000|10000)", lambda speed: self._set("speed", f"speed {speed}")),
+            (r"duplex (full|half)", lambda duplex: self._set("duplex", f"duplex {duplex}")),
+            (r"flowcontrol (on|off|auto)", lambda flow: self._set("flowcontrol", f"flowcontrol {flow}")),
+            (r"(no )?back-pressure", lambda no: self._set("back-pressure", f"{no or ''}back-pressure")),
+            (r"mdix (on|auto)", lambda mdix: self._set("mdix", f"mdix {mdix}")),
+            (r"(no )?shutdown", lambda no: self._set("shutdown", f"{no or ''}shutdown")),
+            (r"switchport mode (access|trunk|general|customer)", lambda mode: self._set("mode", f"switchport mode {mode}")),
+            (r"no switchport", lambda: self._set("mode", "no switchport")),
+            (r"switchport access vlan " + _VLAN,
+             lambda vlan: self._set("access vlan", f"switchport access vlan {_vlan_id(vlan)}")),
+            (r"switchport trunk allowed vlan (add|remove) " + _VLAN_LIST,
+             lambda action, vlans: self._change(self.trunk_allowed, action, vlans)),
+            (r"switchport trunk native vlan " + _VLAN,
+             lambda vlan: self._set("trunk native", f"switchport trunk native vlan {_vlan_id(vlan)}")),
+            (r"no switchport trunk native vlan", lambda: self._clear("trunk native")),
+            (r"switchport general allowed vlan add " + _VLAN_LIST + r" (tagged|untagged)", self._general_add),
+            (r"switchport general allowed vlan remove " + _VLAN_LIST, self._general_remove),
+            (r"switchport general forbidden vlan (add|remove) " + _VLAN_LIST,
+             lambda action, vlans: self._change(self.general_forbidden, action, vlans)),
+            (r"switchport general pvid " + _VLAN,
+             lambda vlan: self._set("general pvid", f"switchport general pvid {_vlan_id(vlan)}")),
+            (r"no switchport general pvid", lambda: self._clear("general pvid")),
+            (r"switchport customer vlan " + _VLAN,
+             lambda vlan: self._set("customer vlan", f"switchport customer vlan {_vlan_id(vlan)}")),
+            (r"no switchport customer vlan", lambda: self._clear("customer vlan")),
+            (r"ip address dhcp", self._ip_dhcp),
+            (r"ip address (\S+) (\S+)", self._ip_address),
+            (r"no ip address dhcp", self._no_ip_dhcp),
+            (r"no ip address (\S+)", lambda address: self.addresses.pop(str(ipaddress.IPv4Address(address)), None)),
+            (r"no ip address", self._no_ip_addresses),
+        )
+        self.grammar = tuple((re.compile(pattern + "$"), action) for pattern, action in self.grammar)
+
+    def apply(self, line: str):
+        """
+        Executes one interface sub-command.
+
+        Returns:
+            str: The switch's '%' error line, or None if the command was accepted
+        """
+        command = line.strip()
+        normalized = " ".join(command.split())
+        for pattern, action in self.grammar:
+            match = pattern.match(normalized)
+            if match is None:
+                continue
+            if action == self._description:
+                action(command[len("description"):].strip())  # keep the text as typed
+                return None
+            try:
+                action(*match.groups())
+            except ValueError:
+                return "% Bad parameter value"
+            return None
+        return "% Unrecognized command"
+
+    def lines(self) -> list:
+        """
+        Non-default lines of the port's running-config section, indented like the switch shows them.
+        """
+        lines = []
+        for slot in SLOTS:
+            if slot == "trunk allowed" and self.trunk_allowed:
+                lines.append(f"switchport trunk allowed vlan add {format_vlan_list(self.trunk_allowed)}")
+            elif slot == "general allowed":
+                for vlans, tagging in ((self.general_tagged, "tagged"), (self.general_untagged, "untagged")):
+                    if vlans:
+                        lines.append(f"switchport general allowed vlan add {format_vlan_list(vlans)} {tagging}")
+            elif slot == "general forbidden" and self.general_forbidden:
+                lines.append(f"switchport general forbidden vlan add {format_vlan_list(self.general_forbidden)}")
+            elif slot == "ip address":
+                if self.dhcp:
+                    lines.append("ip address dhcp")
+                lines += [f"ip address {address} {mask}" for address, mask in self.addresses.items()]
+            elif slot in self.slots:
+                lines.append(self.slots[slot])
+        return [" " + line for line in lines]
+
+    def _set(self, slot: str, line: str):
+        if line in DEFAULT_LINES:
+            self.slots.pop(slot, None)
+        else:
+            self.slots[slot] = line
+
+    def _clear(self, slot: str):
+        self.slots.pop(slot, None)
+
+    def _description(self, text: str):
+        self.slots["description"] = f"description {text}"
+
+    @staticmethod
+    def _change(vlans: set, action: str, text: str):
+        changed = parse_vlan_list(text)
+        if action == "add":
+            vlans |= changed
+        else:
+            vlans -= changed
+
+    def _general_add(self, text: str, tagging: str):
+        vlans = parse_vlan_list(text)
+        # A VLAN is either tagged or untagged on a general port: adding it again moves it
+        self.general_tagged -= vlans
+        self.general_untagged -= vlans
+        (self.general_tagged if tagging == "tagged" else self.general_untagged).update(vlans)
+
+    def _general_remove(self, text: str):
+        vlans = parse_vlan_list(text)
+        self.general_tagged -= vlans
+        self.general_untagged -= vlans
+
+    def _ip_dhcp(self):
+        self.dhcp = True
+        self.addresses.clear()
+
+    def _no_ip_dhcp(self):
+        self.dhcp = False
+
+    def _ip_address(self, address: str, mask: str):
+        interface = ipaddress.IPv4Interface(f"{address}/{mask}")  # ValueError for a bad address or mask
+        self.dhcp = False
+        self.addresses[str(interface.ip)] = str(interface.netmask)
+
+    def _no_ip_addresses(self):
+        self.dhcp = False
+        self.addresses.clear()
+
+    def __repr__(self):
+        return f"<Port_config slots={len(self.slots)} addresses={len(self.addresses)} dhcp={self.dhcp}>"
@@ -0,0 +1,125 @@
+import argparse
+import asyncio
+import socket
+import sys
+import threading
+
+import asyncssh
+
+from simulator.cbs250_cli import Cbs250_simulator, add_simulator_arguments, simulator_options
+
+
+class _Accept_ssh_login(asyncssh.SSHServer):
+    """
+    Accepts any SSH-level password: like the switch, the simulator checks the
+    credentials at its own 'User Name:' / 'Password:' prompt.
+    """
+
+    def begin_auth(self, username: str) -> bool:
+        return True
+
+    def password_auth_supported(self) -> bool:
+        return True
+
+    def validate_password(self, username: str, password: str) -> bool:
+        return True
+
+
+class Cbs250_ssh_server:
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, **options):
+        """
+        Local stand-in SSH server: every SSH shell session gets its own Cbs250_simulator,
+        so the asyncssh transport can be exercised end to end without a switch.
+        The simulator runs in a thread on one end of a socket pair; the SSH channel is
+        bridged to the other end.
+
+        Args:
+            host (str): Address to listen on
+            port (int): Port to listen on, 0 picks a free one (see self.port after start())
+            options: Cbs250_simulator keyword arguments (ports, vlans, latency, ...)
+        """
+        self.host = host
+        self.port = port
+        self.options = options
+        self.sessions = 0
+        self._server = None
+
+    async def start(self):
+        host_key = asyncssh.generate_private_key("ssh-ed25519")
+        self._server = await asyncssh.create_server(
+            _Accept_ssh_login, self.host, self.port, server_host_keys=[host_key],
+            process_factory=self._handle_session, line_editor=False)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def close(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def _run_simulator(self, simulator_socket: socket.socket):
+        try:
+            Cbs250_simulator(stdin_fd=simulator_socket.fileno(), stdout_fd=simulator_socket.fileno(),
+                             **self.options).run()
+        finally:
+            simulator_socket.close()
+
+    async def _handle_session(self, process):
+        self.sessions += 1
+        bridge_socket, simulator_socket = socket.socketpair()
+        threading.Thread(target=self._run_simulator, args=(simulator_socket,), daemon=True).start()
+        reader, writer = await asyncio.open_connection(sock=bridge_socket)
+
+        async def forward_input():
+            try:
+                while True:
+                    try:
+                        data = await process.stdin.read(4096)
+                    except asyncssh.TerminalSizeChanged:
+                        continue
+                    if not data:
+                        break
+                    writer.write(data.encode())
+                    await writer.drain()
+            except (asyncssh.Error, OSError):
+                pass
+            finally:
+                writer.close()
+
+        input_task = asyncio.create_task(forward_input())
+        try:
+            while True:
+                data = await reader.read(65536)
+                if not data:
+                    break
+                process.stdout.write(data.decode(errors="ignore"))
+        except (asyncssh.Error, OSError):
+            pass
+        finally:
+            input_task.cancel()
+            process.exit(0)
+
+    def __repr__(self):
+        return f"<Cbs250_ssh_server {self.host}:{self.port} sessions={self.sessions}>"
+
+
+async def _serve(server: Cbs250_ssh_server):
+    await server.start()
+    print(f"CBS250 simulator listening on {server.host}:{server.port}", flush=True)
+    await asyncio.Event().wait()
+
+
+def main(argv: list = None):
+    parser = argparse.ArgumentParser(description="Local CBS250 stand-in SSH server for tests and benchmarks.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8022)
+    add_simulator_arguments(parser)
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(_serve(Cbs250_ssh_server(args.host, args.port, **simulator_options(args))))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
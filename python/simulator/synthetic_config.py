@@ -0,0 +1,100 @@
+PAGE_LINES = 24
+PAGER_TAIL = ", Quit: q or CTRL+Z, One line: <return> "
+
+
+def build_running_config(ports: int = 52, vlans: int = 100, hostname: str = "switch01") -> list:
+    """
+    Builds a CBS250-like running configuration as a list of raw lines.
+    Port modes rotate through access, trunk and general so every parser branch is hit.
+    """
+    lines = ["config-file-header", hostname, "v3.1.1.7 / RCBS3.1_930_871_145", "CLI v1.0",
+             "file SSD indicator plaintext", "@", "!", "unit-type-control-start",
+             "unit-type unit 1 network gi uplink none", "unit-type-control-end", "!", "vlan database"]
+    lines.append("vlan " + ",".join(str(vlan) for vlan in range(2, vlans + 2)))
+    lines += ["exit", f"hostname {hostname}",
+              "username TestAdmin password encrypted $15$abcdefghijklmnop== privilege 15",
+              "ip ssh server", "ip ssh password-auth", "!"]
+
+    for port in range(1, ports + 1):
+        lines.append(f"interface GigabitEthernet{port}")
+        lines.append(f" description Port-{port}  uplink")
+        if port % 4 == 0:
+            lines.append(" no negotiation")
+            lines.append(" speed 100")
+            lines.append(" duplex half")
+        mode = port % 3
+        if mode == 0:
+            lines.append(f" switchport access vlan {2 + port % vlans}")
+        elif mode == 1:
+            lines.append(" switchport mode trunk")
+            lines.append(f" switchport trunk allowed vlan add 2-{1 + vlans // 2},{vlans}")
+            lines.append(" switchport trunk native vlan 2")
+        else:
+            lines.append(" switchport mode general")
+            lines.append(f" switchport general allowed vlan add {2 + port % vlans} tagged")
+            lines.append(f" switchport general allowed vlan add {3 + port % vlans} untagged")
+            lines.append(" switchport general pvid 3")
+        if port % 7 == 0:
+            lines.append(" shutdown")
+        lines.append("exit")
+
+    lines += ["line ssh", "exec-timeout 30", "exit", "!"]
+    return lines
+
+
+def paginate(lines: list, page_lines: int = PAGE_LINES) -> list:
+    """
+    Splits raw lines into the chunks wexpect hands back as child.before while
+    answering "More: <space>" prompts: every chunk after the first starts with the pager tail.
+    """
+    chunks = []
+    for start in range(0, len(lines), page_lines):
+        page = "\r\n".join(lines[start:start + page_lines]) + "\r\n"
+        if start:
+            page = PAGER_TAIL + "\r" + page
+        chunks.append(page)
+    return chunks
+
+
+def model_name(ports: int) -> str:
+    return "CBS250-8T-E-2G" if ports <= 10 else f"CBS250-{ports - 4}T-4G"
+
+
+def build_show_system(ports: int = 52, hostname: str = "switch01") -> str:
+    return "\r\n".join([
+        f"System Description:                       {model_name(ports)} {ports - 4}-Port Gigabit Smart Switch",
+        "System Up Time (days,hour:min:sec):       03,02:11:24",
+        "System Contact:",
+        f"System Name:                              {hostname}",
+        "System Location:",
+        "System MAC Address:                       00:11:22:33:44:55",
+        "System Object ID:                         1.3.6.1.4.1.9.6.1.94.48.5",
+        "",
+        "Unit    Type",
+        "----    -------------------",
+        f" 1      {model_name(ports)}",
+    ])
+
+
+def build_interfaces_status(ports: int = 52, down_every: int = 5) -> str:
+    """
+    'show interfaces status' table in the CBS250 column layout. Every down_every-th port is down.
+    """
+    lines = [
+        "                                             Flow Link          Back   Mdix",
+        "Port     Type         Duplex  Speed Neg      ctrl State       Pressure Mode",
+        "-------- ------------ ------  ----- -------- ---- ----------- -------- -------",
+    ]
+    for port in range(1, ports + 1):
+        if down_every and port % down_every == 0:
+            lines.append(f"gi{port:<6} 1G-Copper      --      --     --     --  Down           --     --")
+        else:
+            lines.append(f"gi{port:<6} 1G-Copper    Full    1000  Enabled  Off  Up          Disabled On")
+    lines += [
+        "",
+        "                                          Flow    Link        ",
+        "Ch       Type    Duplex  Speed  Neg      control  State       ",
+        "-------- ------- ------  -----  -------- -------  ----------- ",
+        "Po1         --     --      --      --       --    Not Present",
+    ]
+    return "\r\n".join(lines)
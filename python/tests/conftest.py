@@ -0,0 +1,62 @@
+import pytest
+
+from infrastructure.ssh_client import Session_handler
+from infrastructure.transport import Asyncssh_transport, Event_loop_thread
+from simulator.ssh_server import Cbs250_ssh_server
+
+USERNAME = "TestAdmin"
+PASSWORD = "Pa$$w0rd"
+
+
+@pytest.fixture(scope="session")
+def loop_thread():
+    loop_thread = Event_loop_thread()
+    yield loop_thread
+    loop_thread.stop()
+
+
+@pytest.fixture(scope="module")
+def ssh_server(loop_thread):
+    """
+    Local CBS250 stand-in on an ephemeral port; every SSH session gets a fresh simulator.
+    """
+    server = Cbs250_ssh_server(ports=52, vlans=20)
+    loop_thread.run(server.start())
+    yield server
+    loop_thread.run(server.close())
+
+
+@pytest.fixture(scope="module")
+def slow_ssh_server(loop_thread):
+    """
+    Stand-in that takes 0.5 s before every answer, for deadline and timeout tests.
+    """
+    server = Cbs250_ssh_server(ports=52, vlans=20, latency=0.5)
+    loop_thread.run(server.start())
+    yield server
+    loop_thread.run(server.close())
+
+
+@pytest.fixture
+def make_session(ssh_server, loop_thread):
+    """
+    Factory of Session_handler objects on the asyncssh transport; all are disconnected afterwards.
+    """
+    sessions = []
+
+    def make(session_class=Session_handler, **kwargs):
+        transport = Asyncssh_transport(port=ssh_server.port, loop_thread=loop_thread)
+        session = session_class("127.0.0.1", USERNAME, PASSWORD, transport=transport, **kwargs)
+        sessions.append(session)
+        return session
+
+    yield make
+    for session in sessions:
+        session.disconnect()
+
+
+@pytest.fixture
+def session(make_session):
+    session = make_session()
+    assert session.connect() == "Connection established"
+    return session
@@ -0,0 +1,43 @@
+import pytest
+
+from infrastructure.ssh_client import Session_handler
+
+
+def test_connect_learns_prompt_and_disables_pagination(session, ssh_server):
+    assert session.connection_is_active
+    assert session.hostname == "switch01"
+    assert session.pagination_disabled
+    assert ssh_server.sessions >= 1
+
+
+def test_batch_returns_one_result_per_command(session):
+    system, status = session.send_commands_batch(["show system", "show interfaces status"])
+
+    assert system.ok and status.ok
+    assert Session_handler.parse_model_name(system.output).startswith("CBS250")
+    rows = Session_handler.parse_interfaces_status(status.output)
+    assert len([name for name in rows if name.startswith("gi")]) == 52
+
+
+def test_batch_error_marks_only_the_failing_command(session):
+    system, bogus, status = session.send_commands_batch(["show system", "show bogus", "show interfaces status"])
+
+    assert system.ok and status.ok
+    assert not bogus.ok and bogus.error.startswith("%")
+    assert session.validate_connection()
+
+
+def test_get_config_returns_cleaned_lines(session):
+    running = session.get_config("running")
+
+    assert running[0] == "config-file-header"
+    assert "interface GigabitEthernet52" in running
+
+
+def test_disconnect_closes_the_session(session):
+    session.disconnect()
+
+    assert not session.connection_is_active
+    assert session.child is None
+    with pytest.raises(RuntimeError, match="No active SSH session"):
+        session.send_commands_batch(["show system"])
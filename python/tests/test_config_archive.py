@@ -0,0 +1,46 @@
+import threading
+
+from core.config_parser import Running_config_parser
+from infrastructure.config_archive import Config_archive, split_blocks
+from infrastructure.config_cleaner import clean_config_text
+from infrastructure.storage import Sqlite_backend
+from simulator.synthetic_config import build_running_config
+
+
+def _config(ports: int = 8, description: str = "uplink") -> list:
+    lines = clean_config_text("\r\n".join(build_running_config(ports=ports, vlans=10)))
+    return [line.replace("uplink", description) for line in lines]
+
+
+def test_blocks_follow_the_parser_sections():
+    lines = _config()
+    model = Running_config_parser().parse(lines)
+
+    headers = [block.split("\n")[0] for block in split_blocks(lines)[1:]]
+
+    assert headers == [section.header for section in model.sections.values() if section.header]
+
+
+def test_versions_round_trip_and_export_in_order():
+    archive = Config_archive(Sqlite_backend())
+    configs = [_config(description=f"uplink-{index}") for index in range(3)]
+    for index, lines in enumerate(configs):
+        assert archive.archive("10.0.0.1", "running", lines, taken_at=index) == index
+
+    assert archive.get("10.0.0.1", "running", 1) == configs[1]
+    assert [lines for _, _, _, _, _, lines in archive.export()] == configs
+
+
+def test_export_does_not_hold_the_lock_while_the_consumer_works():
+    archive = Config_archive(Sqlite_backend())
+    archive.archive("10.0.0.1", "running", _config(), taken_at=0)
+    exported = archive.export()
+    next(exported)
+
+    acquired = []
+    thread = threading.Thread(target=lambda: acquired.append(archive._lock.acquire(timeout=2)))
+    thread.start()
+    thread.join()
+    exported.close()
+
+    assert acquired == [True]
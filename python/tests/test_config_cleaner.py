@@ -0,0 +1,44 @@
+import pytest
+
+from benchmarks.config_cleaner_bench import legacy_clean, stream_clean
+from infrastructure.config_cleaner import clean_config_text
+from simulator.synthetic_config import PAGER_TAIL, build_running_config, paginate
+
+
+def _resplit(text: str, size: int) -> list:
+    return [text[start:start + size] for start in range(0, len(text), size)]
+
+
+# Pager tails (one without its comma) and glued 'privilege 15username' lines, as the switch sends them
+QUIRKS = ("hostname switch01\r\nusername a password encrypted x privilege 15username b password encrypted y "
+          "privilege 15\r\n" + PAGER_TAIL + "\r" + "ip ssh server\r\nusername c privilege 15  ip ssh server\r\n"
+          "interface gi1\r\n description Port-1  uplink\r\n!\r\nEXIT\r\n" + PAGER_TAIL + "\r!\r\nline ssh\r"
+          "exec-timeout 30\r\n" + PAGER_TAIL.lstrip(", ") + "\rinterface gi2\r\n")
+
+
+@pytest.mark.parametrize("ports", [1, 52, 200])
+def test_paginated_config_matches_the_legacy_cleaner(ports):
+    chunks = paginate(build_running_config(ports=ports))
+    full_output = "".join(chunks)
+    expected = legacy_clean(full_output)
+
+    assert clean_config_text(full_output) == expected
+    assert stream_clean(chunks) == expected
+
+
+@pytest.mark.parametrize("size", [1, 2, 5, 13, 64, 1000])
+def test_chunks_split_anywhere_match_the_legacy_cleaner(size):
+    full_output = "".join(paginate(build_running_config(ports=8), page_lines=7)) + QUIRKS
+    assert stream_clean(_resplit(full_output, size)) == legacy_clean(full_output)
+
+
+def test_pager_tails_and_glued_lines_match_the_legacy_cleaner():
+    expected = legacy_clean(QUIRKS)
+    assert "username b password encrypted y privilege 15" in expected
+    assert "ip ssh server" in expected
+    assert not [line for line in expected if "Quit" in line or line.lower() == "exit"]
+
+    assert clean_config_text(QUIRKS) == expected
+    # Every cut position once, including the middle of a pager tail
+    for cut in range(1, len(QUIRKS)):
+        assert stream_clean([QUIRKS[:cut], QUIRKS[cut:]]) == expected, cut
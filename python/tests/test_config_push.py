@@ -0,0 +1,58 @@
+import copy
+
+from core.command_builder import Command_builder
+from core.config_push import Config_push_engine
+from core.initializer import Initializer
+from domain.physical_interface import Physical_interface_settings
+
+
+def _engine(session) -> Config_push_engine:
+    initializer = Initializer(session)
+    initializer.initialize()
+    assert initializer.physical_interfaces_settings_objects, initializer.initialization_log
+    return Config_push_engine(initializer)
+
+
+def _desired(engine: Config_push_engine, name: str) -> Physical_interface_settings:
+    return copy.deepcopy(engine.initializer.physical_interfaces_settings_objects[name])
+
+
+def test_changed_mask_removes_the_address_before_adding_it_again():
+    current = Physical_interface_settings("gi5", [])
+    current.physical_interface_ips = {"DHCP": False, "10.0.0.5": "255.255.255.0"}
+    desired = Physical_interface_settings("gi5", [])
+    desired.physical_interface_ips = {"DHCP": False, "10.0.0.5": "255.255.0.0"}
+
+    assert Command_builder.build({"gi5": current}, {"gi5": desired}) == [
+        "interface gi5", "no ip address 10.0.0.5", "ip address 10.0.0.5 255.255.0.0", "exit"]
+
+
+def test_ip_address_push_is_applied_and_verified(session):
+    engine = _engine(session)
+    desired = _desired(engine, "gi5")
+    desired.physical_interface_ips = {"DHCP": False, "10.0.0.5": "255.255.255.0"}
+
+    push_result = engine.push({"gi5": desired})
+
+    assert push_result.ok, (push_result.errors, push_result.mismatches)
+    assert "ip address 10.0.0.5 255.255.255.0" in [line.strip() for line in engine.initializer.running_config]
+
+    desired = _desired(engine, "gi5")
+    desired.physical_interface_ips = {"DHCP": True}
+    push_result = engine.push({"gi5": desired})
+
+    assert push_result.commands == ["interface gi5", "no ip address 10.0.0.5", "ip address dhcp", "exit"]
+    assert push_result.ok, (push_result.errors, push_result.mismatches)
+    assert engine.initializer.physical_interfaces_settings_objects["gi5"].physical_interface_ips == {"DHCP": True}
+
+
+def test_value_the_switch_rejects_fails_the_push(session):
+    engine = _engine(session)
+    desired = _desired(engine, "gi3")
+    desired.access_vlan = 5000
+
+    push_result = engine.push({"gi3": desired})
+
+    assert not push_result.ok
+    assert push_result.errors == ["'switchport access vlan 5000' failed: % Bad parameter value"]
+    assert push_result.mismatches == {"gi3": ["switchport access vlan 5000"]}
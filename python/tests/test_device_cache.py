@@ -0,0 +1,67 @@
+import asyncio
+import json
+import threading
+from types import SimpleNamespace
+
+from fastapi.testclient import TestClient
+
+from api.device_cache import Device_cache, Device_view
+from api.server import create_app
+from domain.physical_interface import Physical_interface_settings
+
+RUNNING = ["hostname switch01", "interface gi1", " description uplink", " speed 1000", "exit"]
+
+
+def _initializer(ports: int = 10, startup_config: list = RUNNING):
+    settings = {f"gi{port}": Physical_interface_settings(f"gi{port}", []) for port in range(1, ports + 1)}
+    return SimpleNamespace(model_name="CBS250-8T-E-2G", running_config=RUNNING, startup_config=startup_config,
+                           physical_interfaces_settings_objects=settings, interfaces_current_status_objects={})
+
+
+def test_pages_are_sliced_from_one_encoded_list():
+    view = Device_view("10.0.0.1", _initializer())
+
+    page = json.loads(view.body("settings", 2, 3))
+    rest = json.loads(view.body("settings", 8))
+
+    assert (page["total"], page["offset"], page["limit"]) == (10, 2, 3)
+    assert [item["name"] for item in page["items"]] == ["gi3", "gi4", "gi5"]
+    assert [item["name"] for item in rest["items"]] == ["gi9", "gi10"]
+    assert len(view._encoded["settings"]) == 10
+
+
+def test_unsaved_changes_ignores_reordering_inside_a_section():
+    reordered = ["hostname switch01", "interface gi1", " speed 1000", " description uplink", "exit"]
+    assert not Device_view("10.0.0.1", _initializer(startup_config=reordered)).summary["unsaved_changes"]
+    assert Device_view("10.0.0.1", _initializer(startup_config=RUNNING[:1])).summary["unsaved_changes"]
+
+
+def test_concurrent_async_refreshes_share_one_fetch():
+    release = threading.Event()
+
+    def loader(ip):
+        release.wait(5)
+        return _initializer()
+
+    cache = Device_cache(loader)
+
+    async def refresh_all():
+        requests = [asyncio.ensure_future(cache.refresh_async("10.0.0.1")) for _ in range(20)]
+        await asyncio.sleep(0.05)
+        release.set()
+        return await asyncio.gather(*requests)
+
+    views = asyncio.run(refresh_all())
+    assert cache.fetches == 1
+    assert all(view is views[0] for view in views)
+
+
+def test_api_answers_304_for_an_unchanged_page():
+    client = TestClient(create_app(Device_cache(lambda ip: _initializer())))
+
+    first = client.get("/devices/10.0.0.1/interfaces/settings", params={"offset": 0, "limit": 5})
+    second = client.get("/devices/10.0.0.1/interfaces/settings", params={"offset": 0, "limit": 5},
+                        headers={"If-None-Match": first.headers["etag"]})
+
+    assert first.status_code == 200 and len(first.json()["items"]) == 5
+    assert second.status_code == 304
@@ -0,0 +1,20 @@
+from core.fleet_runner import Fleet_runner
+from infrastructure.ssh_client import Session_handler
+from infrastructure.transport import Asyncssh_transport
+from tests.conftest import PASSWORD, USERNAME
+
+
+def test_failing_session_factory_only_fails_its_device(ssh_server, loop_thread):
+    def session_factory(ip, username, password):
+        if ip == "10.0.0.2":
+            raise RuntimeError("wexpect is not installed.")
+        transport = Asyncssh_transport(port=ssh_server.port, loop_thread=loop_thread)
+        return Session_handler("127.0.0.1", username, password, transport=transport)
+
+    inventory = [{"ip": ip, "username": USERNAME, "password": PASSWORD} for ip in ("10.0.0.1", "10.0.0.2")]
+    fleet_result = Fleet_runner(inventory, session_factory=session_factory).run()
+
+    assert fleet_result["10.0.0.1"].succeeded
+    failed = fleet_result["10.0.0.2"]
+    assert not failed.succeeded
+    assert failed.error == "Creating the session failed: wexpect is not installed."
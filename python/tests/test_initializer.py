@@ -0,0 +1,60 @@
+from core.initializer import Initializer
+from infrastructure.ssh_client import Session_handler
+
+
+class Counting_session(Session_handler):
+    """
+    Session that counts the batches it sends.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batches = 0
+
+    def send_commands_batch(self, commands: list, timeout: float = None) -> list:
+        self.batches += 1
+        return super().send_commands_batch(commands, timeout)
+
+
+def test_refresh_does_not_resend_the_batch_for_a_switch_error(make_session):
+    session = make_session(Counting_session)
+    assert session.connect() == "Connection established"
+    initializer = Initializer(session)
+    session.batches = 0
+
+    assert not initializer.refresh_interfaces(["gi5", "gi99"])
+
+    assert session.batches == 1
+    assert any("failed: %" in line for line in initializer.initialization_log)
+
+
+def test_refresh_resends_the_batch_after_the_session_was_lost(make_session):
+    session = make_session(Counting_session)
+    assert session.connect() == "Connection established"
+    initializer = Initializer(session)
+    session.batches = 0
+    session.child.close()
+
+    assert initializer.refresh_interfaces(["gi5"])
+
+    assert session.batches == 2
+    assert session.handshake_count == 2
+
+
+def test_refresh_follows_a_section_that_disappears_and_comes_back(session):
+    initializer = Initializer(session)
+    initializer.initialize()
+    assert "interface GigabitEthernet3" in initializer.running_config
+
+    # gi3 carries a description and an access VLAN; without them the switch shows no section
+    session.send_config_batch(["interface gi3", "no description", "switchport access vlan 1", "exit"])
+    assert initializer.refresh_interfaces(["gi3"])
+
+    assert "interface GigabitEthernet3" not in initializer.running_config
+    assert initializer.config_model.get("interface", "gi3") is None
+    assert initializer.running_config == session.get_config("running")
+
+    session.send_config_batch(["interface gi3", "description back", "exit"])
+    assert initializer.refresh_interfaces(["gi3"])
+
+    assert initializer.config_model.get("interface", "gi3").lines == ["description back"]
+    assert initializer.running_config == session.get_config("running")
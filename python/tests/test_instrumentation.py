@@ -0,0 +1,82 @@
+from infrastructure.instrumentation import Metered_child, Metrics_recorder, command_kind
+
+
+class Timeout(Exception):
+    pass
+
+
+class Scripted_child:
+    """
+    Child whose expect() replays (index, before, after) steps; Timeout steps raise instead.
+    """
+    def __init__(self, steps: list):
+        self.steps = list(steps)
+        self.before = self.after = None
+
+    def expect(self, pattern, timeout=-1):
+        step = self.steps.pop(0)
+        if step is Timeout:
+            raise Timeout()
+        index, self.before, self.after = step
+        return index
+
+
+class Owner:
+    def __init__(self):
+        self._current_record = None
+
+
+PATTERNS = ["switch01#", "More: <space>", Timeout]
+
+
+def _metered(steps: list, command: str = "show running-config"):
+    recorder = Metrics_recorder()
+    owner = Owner()
+    child = Metered_child(Scripted_child(steps), Timeout, owner)
+    with recorder.command("10.0.0.1", command) as record:
+        owner._current_record = record
+        for _ in steps:
+            try:
+                child.expect(PATTERNS)
+            except Timeout:
+                pass
+    return recorder, record
+
+
+def test_bytes_read_again_after_timeouts_are_counted_once():
+    _, record = _metered([(2, "abc", Timeout), (2, "abcdef", Timeout), (0, "abcdef", "switch01#")])
+
+    assert record.bytes_received == len("abcdef") + len("switch01#")
+    assert record.timeouts == 2
+
+
+def test_pages_and_raised_timeouts_are_counted():
+    _, record = _metered([(1, "page one\r\n", "More: <space>"), Timeout, (0, "page two\r\n", "switch01#")])
+
+    assert record.pages == 1
+    assert record.timeouts == 1
+    assert record.bytes_received == len("page one\r\nMore: <space>page two\r\nswitch01#")
+
+
+def test_prometheus_export_uses_command_kinds_and_totals():
+    recorder, record = _metered([(1, "ab", "More: <space>"), (0, "cd", "switch01#")],
+                                command="username admin password secret")
+    with recorder.phase("10.0.0.1", "load"):
+        pass
+
+    text = recorder.to_prometheus()
+
+    labels = 'device="10.0.0.1",command="username"'
+    assert "secret" not in text
+    assert f"cbs250_command_duration_seconds_count{{{labels}}} 1" in text
+    assert f"cbs250_command_received_bytes_total{{{labels}}} {record.bytes_received}" in text
+    assert f"cbs250_command_pages_total{{{labels}}} 1" in text
+    assert f"cbs250_command_timeouts_total{{{labels}}} 0" in text
+    assert 'cbs250_phase_duration_seconds_count{device="10.0.0.1",phase="load"} 1' in text
+    assert "# TYPE cbs250_command_duration_seconds summary" in text
+
+
+def test_command_kind_is_bounded():
+    assert command_kind("show running-config interface gi5") == "show running-config interface"
+    assert command_kind("showx") == "other"
+    assert command_kind("snmp-server community public ro") == "snmp-server"
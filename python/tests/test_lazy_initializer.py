@@ -0,0 +1,86 @@
+from core.lazy_initializer import Lazy_initializer
+from infrastructure.ssh_client import Session_handler
+
+
+class Recording_session(Session_handler):
+    """
+    Session that records the command batches it sends.
+    """
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.batches = []
+
+    def send_commands_batch(self, commands: list, timeout: float = None) -> list:
+        self.batches.append(list(commands))
+        return super().send_commands_batch(commands, timeout)
+
+
+def _lazy(make_session) -> Lazy_initializer:
+    session = make_session(Recording_session)
+    assert session.connect() == "Connection established"
+    return Lazy_initializer(session)
+
+
+def test_missing_lists_dependencies_before_dependents(make_session):
+    initializer = Lazy_initializer(make_session())
+    assert initializer._missing(["physical_interfaces_settings_objects", "config_model"]) == [
+        "interfaces_status", "running_config", "physical_interfaces_settings_objects", "config_model"]
+    assert not initializer.is_loaded("running_config")   # defaults from Initializer.__init__ are not data
+
+    initializer.running_config = ["hostname switch01"]
+    assert initializer._missing(["config_model"]) == ["config_model"]
+
+
+def test_each_resource_is_fetched_once(make_session):
+    initializer = _lazy(make_session)
+    session = initializer.session
+
+    assert "gi1" in initializer.interfaces_current_status_objects
+    assert session.batches == [["show interfaces status"]]
+
+    # The settings grid only adds the running config; the status is already there
+    assert "gi1" in initializer.physical_interfaces_settings_objects
+    assert initializer.config_model is not None
+    assert initializer.interfaces_status and initializer.interfaces_current_status_objects
+    assert session.batches == [["show interfaces status"], ["show running-config"]]
+    assert not initializer.is_loaded("startup_config")
+
+
+def test_initialize_fetches_everything_in_one_batch(make_session):
+    initializer = _lazy(make_session)
+    initializer.initialize()
+
+    assert len(initializer.session.batches) == 1
+    assert sorted(initializer.session.batches[0]) == sorted(
+        ["show running-config", "show startup-config", "show system", "show interfaces status"])
+    assert initializer.model_name != "Unknown"
+    initializer.load("config_model", "startup_config")
+    assert len(initializer.session.batches) == 1
+
+
+def test_invalidate_refetches_the_resource_and_rebuilds_what_depends_on_it(make_session):
+    initializer = _lazy(make_session)
+    settings = initializer.physical_interfaces_settings_objects
+    status_objects = initializer.interfaces_current_status_objects
+    initializer.session.batches.clear()
+
+    initializer.invalidate("running_config")
+    assert not initializer.is_loaded("config_model")
+    assert not initializer.is_loaded("physical_interfaces_settings_objects")
+    assert initializer.interfaces_current_status_objects is status_objects
+
+    assert initializer.physical_interfaces_settings_objects is not settings
+    assert initializer.session.batches == [["show running-config"]]
+
+
+def test_load_view_prefetches_the_other_views(make_session):
+    initializer = _lazy(make_session)
+    values = initializer.load_view("status_grid", prefetch=("unsaved_changes", "summary"))
+    assert list(values) == ["interfaces_current_status_objects"]
+
+    initializer.wait_for_prefetch(timeout=30)
+    assert all(initializer.is_loaded(name) for name in ("running_config", "startup_config", "model_name"))
+    assert not initializer.is_loaded("config_model")
+    # One resource at a time, in the order of the prefetched views
+    assert initializer.session.batches == [["show interfaces status"], ["show running-config"],
+                                           ["show startup-config"], ["show system"]]
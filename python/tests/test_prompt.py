@@ -0,0 +1,60 @@
+import re
+
+import pytest
+
+from infrastructure.prompt import Adaptive_timeout, hostname_from_prompt, prompt_pattern
+
+
+def test_initial_value_until_the_first_sample():
+    timeouts = Adaptive_timeout(initial=10.0)
+    assert timeouts.value == 10.0
+
+    timeouts.observe(0.4)
+
+    assert timeouts.samples == 1
+    assert timeouts.value == pytest.approx(0.4 + 4 * 0.2)
+
+
+def test_observe_smooths_towards_the_measured_waits():
+    timeouts = Adaptive_timeout(minimum=0.0)
+    for _ in range(200):
+        timeouts.observe(0.5)
+
+    assert timeouts.smoothed == pytest.approx(0.5)
+    assert timeouts.variation == pytest.approx(0.0, abs=1e-6)
+    assert timeouts.value == pytest.approx(0.5, rel=1e-3)
+
+
+def test_value_is_clamped():
+    fast = Adaptive_timeout(minimum=1.0, maximum=10.0)
+    fast.observe(0.01)
+    slow = Adaptive_timeout(minimum=1.0, maximum=10.0)
+    slow.observe(30.0)
+
+    assert fast.value == 1.0
+    assert slow.value == 10.0
+
+
+def test_backoff_doubles_up_to_the_cap_and_a_sample_resets_it():
+    timeouts = Adaptive_timeout(minimum=0.0, maximum=1000.0)
+    timeouts.observe(1.0)
+    base = timeouts.value
+
+    timeouts.backoff()
+    assert timeouts.value == pytest.approx(2 * base)
+    for _ in range(10):
+        timeouts.backoff()
+    assert timeouts.multiplier == 64
+
+    timeouts.observe(1.0)
+    assert timeouts.multiplier == 1
+
+
+def test_prompt_pattern_only_matches_the_device_prompt_at_a_line_start():
+    pattern = re.compile(prompt_pattern("switch01"))
+
+    assert pattern.search("output\r\nswitch01#")
+    assert pattern.search("\r\nswitch01(config-if)#")
+    assert not pattern.search(" description to switch01#core")
+    assert not pattern.search("\r\nswitch02#")
+    assert hostname_from_prompt("\r\nswitch01(config)#") == "switch01"
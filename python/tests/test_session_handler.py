@@ -0,0 +1,95 @@
+import threading
+
+import pytest
+
+from core.fleet_runner import Fleet_runner
+from infrastructure.ssh_client import Command_result, Session_handler
+from infrastructure.transport import Asyncssh_transport
+from tests.conftest import PASSWORD, USERNAME
+
+
+class Paging_session(Session_handler):
+    """
+    Session whose 'terminal datadump' never took effect: the switch keeps paging.
+    """
+    def disable_pagination(self) -> bool:
+        self.pagination_disabled = False
+        return False
+
+
+def test_batch_without_datadump_falls_back_to_sequential(make_session):
+    session = make_session(Paging_session)
+    assert session.connect() == "Connection established"
+
+    results = session.send_commands_batch(["show running-config", "show system", "show interfaces status"])
+
+    assert [result.ok for result in results] == [True, True, True]
+    assert "interface GigabitEthernet52" in results[0].output
+    assert session.connection_is_active
+
+
+def test_cancelled_session_refuses_to_reconnect(session):
+    handshakes = session.handshake_count
+    session.cancel("Deadline of 1s exceeded")
+
+    assert not session.ensure_connection()
+    assert session.connect() == "Not connecting: Deadline of 1s exceeded"
+    with pytest.raises(RuntimeError, match="Deadline of 1s exceeded"):
+        session.send_commands_batch(["show system"])
+    assert session.handshake_count == handshakes
+
+
+def test_fleet_deadline_stops_the_worker_without_a_second_login(slow_ssh_server, loop_thread):
+    sessions = []
+
+    def session_factory(ip, username, password):
+        transport = Asyncssh_transport(port=slow_ssh_server.port, loop_thread=loop_thread)
+        sessions.append(Session_handler("127.0.0.1", username, password, transport=transport))
+        return sessions[-1]
+
+    inventory = [{"ip": "127.0.0.1", "username": USERNAME, "password": PASSWORD}]
+    result = Fleet_runner(inventory, device_deadline=1.0, session_factory=session_factory).run()["127.0.0.1"]
+
+    assert result.timed_out and not result.succeeded
+    assert "Deadline of 1.0s exceeded" in result.error or \
+        any("Deadline of 1.0s exceeded" in line for line in result.initialization_log)
+    assert sessions[0].handshake_count == 1
+    assert result.timings["total"] < 2.5
+
+
+def test_threads_sharing_a_session_do_not_interleave_on_the_channel(session):
+    outputs = []
+
+    def worker():
+        for _ in range(5):
+            outputs.append(session.send_commands_batch(["show system", "show interfaces status gi5"]))
+            outputs.append([Command_result("show running-config", "\n".join(session.get_config("running")))])
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(outputs) == 40
+    for results in outputs:
+        assert all(result.ok for result in results)
+        if len(results) == 2:
+            assert "System Description" in results[0].output and "gi5" in results[1].output
+        else:
+            assert "interface GigabitEthernet52" in results[0].output
+
+
+def test_hash_in_a_description_does_not_end_the_answer(session):
+    full = session.get_config("running")
+    results = session.send_config_batch(["interface gi5", "description to switch01#core uplink#2", "exit"])
+    assert all(result.ok for result in results)
+
+    lines = session.get_config("running")
+    [result] = session.send_commands_batch(["show running-config"])
+
+    assert "description to switch01#core uplink#2" in lines
+    assert lines[-1] == full[-1]
+    assert [line for line in lines if line.startswith("interface ")] == \
+        [line for line in full if line.startswith("interface ")]
+    assert "interface GigabitEthernet52" in result.output and "exec-timeout 30" in result.output
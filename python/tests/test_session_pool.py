@@ -0,0 +1,138 @@
+import pytest
+
+from infrastructure.session_pool import Session_pool
+from infrastructure.ssh_client import Session_handler
+from infrastructure.transport import Asyncssh_transport
+from tests.conftest import PASSWORD, USERNAME
+
+
+class Fake_session:
+    """
+    Stand-in for a Session_handler of any IP; counts logins, heartbeats and disconnects.
+    """
+    def __init__(self, ip: str, username: str, password: str):
+        self.ip = ip
+        self.connection_is_active = False
+        self.alive = True
+        self.logins = self.heartbeats = self.disconnects = 0
+
+    def connect(self) -> str:
+        self.logins += 1
+        self.connection_is_active = True
+        return "Connection established"
+
+    def validate_connection(self) -> bool:
+        self.heartbeats += 1
+        return self.alive
+
+    def disconnect(self):
+        self.disconnects += 1
+        self.connection_is_active = False
+
+
+@pytest.fixture
+def ssh_pool(ssh_server, loop_thread):
+    def session_factory(ip, username, password):
+        return Session_handler(ip, username, password,
+                               transport=Asyncssh_transport(port=ssh_server.port, loop_thread=loop_thread))
+
+    pool = Session_pool(session_factory=session_factory)
+    yield pool
+    pool.close()
+
+
+def test_released_session_is_reused_without_a_new_login(ssh_pool):
+    with ssh_pool.lease("127.0.0.1", USERNAME, PASSWORD) as session:
+        assert session.get_model_name() != "Unknown"
+    with ssh_pool.lease("127.0.0.1", USERNAME, PASSWORD) as again:
+        assert again is session
+        assert again.validate_connection()
+    assert ssh_pool.session_count == 1
+
+
+def test_per_device_limit_blocks_until_timeout():
+    pool = Session_pool(max_sessions_per_device=2, acquire_timeout=0.1, session_factory=Fake_session)
+    first = pool.acquire("10.0.0.1", USERNAME, PASSWORD)
+    second = pool.acquire("10.0.0.1", USERNAME, PASSWORD)
+    assert first is not second
+    with pytest.raises(RuntimeError, match="No free SSH session slot for 10.0.0.1"):
+        pool.acquire("10.0.0.1", USERNAME, PASSWORD)
+
+    pool.release(first)
+    assert pool.acquire("10.0.0.1", USERNAME, PASSWORD) is first
+    assert first.logins == 1
+
+
+def test_overall_limit_evicts_the_least_recently_used_idle_device():
+    pool = Session_pool(max_sessions=2, acquire_timeout=0.1, session_factory=Fake_session)
+    older = pool.acquire("10.0.0.1", USERNAME, PASSWORD)
+    newer = pool.acquire("10.0.0.2", USERNAME, PASSWORD)
+    pool.release(older)
+    pool.release(newer)
+
+    pool.acquire("10.0.0.3", USERNAME, PASSWORD)
+    assert sorted(pool._sessions) == ["10.0.0.2", "10.0.0.3"]
+    assert pool.session_count == 2
+
+    # Nothing idle left to evict: the pool is full
+    pool.acquire("10.0.0.2", USERNAME, PASSWORD)
+    with pytest.raises(RuntimeError):
+        pool.acquire("10.0.0.4", USERNAME, PASSWORD)
+
+
+def test_heartbeat_pings_idle_sessions_after_the_margin_of_the_exec_timeout():
+    pool = Session_pool(heartbeat_margin=0.5, session_factory=Fake_session)
+    pool.set_exec_timeout("10.0.0.1", 4)
+    assert pool.heartbeat_interval("10.0.0.1") == 120
+    pool.set_exec_timeout("10.0.0.1", 0)   # 'never' still gets the default interval
+    assert pool.heartbeat_interval("10.0.0.1") == 300
+
+    idle = pool.acquire("10.0.0.1", USERNAME, PASSWORD)
+    leased = pool.acquire("10.0.0.1", USERNAME, PASSWORD)
+    pool.release(idle)
+    pool.run_maintenance()
+    assert idle.heartbeats == 0
+
+    pool.heartbeat_margin = 0
+    pool.run_maintenance()
+    assert (idle.heartbeats, leased.heartbeats) == (1, 0)
+    assert pool.acquire("10.0.0.1", USERNAME, PASSWORD) is idle
+
+
+def test_dead_and_expired_sessions_are_evicted():
+    pool = Session_pool(heartbeat_margin=0, session_factory=Fake_session)
+    dead = pool.acquire("10.0.0.1", USERNAME, PASSWORD)
+    pool.release(dead)
+    dead.alive = False
+    pool.run_maintenance()
+    assert pool.session_count == 0
+    assert dead.disconnects == 1
+
+    pool.idle_timeout = 0
+    expired = pool.acquire("10.0.0.1", USERNAME, PASSWORD)
+    assert expired is not dead
+    pool.release(expired)
+    pool.run_maintenance()
+    assert pool.session_count == 0
+    assert (expired.heartbeats, expired.disconnects) == (0, 1)
+
+
+def test_heartbeat_evicts_a_session_whose_channel_was_closed(ssh_pool):
+    ssh_pool.heartbeat_margin = 0
+    session = ssh_pool.acquire("127.0.0.1", USERNAME, PASSWORD)
+    ssh_pool.release(session)
+    session.child.close()   # the switch dropped the session behind the pool's back
+
+    ssh_pool.run_maintenance()
+    assert ssh_pool.session_count == 0
+    assert not session.connection_is_active
+
+
+def test_session_broken_inside_a_lease_is_not_returned():
+    pool = Session_pool(session_factory=Fake_session)
+    with pytest.raises(OSError):
+        with pool.lease("10.0.0.1", USERNAME, PASSWORD) as session:
+            session.alive = False
+            raise OSError("channel closed")
+    assert pool.session_count == 0
+    assert session.disconnects == 1
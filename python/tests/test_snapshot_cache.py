@@ -0,0 +1,73 @@
+import os
+import time
+
+from infrastructure import snapshot_cache
+from infrastructure.snapshot_cache import Snapshot_cache
+
+
+IP = "10.0.0.1"
+
+
+def _digest(text: str) -> str:
+    return Snapshot_cache.config_hash([text])
+
+
+def test_miss_then_hit(tmp_path):
+    cache = Snapshot_cache(str(tmp_path))
+    digest = _digest("hostname switch01")
+    assert cache.load(IP, digest) is None
+    cache.store(IP, digest, {"hostname": "switch01"})
+    assert cache.load(IP, digest) == {"hostname": "switch01"}
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_changed_config_or_version_misses(tmp_path, monkeypatch):
+    cache = Snapshot_cache(str(tmp_path))
+    cache.store(IP, _digest("hostname switch01"), "old")
+    assert cache.load(IP, _digest("hostname switch02")) is None
+    assert cache.load("10.0.0.2", _digest("hostname switch01")) is None
+    monkeypatch.setattr(snapshot_cache, "SNAPSHOT_VERSION", snapshot_cache.SNAPSHOT_VERSION + 1)
+    assert cache.load(IP, _digest("hostname switch01")) is None
+    assert cache.misses == 3
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = Snapshot_cache(str(tmp_path))
+    digest = _digest("hostname switch01")
+    cache.store(IP, digest, "snapshot")
+    with open(cache._path(IP, digest), "wb") as cache_file:
+        cache_file.write(b"not a pickle")
+    assert cache.load(IP, digest) is None
+
+
+def test_least_recently_used_entry_is_evicted(tmp_path):
+    cache = Snapshot_cache(str(tmp_path), max_entries=2)
+    first, second, third = (_digest(f"hostname switch0{n}") for n in (1, 2, 3))
+    cache.store(IP, first, 1)
+    time.sleep(0.01)
+    cache.store(IP, second, 2)
+    time.sleep(0.01)
+    assert cache.load(IP, first) == 1   # now more recent than second
+    time.sleep(0.01)
+    cache.store(IP, third, 3)
+
+    assert cache.load(IP, second) is None
+    assert cache.load(IP, first) == 1
+    assert cache.load(IP, third) == 3
+    assert len(os.listdir(tmp_path)) == 2
+
+
+def test_evicts_by_size_and_rescans_the_directory(tmp_path):
+    cache = Snapshot_cache(str(tmp_path))
+    for n in range(3):
+        cache.store(IP, _digest(str(n)), "x" * 1000)
+        time.sleep(0.01)
+
+    # A new cache over the same folder indexes the existing entries before evicting
+    restarted = Snapshot_cache(str(tmp_path), max_bytes=2500)
+    restarted.store(IP, _digest("3"), "x" * 1000)
+    assert restarted.load(IP, _digest("0")) is None
+    assert restarted.load(IP, _digest("1")) is None
+    assert restarted.load(IP, _digest("3")) == "x" * 1000
+    assert restarted._total_bytes <= 2500
+    assert not [name for name in os.listdir(tmp_path) if name.endswith(".tmp")]
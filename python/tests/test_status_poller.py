@@ -0,0 +1,59 @@
+import time
+
+import pytest
+
+from core.status_poller import Status_poller
+from domain.physical_interface import Physical_interface_current_status
+from infrastructure.session_pool import Session_pool
+from infrastructure.ssh_client import Session_handler
+from infrastructure.transport import Asyncssh_transport
+from tests.conftest import PASSWORD, USERNAME
+
+
+@pytest.fixture
+def poller(ssh_server, loop_thread):
+    transport = Asyncssh_transport(port=ssh_server.port, loop_thread=loop_thread)
+    pool = Session_pool(session_factory=lambda ip, username, password:
+                        Session_handler(ip, username, password, transport=transport))
+    poller = Status_poller(pool)
+    yield poller
+    poller.stop()
+    pool.close()
+
+
+def _gi_status_objects(session) -> dict:
+    rows = Session_handler.parse_interfaces_status(session.send_command_read_answer("show interfaces status"))
+    return {name: Physical_interface_current_status(name=name, values=values)
+            for name, values in rows.items() if name.startswith("gi")}
+
+
+def test_tracking_initializer_objects_keeps_them_gi_only(poller, session):
+    status_objects = _gi_status_objects(session)
+    ports = set(status_objects)
+    poller.track("127.0.0.1", USERNAME, PASSWORD, status_objects)
+
+    events = poller.poll_once("127.0.0.1")
+
+    assert set(status_objects) == ports
+    assert not [event for event in events if event.kind == "added"]
+
+
+def test_poll_now_during_a_poll_polls_again_right_after(poller):
+    state = poller.track("127.0.0.1", USERNAME, PASSWORD)
+    state.in_flight = True
+    poller.poll_now("127.0.0.1")
+    assert state.repoll
+
+    poller._poll_and_reschedule(state)
+
+    assert not state.repoll and not state.in_flight
+    assert state.next_poll <= time.monotonic()
+
+
+def test_private_pool_is_started_and_closed_with_the_poller():
+    poller = Status_poller()
+    poller.start()
+    assert poller.session_pool._heartbeat_thread is not None
+
+    poller.stop()
+    assert poller.session_pool._heartbeat_thread is None
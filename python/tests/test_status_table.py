@@ -0,0 +1,71 @@
+import numpy as np
+
+from core.status_table import Fleet_status_table
+
+
+def _status(*ports) -> dict:
+    """
+    parse_interfaces_status()-shaped rows: (port, speed, duplex, link state) plus fixed fields.
+    """
+    rows = {"headers": ["Port", "Type", "Duplex", "Speed", "Neg", "Flow ctrl", "Link State"]}
+    for port, speed, duplex, link_state in ports:
+        rows[port] = ["1G-Copper", duplex, speed, "Enabled", "Off", link_state, "Disabled", "Off"]
+    return rows
+
+
+SWITCH01 = _status(("gi1", "1000", "Full", "Up"), ("gi2", "100", "Half", "Up"), ("gi3", "--", "--", "Down"))
+SWITCH02 = _status(("gi1", "100", "Half", "Up"), ("gi2", "--", "--", "Down"))
+
+
+def _table(capacity: int = 4096) -> Fleet_status_table:
+    table = Fleet_status_table(capacity=capacity)
+    table.set_device("10.0.0.1", SWITCH01)
+    table.set_device("10.0.0.2", SWITCH02)
+    return table
+
+
+def test_mask_selects_rows_by_value_and_alternatives():
+    table = _table()
+    assert len(table) == 5
+    assert table.rows(table.mask(speed="100", duplex="Half")) == [("10.0.0.1", "gi2"), ("10.0.0.2", "gi1")]
+    assert table.rows(table.mask(link_state="Down", device="10.0.0.2")) == [("10.0.0.2", "gi2")]
+    assert table.count(table.mask(speed=("1000", "100"))) == 3
+    assert table.count(table.mask(port="gi1")) == 2
+    assert table.count(table.mask(speed="10000")) == 0
+    assert table.count(table.mask(device="10.0.0.9")) == 0
+
+
+def test_count_by_one_and_several_columns():
+    table = _table()
+    assert table.count_by("device", table.mask(link_state="Down")) == {"10.0.0.1": 1, "10.0.0.2": 1}
+    assert table.count_by(("speed", "duplex")) == {("1000", "Full"): 1, ("100", "Half"): 2, ("--", "--"): 2}
+    assert table.count_by("link_state", table.mask(device="10.0.0.1")) == {"Up": 2, "Down": 1}
+
+
+def test_set_device_overwrites_the_rows_of_a_known_device():
+    table = _table()
+    table.set_device("10.0.0.1", _status(("gi1", "1000", "Full", "Down"), ("gi2", "100", "Half", "Up"),
+                                         ("gi3", "1000", "Full", "Up")))
+    assert len(table) == 5
+    assert table.count_by("device", table.mask(link_state="Down")) == {"10.0.0.1": 1, "10.0.0.2": 1}
+    assert table.rows(table.mask(link_state="Down", device="10.0.0.1")) == [("10.0.0.1", "gi1")]
+
+
+def test_changed_port_count_moves_later_devices_down():
+    table = _table(capacity=2)     # also grows the arrays
+    table.set_device("10.0.0.1", _status(("gi1", "1000", "Full", "Up")))
+    assert len(table) == 3
+    assert table.rows() == [("10.0.0.2", "gi1"), ("10.0.0.2", "gi2"), ("10.0.0.1", "gi1")]
+    assert table.count_by("device") == {"10.0.0.1": 1, "10.0.0.2": 2}
+
+    table.set_device("10.0.0.2", _status())
+    assert table.rows() == [("10.0.0.1", "gi1")]
+    assert table.count_by("device") == {"10.0.0.1": 1}
+
+
+def test_short_rows_are_padded_and_columns_are_read_only():
+    table = Fleet_status_table()
+    table.set_device("10.0.0.1", {"Po1": ["--", "--", "--", "--", "--", "Not Present"]})
+    assert table.count_by(("link_state", "mdix_mode")) == {("Not Present", None): 1}
+    column = table.column("speed")
+    assert isinstance(column, np.ndarray) and not column.flags.writeable
@@ -0,0 +1,44 @@
+import os
+from types import SimpleNamespace
+
+import pytest
+
+from domain.physical_interface import Physical_interface_settings
+from infrastructure.storage import Postgres_backend, Snapshot_store, Sqlite_backend, psycopg
+
+POSTGRES_DSN = os.environ.get("TEST_POSTGRES_DSN")
+
+
+@pytest.fixture(params=["sqlite", "postgres"])
+def store(request):
+    if request.param == "sqlite":
+        backend = Sqlite_backend()
+    else:
+        if psycopg is None or not POSTGRES_DSN:
+            pytest.skip("needs psycopg and TEST_POSTGRES_DSN")
+        backend = Postgres_backend(POSTGRES_DSN)
+        for table in ("runs", "config_snapshots", "device_runs", "interface_settings",
+                      "status_samples", "latest_digests"):
+            backend.execute(f"DROP TABLE IF EXISTS {table}")
+    yield Snapshot_store(backend)
+    backend.close()
+
+
+def _initializer(description: str):
+    settings_obj = Physical_interface_settings("gi1", [])
+    settings_obj.description = description
+    return SimpleNamespace(running_config=["hostname switch01"], startup_config=["hostname switch01"],
+                           model_name="CBS250-48T-4G",
+                           physical_interfaces_settings_objects={"gi1": settings_obj},
+                           interfaces_current_status_objects={})
+
+
+def test_interface_history_keeps_a_return_to_an_earlier_state(store):
+    run_ids = [store.record_devices({"10.0.0.1": _initializer(description)}, started_at=started_at)
+               for started_at, description in enumerate(("A", "B", "A", "A"), start=1)]
+
+    history = store.interface_history("10.0.0.1", "gi1")
+
+    assert [run_id for run_id, _, _ in history] == run_ids[:3]
+    assert [settings["description"] for _, _, settings in history] == ["A", "B", "A"]
+    assert store.latest_run("10.0.0.1")[0] == run_ids[3]
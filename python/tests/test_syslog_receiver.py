@@ -0,0 +1,74 @@
+import socket
+import threading
+
+from core.lazy_initializer import Lazy_initializer
+from infrastructure.syslog_receiver import Syslog_receiver
+
+COPY_TRAP = b"<189>Oct 17 10:00:03 switch01 %COPY-N-TRAP: The copy operation was completed successfully"
+LINK_DOWN = b"<188>Oct 17 10:00:01 switch01 %LINK-W-Down:  gi1/0/5"
+LINK_UP = b"<189>Oct 17 10:00:02 switch01 %LINK-I-Up:  gi5"
+
+
+def test_link_messages_are_parsed():
+    message = Syslog_receiver.parse(1.0, "10.0.0.1", LINK_DOWN)
+    assert (message.priority, message.facility, message.severity, message.mnemonic, message.text) == (
+        188, "LINK", "W", "Down", "gi1/0/5")
+    assert Syslog_receiver.EVENT_KINDS[(message.facility, message.mnemonic)] == "link_down"
+
+    message = Syslog_receiver.parse(2.0, "10.0.0.1", LINK_UP)
+    assert (message.severity, message.mnemonic, message.text) == ("I", "Up", "gi5")
+    assert Syslog_receiver.EVENT_KINDS[(message.facility, message.mnemonic)] == "link_up"
+
+    message = Syslog_receiver.parse(3.0, "10.0.0.1", b"switch01 started")
+    assert (message.priority, message.facility, message.text) == (None, None, "switch01 started")
+
+
+def test_interface_names_are_normalised():
+    assert Syslog_receiver.interface_name("gi1/0/5") == "gi5"
+    assert Syslog_receiver.interface_name("gi5") == "gi5"
+    assert Syslog_receiver.interface_name("Interface te1/0/2, changed state to up") == "te2"
+    assert Syslog_receiver.interface_name("Po1 is down") == "Po1"
+    assert Syslog_receiver.interface_name("The copy operation was completed successfully") is None
+    assert Syslog_receiver.interface_name("logging in from gigabit") is None
+
+
+def test_link_events_reach_the_listeners(loop_thread):
+    received = []
+    done = threading.Event()
+    receiver = Syslog_receiver(host="127.0.0.1", port=0)
+    receiver.add_listener(received.extend)
+    receiver.add_listener(lambda events: done.set() if len(received) == 2 else None)
+    loop_thread.run(receiver.start())
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+            for data in (LINK_DOWN, b"<190>switch01 %AAA-I-CONNECT: New SSH connection", LINK_UP):
+                sender.sendto(data, ("127.0.0.1", receiver.port))
+        assert done.wait(5)
+    finally:
+        loop_thread.call(receiver.close)
+
+    assert [(event.ip, event.kind, event.interface) for event in received] == [
+        ("127.0.0.1", "link_down", "gi5"), ("127.0.0.1", "link_up", "gi5")]
+
+
+def test_config_copy_message_invalidates_the_cached_configs(session, loop_thread):
+    initializer = Lazy_initializer(session)
+    initializer.load("running_config", "startup_config")
+    assert initializer.is_loaded("running_config") and initializer.is_loaded("startup_config")
+
+    received = threading.Event()
+    receiver = Syslog_receiver(host="127.0.0.1", port=0)
+    receiver.add_listener(initializer.on_syslog_events)
+    receiver.add_listener(lambda events: received.set())
+    loop_thread.run(receiver.start())
+    try:
+        with socket.socket(socket.AF_INET, socket.SOCK_DGRAM) as sender:
+            sender.sendto(COPY_TRAP, ("127.0.0.1", receiver.port))
+        assert received.wait(5)
+    finally:
+        loop_thread.call(receiver.close)
+
+    assert not initializer.is_loaded("running_config")
+    assert not initializer.is_loaded("startup_config")
+    assert not initializer.is_loaded("config_model")
+    assert initializer.running_config  # fetched again on the next read
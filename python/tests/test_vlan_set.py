@@ -0,0 +1,72 @@
+import pickle
+
+import pytest
+
+from core.interface_config import apply_interface_config
+from domain.physical_interface import Physical_interface_settings
+from domain.vlan_set import MAX_VLAN, Vlan_set
+
+
+def test_parse_ranges_and_single_ids():
+    assert list(Vlan_set.parse("1-3,10,20-21")) == [1, 2, 3, 10, 20, 21]
+    assert list(Vlan_set.parse(" 5 , 7-8 ")) == [5, 7, 8]
+
+
+def test_parse_all_and_none():
+    every = Vlan_set.parse("all")
+    assert len(every) == MAX_VLAN and 1 in every and MAX_VLAN in every and 0 not in every
+    assert every == Vlan_set.all()
+    assert not Vlan_set.parse("none") and not Vlan_set.parse("")
+
+
+@pytest.mark.parametrize("text", ["abc", "1-", "5-3", "0", "4095", "1,,2", "1-2-3", "-5"])
+def test_parse_rejects_bad_input(text):
+    with pytest.raises(ValueError):
+        Vlan_set.parse(text)
+
+
+def test_trunk_allowed_vlan_except():
+    settings_obj = Physical_interface_settings("gi1", [])
+    apply_interface_config(settings_obj, ["switchport trunk allowed vlan except 2-4094"])
+    assert list(settings_obj.allowed_vlans) == [1]
+
+    apply_interface_config(settings_obj, ["switchport trunk allowed vlan except 1,10-4094"])
+    assert settings_obj.allowed_vlans == Vlan_set.parse("2-9")
+
+
+def test_to_cli_compresses_ranges():
+    assert Vlan_set([7, 1, 2, 3, 5, 4094, 4093]).to_cli() == "1-3,5,7,4093-4094"
+    assert Vlan_set().to_cli() == ""
+    assert Vlan_set.all().to_cli() == f"1-{MAX_VLAN}"
+
+
+@pytest.mark.parametrize("text", ["1", "1-4094", "2-10,20,30-31", "4094", "1,3,5,7"])
+def test_to_cli_round_trip(text):
+    assert Vlan_set.parse(text).to_cli() == text
+    assert Vlan_set.parse(Vlan_set.parse(text).to_cli()) == Vlan_set.parse(text)
+
+
+def test_set_operators():
+    a, b = Vlan_set.parse("1-10"), Vlan_set.parse("5-15")
+
+    assert (a | b).to_cli() == "1-15"
+    assert (a & b).to_cli() == "5-10"
+    assert (a - b).to_cli() == "1-4"
+    assert (a ^ b).to_cli() == "1-4,11-15"
+    assert a & b <= a and not a <= b
+    assert len(a) == 10 and 10 in a and 11 not in a and "10" not in a
+
+
+def test_mutation_and_pickle():
+    vlans = Vlan_set([1])
+    vlans.add(3)
+    vlans.update(Vlan_set([5, 6]))
+    vlans.discard(1)
+    vlans.discard(9999)
+    vlans.difference_update(Vlan_set([6]))
+    assert vlans.to_cli() == "3,5"
+
+    with pytest.raises(ValueError):
+        vlans.add(0)
+    assert pickle.loads(pickle.dumps(vlans)) == vlans
+    assert pickle.loads(pickle.dumps(Vlan_set())) == Vlan_set()